@@ -0,0 +1,90 @@
+# benchmarks/bench_bulk_export.py
+
+"""Write and load time of per-file transcripts against one compressed shard.
+
+Writes the same fake transcripts with the per-video savers and with a
+ShardWriter, then reads them all back, and reads single transcripts at
+random (from the shard through its offset index).
+
+Usage: python benchmarks/bench_bulk_export.py [--videos N] [--segments N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend
+from transcript_shard import ShardWriter, ShardReader
+
+RANDOM_READS = 200
+
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+def write_files(save_directory, selected_format, transcripts):
+    save = transcript_fetcher.TRANSCRIPT_SAVERS[selected_format]
+    for video_id, transcript_data in transcripts:
+        save(transcript_data, video_id, save_directory, "overwrite")
+
+
+def write_shard(save_directory, transcripts):
+    shard = ShardWriter(os.path.join(save_directory, "transcripts.jsonl.gz"))
+    for video_id, transcript_data in transcripts:
+        shard.add(video_id, video_id, "en", transcript_data)
+    shard.close()
+
+
+def load_json_files(save_directory, video_ids):
+    for video_id in video_ids:
+        with open(os.path.join(save_directory, f"{video_id}.json"), 'r', encoding='utf-8') as f:
+            json.load(f)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=2000)
+    parser.add_argument("--segments", type=int, default=300)
+    args = parser.parse_args()
+
+    backend = FakeBackend(segments_per_video=args.segments)
+    video_ids = [f"vid{i:08d}" for i in range(args.videos)]
+    transcripts = [(video_id, backend.transcript_data(video_id)) for video_id in video_ids]
+    sample = random.Random(0).sample(video_ids, min(RANDOM_READS, len(video_ids)))
+
+    print(f"{args.videos} videos, {args.segments} segments each")
+    print(f"{'output':<14} {'write':>9} {'videos/s':>9} {'size':>9} {'load all':>9} {'load one':>10}")
+    for selected_format in ("txt", "json", "srt", "vtt", "shard"):
+        with tempfile.TemporaryDirectory() as save_directory:
+            if selected_format == "shard":
+                seconds = timed(write_shard, save_directory, transcripts)
+                reader = ShardReader(os.path.join(save_directory, "transcripts.jsonl.gz"))
+                load_all = timed(lambda: sum(1 for _ in reader))
+                load_one = timed(lambda: [reader.get(video_id) for video_id in sample]) / len(sample)
+            else:
+                seconds = timed(write_files, save_directory, selected_format, transcripts)
+                load_all = load_one = None
+                if selected_format == "json":
+                    load_all = timed(load_json_files, save_directory, video_ids)
+                    load_one = timed(load_json_files, save_directory, sample) / len(sample)
+            size = directory_size(save_directory) / 2 ** 20
+        loads = f"{load_all:>8.2f}s {load_one * 1000:>8.2f}ms" if load_all is not None else f"{'-':>9} {'-':>10}"
+        print(f"{selected_format:<14} {seconds:>8.2f}s {args.videos / seconds:>9.0f} {size:>7.1f}MB {loads}")
+
+
+if __name__ == "__main__":
+    main()
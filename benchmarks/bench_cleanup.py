@@ -0,0 +1,138 @@
+# benchmarks/bench_cleanup.py
+
+"""Segments per second of transcript clean-up, and how long it stalls the event loop, on threads and on processes.
+
+The synthetic transcripts look like long auto-generated captions: rolling
+lines that repeat the end of the line before, [Music] and >> tags, no
+punctuation for long stretches. Each is cleaned per step on its own, then
+several are cleaned at once from an event loop, as the fetcher does: on
+its thread pool (the GIL stalls the loop while they run) and on a process
+pool. Loop lag is the worst delay of a 10 ms ticker on the loop while the
+transcripts are being cleaned.
+
+Usage: python benchmarks/bench_cleanup.py [--segments N] [--transcripts N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_cleanup import (
+    CleanupOptions, clean_transcript, create_process_pool, strip_noise_tags, dedupe_overlaps, resegment,
+    chunk_segments, TOKENS
+)
+
+TICK = 0.01
+
+WORDS = ("so the thing is we want to know how this works and why it matters for everyone here today "
+         "you can see that it was not really what they expected but it is what we have").split()
+
+
+def make_transcript(count, seed=0):
+    # Each line repeats the last few words of the one before, like YouTube's rolling auto-captions
+    rng = random.Random(seed)
+    transcript_data = []
+    previous = []
+    start = 0.0
+    for _ in range(count):
+        if rng.random() < 0.05:
+            text = rng.choice(("[Music]", "[Applause]", "♪ ♪"))
+            previous = []
+        else:
+            repeated = previous[-rng.randint(2, 4):] if previous else []
+            new = [rng.choice(WORDS) for _ in range(rng.randint(3, 7))]
+            if rng.random() < 0.1:
+                new[-1] += rng.choice(".?!")
+            if rng.random() < 0.05:
+                new.insert(0, ">>")
+            previous = repeated + new
+            text = " ".join(previous)
+        duration = round(rng.uniform(1.5, 4.0), 3)
+        transcript_data.append({'text': text, 'start': round(start, 3), 'duration': duration})
+        start += duration * 0.6
+    return transcript_data
+
+
+def time_steps(transcript_data):
+    segments = [(entry['text'], entry['start'], entry['duration']) for entry in transcript_data]
+    steps = (
+        ("strip noise tags", strip_noise_tags),
+        ("dedupe overlaps", dedupe_overlaps),
+        ("resegment", resegment),
+        ("chunk 500 chars", lambda segments: chunk_segments(segments, 500)),
+        ("chunk 64 tokens", lambda segments: chunk_segments(segments, 64, TOKENS)),
+    )
+    for name, step in steps:
+        count = len(segments)
+        start = time.perf_counter()
+        result = step(segments)
+        seconds = time.perf_counter() - start
+        words = sum(len(text.split()) for text, _, _ in result)
+        print(f"  {name:<17} {count / seconds:>12,.0f} seg/s  {count:>7} -> {len(result):>7} segments"
+              f" {words:>9,} words")
+        if not name.startswith("chunk"):
+            segments = result
+
+
+async def clean_all(pool, transcripts, options):
+    loop = asyncio.get_running_loop()
+    worst_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst_lag
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK)
+            worst_lag = max(worst_lag, time.perf_counter() - before - TICK)
+
+    ticks = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, clean_transcript, transcript_data, options) for transcript_data in transcripts
+    ))
+    seconds = time.perf_counter() - start
+    done = True
+    await ticks
+    return seconds, worst_lag, results
+
+
+def measure(name, pool, transcripts, options):
+    seconds, worst_lag, results = asyncio.run(clean_all(pool, transcripts, options))
+    segments_in = sum(len(transcript_data) for transcript_data in transcripts)
+    segments_out = sum(len(result) for result in results)
+    print(f"  {name:<14} {segments_in / seconds:>10,.0f} seg/s  {seconds:>6.2f} s"
+          f"  worst loop lag {worst_lag * 1000:>7.1f} ms  {segments_in} -> {segments_out} segments")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=50000, help="segments per transcript")
+    parser.add_argument("--transcripts", type=int, default=4, help="transcripts cleaned at once")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    transcripts = [make_transcript(args.segments, seed) for seed in range(args.transcripts)]
+    print(f"{args.segments} segments per transcript, {os.cpu_count()} CPUs")
+    print("Each step on one transcript:")
+    time_steps(transcripts[0])
+
+    print(f"{args.transcripts} transcripts cleaned at once from an event loop, {args.workers} workers:")
+    options = CleanupOptions(chunk_size=500)
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        measure("thread pool", pool, transcripts, options)
+    process_pool = create_process_pool(max_workers=args.workers, allow_spawn=True)
+    with process_pool:
+        process_pool.submit(clean_transcript, [], options).result()  # Start the workers before timing
+        measure("process pool", process_pool, transcripts, options)
+
+
+if __name__ == "__main__":
+    main()
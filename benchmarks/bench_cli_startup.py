@@ -0,0 +1,56 @@
+# benchmarks/bench_cli_startup.py
+
+"""Import and startup time of the headless CLI, and proof that it never loads tkinter.
+
+Usage: python benchmarks/bench_cli_startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    """Return {module name: cumulative microseconds} from python -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    times = import_times("cli")
+    tk_modules = sorted(name for name in times if name.split(".")[0] in ("tkinter", "_tkinter"))
+    print(f"import cli: {times['cli'] / 1000:.1f} ms cumulative")
+    for name in ("transcript_fetcher", "pytubefix", "youtube_transcript_api", "requests"):
+        if name in times:
+            print(f"  {name:<24} {times[name] / 1000:>7.1f} ms")
+    print(f"tkinter loaded: {'yes ' + ', '.join(tk_modules) if tk_modules else 'no'}")
+
+    wall = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "cli.py", "--help"], cwd=REPO_DIR, capture_output=True, check=True)
+        wall.append(time.perf_counter() - start)
+    print(f"python cli.py --help: median {statistics.median(wall) * 1000:.0f} ms over {args.runs} runs")
+    sys.exit(1 if tk_modules else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_concurrency.py
+
+"""Throughput of process_videos for different worker counts.
+
+Usage: python benchmarks/bench_concurrency.py [--videos N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+
+
+def run_job(max_workers, save_directory):
+    start = time.perf_counter()
+    asyncio.run(transcript_fetcher.process_videos(
+        PLAYLIST_URL,
+        ["txt"],
+        "en",
+        save_directory,
+        lambda message, msg_type="info": None,
+        lambda title, url, file_path: None,
+        threading.Event(),
+        "overwrite",
+        lambda current, total: None,
+        max_workers=max_workers
+    ))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    backend = FakeBackend(latency=args.latency, playlist_size=args.videos)
+    backend.install(transcript_fetcher)
+
+    print(f"{args.videos} videos, {args.latency * 1000:.0f} ms per fake network call")
+    print(f"{'workers':>8} {'seconds':>9} {'videos/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as save_directory:
+            elapsed = run_job(workers, save_directory)
+        rate = args.videos / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>9.2f} {rate:>9.1f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_connection_pool.py
+
+"""TLS handshakes and per-video latency with and without the shared connection pool.
+
+Runs a fake playlist against a local HTTPS stub server. "connection per
+request" closes the connection after every request, which is what a new
+requests.Session per youtube-transcript-api call amounted to; "shared pool"
+is the session process_videos creates for a job. Needs the openssl command
+to make a throwaway certificate.
+
+Usage: python benchmarks/bench_connection_pool.py [--videos N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from http_session import create_session
+from fake_backend import FakeBackend, PLAYLIST_URL
+from stub_server import StubServer
+
+
+def make_certificate(directory):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", keyfile, "-out", certfile, "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    return certfile, keyfile
+
+
+def run_job(stub, certfile, videos, workers, pooled):
+    stub.reset()
+    FakeBackend(playlist_size=videos, playlist_titles=False, server_url=stub.url,
+                ssl_context=ssl.create_default_context(cafile=certfile)).install(transcript_fetcher)
+    session = create_session(pool_size=workers)
+    session.verify = certfile
+    session.trust_env = False  # REQUESTS_CA_BUNDLE would override verify
+    if not pooled:
+        session.headers["Connection"] = "close"
+    started = {}
+    latencies = []
+
+    def console_output(message, msg_type="info"):
+        if message.startswith("Processing video"):
+            started[message.rsplit(" ", 1)[-1]] = time.perf_counter()
+
+    def update_recent_downloads(title, url, file_path):
+        latencies.append(time.perf_counter() - started[url])
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as save_directory:
+        asyncio.run(transcript_fetcher.process_videos(
+            PLAYLIST_URL,
+            ["txt"],
+            "en",
+            save_directory,
+            console_output,
+            update_recent_downloads,
+            threading.Event(),
+            "overwrite",
+            lambda current, total: None,
+            max_workers=workers,
+            context=transcript_fetcher.JobContext(session=session)
+        ))
+    elapsed = time.perf_counter() - start
+    session.close()
+    return stub.connections, elapsed, statistics.mean(latencies), len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cert_directory:
+        certfile, keyfile = make_certificate(cert_directory)
+        with StubServer(certfile=certfile, keyfile=keyfile) as stub:
+            print(f"{args.videos} videos, {args.workers} workers, local HTTPS stub")
+            print(f"{'mode':<26} {'handshakes':>10} {'per video':>10} {'ms/video':>9} {'seconds':>8}")
+            for name, pooled in (("connection per request", False), ("shared pool", True)):
+                handshakes, elapsed, latency, saved = run_job(stub, certfile, args.videos, args.workers, pooled)
+                print(f"{name:<26} {handshakes:>10} {handshakes / saved:>10.2f} "
+                      f"{latency * 1000:>9.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
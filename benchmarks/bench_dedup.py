@@ -0,0 +1,121 @@
+# benchmarks/bench_dedup.py
+
+"""Fetches saved by skipping duplicate videos in a job and sharing in-flight fetches between jobs.
+
+The first rows run one job over two playlists that list the same videos,
+plus some of those videos again as youtu.be links. The last rows run
+several jobs over the same playlist side by side on one event loop (each
+saving to its own folder), with and without a shared SingleFlight. The
+last row cancels the first of those jobs early: the other jobs must still
+save every video, including the ones whose shared fetch the cancelled job
+had started.
+
+Usage: python benchmarks/bench_dedup.py [--videos N] [--jobs N] [--workers N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+from run_metrics import RunMetrics
+from single_flight import SingleFlight
+
+
+def quiet(*args):
+    pass
+
+
+def job(urls, save_directory, workers, metrics, single_flight=None, stop_event=None):
+    return transcript_fetcher.process_videos(
+        urls, ["txt"], "en", save_directory, quiet, quiet, stop_event or threading.Event(), "append number", quiet,
+        max_workers=workers, context=transcript_fetcher.JobContext(metrics=metrics, single_flight=single_flight)
+    )
+
+
+def count_transcripts(directory):
+    # Manifests and other bookkeeping files start with a dot
+    return sum(1 for _, _, files in os.walk(directory) for name in files if not name.startswith('.'))
+
+
+def measure(name, backend, run):
+    calls = backend.calls
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        metrics = asyncio.run(run(root))
+        seconds = time.perf_counter() - start
+        files = count_transcripts(root)
+    saved = sum(m.fetches_saved() for m in metrics)
+    print(f"{name:<36} {seconds:>6.2f} s {backend.calls - calls:>6} calls {files:>5} files {saved:>5} fetches saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    args = parser.parse_args()
+
+    backend = FakeBackend(latency=args.latency, playlist_size=args.videos)
+    backend.install(transcript_fetcher)
+    print(f"playlist of {args.videos} videos, {args.workers} workers per job, "
+          f"{args.latency * 1000:.0f} ms per fake network call")
+
+    overlapping = [PLAYLIST_URL, PLAYLIST_URL + "copy"]
+    overlapping += [f"https://youtu.be/vid{i:08d}" for i in range(0, args.videos, 10)]
+
+    async def one_playlist(root):
+        metrics = RunMetrics()
+        await job(PLAYLIST_URL, root, args.workers, metrics)
+        return [metrics]
+
+    async def overlapping_playlists(root):
+        metrics = RunMetrics()
+        await job(overlapping, root, args.workers, metrics)
+        return [metrics]
+
+    def side_by_side(single_flight):
+        async def run(root):
+            metrics = [RunMetrics() for _ in range(args.jobs)]
+            await asyncio.gather(*(
+                job(PLAYLIST_URL, os.path.join(root, str(i)), args.workers, m, single_flight)
+                for i, m in enumerate(metrics)
+            ))
+            return metrics
+        return run
+
+    async def first_cancelled(root):
+        # The others start half a call later, so they join the first job's fetches; it is
+        # cancelled while they wait for them. It saves outside root, so only the others' files count.
+        single_flight = SingleFlight()
+        stop_event = threading.Event()
+        metrics = [RunMetrics() for _ in range(args.jobs)]
+
+        async def later(i, m):
+            await asyncio.sleep(args.latency / 2)
+            await job(PLAYLIST_URL, os.path.join(root, str(i)), args.workers, m, single_flight)
+
+        with tempfile.TemporaryDirectory() as cancelled_directory:
+            runs = [job(PLAYLIST_URL, cancelled_directory, args.workers, metrics[0], single_flight, stop_event)]
+            runs += [later(i, m) for i, m in enumerate(metrics[1:], 1)]
+            asyncio.get_running_loop().call_later(args.latency * 1.8, stop_event.set)
+            await asyncio.gather(*runs)
+        return metrics
+
+    measure("one playlist", backend, one_playlist)
+    measure(f"{len(overlapping)} overlapping URLs, one job", backend, overlapping_playlists)
+    measure(f"{args.jobs} jobs, same playlist, separate", backend, side_by_side(None))
+    measure(f"{args.jobs} jobs, same playlist, single-flight", backend, side_by_side(SingleFlight()))
+    measure(f"{args.jobs} jobs, single-flight, 1st cancelled", backend, first_cancelled)
+
+
+if __name__ == "__main__":
+    main()
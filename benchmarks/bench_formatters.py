@@ -0,0 +1,106 @@
+# benchmarks/bench_formatters.py
+
+"""Segments per second and peak memory of writing one transcript file, per format.
+
+"before" renders the whole transcript with youtube-transcript-api's
+formatter (or the TXT join) and writes the string; "after" streams it
+with transcript_formats. Both files are compared byte for byte. Peak
+memory is the largest Python allocation total (tracemalloc) during the
+write, on top of the transcript itself.
+
+Usage: python benchmarks/bench_formatters.py [--segments N ...] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_transcript_api.formatters import JSONFormatter, SRTFormatter, WebVTTFormatter
+
+from transcript_fetcher import FILE_BUFFER_SIZE
+from transcript_formats import FORMAT_WRITERS
+
+
+def render_txt(transcript_data):
+    return " ".join([entry['text'].replace('\n', ' ') for entry in transcript_data])
+
+
+FORMATTERS = {
+    "txt": render_txt,
+    "json": JSONFormatter().format_transcript,
+    "srt": SRTFormatter().format_transcript,
+    "vtt": WebVTTFormatter().format_transcript,
+}
+
+
+def make_transcript(count):
+    # Like auto-generated captions of a long lecture: short overlapping lines, times with two decimals
+    rng = random.Random(count)
+    words = "the of and to a in that is was he for it with as his on be at by i this had not are but".split()
+    transcript_data = []
+    start = 0.0
+    for _ in range(count):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 9)))
+        if rng.random() < 0.2:
+            text += "\n" + " ".join(rng.choice(words) for _ in range(rng.randint(2, 5)))
+        duration = round(rng.uniform(1.0, 6.0), 3)
+        transcript_data.append({'text': text, 'start': round(start, 2), 'duration': duration})
+        start += rng.uniform(0.5, 4.0)
+    return transcript_data
+
+
+def write_before(path, fmt, transcript_data):
+    content = FORMATTERS[fmt](transcript_data)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def write_after(path, fmt, transcript_data):
+    with open(path, 'w', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+        FORMAT_WRITERS[fmt](f, transcript_data)
+
+
+def measure(write, path, fmt, transcript_data, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(path, fmt, transcript_data)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    write(path, fmt, transcript_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(transcript_data) / statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, nargs="+", default=[1000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        before_path = os.path.join(directory, "before")
+        after_path = os.path.join(directory, "after")
+        for count in args.segments:
+            transcript_data = make_transcript(count)
+            print(f"{count} segments")
+            for fmt in FORMAT_WRITERS:
+                before_rate, before_peak = measure(write_before, before_path, fmt, transcript_data, args.repeat)
+                after_rate, after_peak = measure(write_after, after_path, fmt, transcript_data, args.repeat)
+                with open(before_path, 'rb') as before, open(after_path, 'rb') as after:
+                    identical = before.read() == after.read()
+                print(f"  {fmt:<4} before {before_rate:>10,.0f} seg/s {before_peak / 2 ** 20:>7.2f} MB"
+                      f"   after {after_rate:>10,.0f} seg/s {after_peak / 2 ** 20:>7.2f} MB"
+                      f"   {after_rate / before_rate:>4.1f}x  {'identical' if identical else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
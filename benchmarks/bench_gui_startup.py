@@ -0,0 +1,125 @@
+# benchmarks/bench_gui_startup.py
+
+"""Cold start of the GUI: imports before the first frame, time to first frame, and time until downloads are enabled.
+
+main.py runs under python -X importtime with Tk's mainloop wrapped. The
+imports main.py makes before entering the event loop delay the first
+frame; the wrapper marks that point, so the import log splits into what
+the window waited for and what loaded afterwards. Fails (exit 1) when
+pytubefix, youtube-transcript-api, requests or aiohttp load before the
+first frame.
+
+Without a display only the import part runs (Tk can't open a window);
+the first frame and ready times need one.
+
+Usage: python benchmarks/bench_gui_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries the first frame must not wait for
+HEAVY_MODULES = ("pytubefix", "youtube_transcript_api", "requests", "aiohttp")
+
+START_MARKER = "bench_gui_startup: start"
+FIRST_FRAME_MARKER = "bench_gui_startup: event loop"
+
+# Runs main.py in a fresh interpreter; prints one JSON line with the timings
+LAUNCHER = r"""
+import json, runpy, sys, time
+sys.stderr.write("%s\n" % START_MARKER)
+start = time.perf_counter()
+import tkinter
+timings = {}
+
+def mainloop(self, n=0):
+    sys.stderr.write("%s\n" % FIRST_FRAME_MARKER)
+    timings["event_loop"] = time.perf_counter() - start
+    self.wait_visibility(self)
+    self.update_idletasks()
+    timings["first_frame"] = time.perf_counter() - start
+    main = sys.modules["__main__"].__dict__
+    while str(main["download_button"]["state"]) != "normal":
+        self.update()
+        time.sleep(0.005)
+        if time.perf_counter() - start > 60:
+            break
+    timings["ready"] = time.perf_counter() - start
+    main["on_close"]()
+
+tkinter.Tk.mainloop = mainloop
+sys.path.insert(0, REPO_DIR)
+try:
+    runpy.run_path(MAIN_PATH, run_name="__main__")
+except tkinter.TclError as e:
+    sys.stderr.write("%s\n" % FIRST_FRAME_MARKER)
+    timings["event_loop"] = time.perf_counter() - start
+    timings["error"] = str(e)
+print(json.dumps(timings))
+"""
+
+
+def launch(work_dir, importtime=False):
+    code = (f"START_MARKER = {START_MARKER!r}\nFIRST_FRAME_MARKER = {FIRST_FRAME_MARKER!r}\n"
+            f"REPO_DIR = {REPO_DIR!r}\nMAIN_PATH = {os.path.join(REPO_DIR, 'main.py')!r}\n{LAUNCHER}")
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    # A scratch working directory, so the run neither reads nor writes the real settings and history
+    result = subprocess.run(command, cwd=work_dir, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def imports_before_first_frame(stderr):
+    """Imports logged between the markers, as [(cumulative microseconds, name, top level)].
+
+    Interpreter start-up (site and what it loads) comes before the start
+    marker and is left out.
+    """
+    imports = []
+    started = False
+    for line in stderr.splitlines():
+        if line == START_MARKER:
+            started = True
+        elif line == FIRST_FRAME_MARKER:
+            break
+        elif started and line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            # Nested imports are indented, and already counted in their parent's cumulative time
+            imports.append((int(cumulative), name.strip(), not name.startswith("  ")))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        timings, stderr = launch(work_dir, importtime=True)
+        imports = imports_before_first_frame(stderr)
+        top_level = sorted((cumulative, name) for cumulative, name, top in imports if top)
+        print(f"imports before the event loop: {sum(cumulative for cumulative, _ in top_level) / 1000:.1f} ms")
+        for cumulative, name in top_level[::-1][:8]:
+            print(f"  {name:<24} {cumulative / 1000:>7.1f} ms")
+        heavy = sorted(name for _, name, _ in imports if name.split(".")[0] in HEAVY_MODULES)
+        print(f"heavy libraries before the first frame: {', '.join(heavy) if heavy else 'none'}")
+
+        if "error" in timings:
+            print(f"no window ({timings['error']}): time to first frame needs a display")
+        else:
+            runs = [timings] + [launch(work_dir)[0] for _ in range(args.runs - 1)]
+            for key, label in (("event_loop", "event loop starts"), ("first_frame", "first frame"),
+                               ("ready", "downloads enabled")):
+                print(f"{label:<18} median {statistics.median(run[key] for run in runs) * 1000:>6.0f} ms"
+                      f" over {len(runs)} runs")
+    sys.exit(1 if heavy else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_gui_updates.py
+
+"""UI responsiveness while a worker thread floods the console with messages.
+
+A worker thread sends a burst of console messages the way the fetcher does.
+"per-message" schedules one root.after(0, ...) per message and re-reads the
+whole console after each line, like the GUI used to; "batched" goes through
+UIUpdateQueue and BoundedConsole. A heartbeat scheduled every 10 ms measures
+how late the event loop runs it (UI latency). Needs a display.
+
+Usage: python benchmarks/bench_gui_updates.py [--messages N]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+from ui_updates import UIUpdateQueue, BoundedConsole
+
+HEARTBEAT_MS = 10
+
+
+def legacy_console_output(text, message):
+    text.configure(state='normal')
+    text.insert(tk.END, message + '\n', 'info')
+    text.configure(state='disabled')
+    text.see(tk.END)
+    text.get('1.0', tk.END).strip()  # What update_clear_console_button used to do
+
+
+def run_burst(root, text, messages, batched):
+    text.configure(state='normal')
+    text.delete('1.0', tk.END)
+    text.configure(state='disabled')
+    applied = [0]
+    lags = []
+    done = threading.Event()
+    console = BoundedConsole(text)
+
+    def apply_batch(batch):
+        console.append([(message, msg_type) for _, (message, msg_type) in batch])
+        applied[0] += len(batch)
+
+    ui_updates = UIUpdateQueue(root, apply_batch)
+
+    def apply_one(message):
+        legacy_console_output(text, message)
+        applied[0] += 1
+
+    def produce():
+        for i in range(messages):
+            message = f"Processing video {i}/{messages}: https://www.youtube.com/watch?v=vid{i:08d}"
+            if batched:
+                ui_updates.put("console", message, "info")
+            else:
+                root.after(0, apply_one, message)
+
+    def heartbeat(expected):
+        now = time.perf_counter()
+        lags.append(max(0.0, now - expected))
+        if applied[0] >= messages:
+            done.set()
+            root.quit()
+            return
+        root.after(HEARTBEAT_MS, heartbeat, now + HEARTBEAT_MS / 1000)
+
+    if batched:
+        ui_updates.start()
+    start = time.perf_counter()
+    threading.Thread(target=produce, daemon=True).start()
+    root.after(HEARTBEAT_MS, heartbeat, start + HEARTBEAT_MS / 1000)
+    root.mainloop()
+    elapsed = time.perf_counter() - start
+    lags.sort()
+    return elapsed, lags[len(lags) // 2], lags[int(len(lags) * 0.99)], lags[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"No display available: {e}")
+    text = tk.Text(root, state='disabled')
+    text.pack()
+    text.tag_config('info', foreground='black')
+
+    print(f"{args.messages} console messages from a worker thread")
+    print(f"{'mode':<12} {'drained in':>11} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}")
+    for name, batched in (("per-message", False), ("batched", True)):
+        elapsed, p50, p99, worst = run_burst(root, text, args.messages, batched)
+        print(f"{name:<12} {elapsed:>9.2f} s {p50 * 1000:>6.0f} ms {p99 * 1000:>6.0f} ms {worst * 1000:>6.0f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_job_queue.py
+
+"""Throughput of many small playlists: one at a time, through the job queue, and as one batch.
+
+"one at a time" is the old GUI: each playlist runs in its own
+asyncio.run(process_videos(...)) with a new thread pool and HTTP session.
+The job queue runs them side by side on one event loop under one
+concurrency budget, which should come close to passing every URL to a
+single process_videos call. Each playlist lists its own videos, and
+every run must save all of them.
+
+Usage: python benchmarks/bench_job_queue.py [--playlists N] [--videos N] [--workers N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+from job_queue import JobQueue
+
+
+def quiet(*args):
+    pass
+
+
+def run_batch(urls, save_directory, workers):
+    asyncio.run(transcript_fetcher.process_videos(
+        urls, ["txt"], "en", save_directory, quiet, quiet, threading.Event(), "overwrite", quiet,
+        max_workers=workers
+    ))
+
+
+def one_at_a_time(urls, save_directory, workers):
+    for url in urls:
+        run_batch(url, save_directory, workers)
+
+
+def job_queue(urls, save_directory, workers):
+    finished = threading.Event()
+    queue = None
+
+    def on_job_update(job):
+        if queue is not None and len(queue.jobs) == len(urls) and not queue.active_jobs():
+            finished.set()
+
+    queue = JobQueue(quiet, quiet, on_job_update, max_concurrency=workers)
+    queue.start()
+    for url in urls:
+        queue.submit(url, ["txt"], "en", save_directory, "overwrite")
+    finished.wait()
+    queue.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--playlists", type=int, default=20)
+    parser.add_argument("--videos", type=int, default=10, help="videos per playlist")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    args = parser.parse_args()
+
+    FakeBackend(latency=args.latency, playlist_size=args.videos).install(transcript_fetcher)
+    urls = [f"{PLAYLIST_URL}{i}" for i in range(args.playlists)]
+    videos = args.playlists * args.videos
+    print(f"{args.playlists} playlists x {args.videos} videos, {args.workers} workers, "
+          f"{args.latency * 1000:.0f} ms per fake network call")
+    for name, run in (("one at a time", one_at_a_time), ("job queue", job_queue), ("one batch", run_batch)):
+        with tempfile.TemporaryDirectory() as save_directory:
+            start = time.perf_counter()
+            run(urls, save_directory, args.workers)
+            seconds = time.perf_counter() - start
+            # Bookkeeping files (the output manifest) start with a dot
+            files = sum(1 for entry in os.listdir(save_directory) if not entry.startswith('.'))
+        print(f"{name:<14} {seconds:>7.2f} s  {videos / seconds:>7.1f} videos/s  {files:>5} files")
+
+
+if __name__ == "__main__":
+    main()
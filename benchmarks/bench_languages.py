@@ -0,0 +1,71 @@
+# benchmarks/bench_languages.py
+
+"""Network calls and time for several languages per video: one run per language against one language plan.
+
+Every fake video has captions in en, de, fr and es and can be translated
+into ja. Before language plans, each language took a run of its own, each
+listing the playlist and every video's transcripts again (and saving to
+the same file names, so each run overwrote the last), and a language the
+video lacked just failed. A plan lists each video's transcripts once
+and fetches the languages it finds side by side.
+
+Usage: python benchmarks/bench_languages.py [--videos N] [--workers N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+
+NATIVE_LANGUAGES = ("en", "de", "fr", "es")
+
+
+def run_job(language, save_directory, workers):
+    asyncio.run(transcript_fetcher.process_videos(
+        PLAYLIST_URL, ["txt"], language, save_directory,
+        lambda message, msg_type="info": None, lambda title, url, file_path: None, threading.Event(), "overwrite",
+        lambda current, total: None, max_workers=workers
+    ))
+
+
+def measure(name, backend, languages, args):
+    backend.requests.clear()
+    with tempfile.TemporaryDirectory() as save_directory:
+        start = time.perf_counter()
+        for language in languages:
+            run_job(language, save_directory, args.workers)
+        seconds = time.perf_counter() - start
+        files = len(os.listdir(save_directory)) - 1  # Minus the output manifest
+    listings = backend.requests["/watch"] / args.videos
+    fetches = backend.requests["/api/timedtext"] / args.videos
+    print(f"{name:<34} {seconds:>6.2f} s  {listings:>4.1f} listings/video  {fetches:>4.1f} fetches/video"
+          f"  {files:>5} files")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=transcript_fetcher.DEFAULT_MAX_WORKERS)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    args = parser.parse_args()
+
+    backend = FakeBackend(latency=args.latency, playlist_size=args.videos, languages=NATIVE_LANGUAGES)
+    backend.install(transcript_fetcher)
+    print(f"{args.videos} videos, {args.workers} workers, {args.latency * 1000:.0f} ms per fake network call")
+    measure("1 language", backend, ["en"], args)
+    measure("4 languages, one run each", backend, NATIVE_LANGUAGES, args)
+    measure("4 languages, one plan", backend, [",".join(NATIVE_LANGUAGES)], args)
+    measure("4 languages + ja translated, plan", backend, [",".join(NATIVE_LANGUAGES) + ">ja"], args)
+    measure("en + 3 languages videos lack, plan", backend, ["en,it,pt,nl"], args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_manifest_skip.py
+
+"""Time to re-run a fully downloaded playlist in "skip" mode.
+
+"before" decides to skip a video only after fetching its title and
+transcript, like the code without the output-directory manifest did;
+"after" looks the video up in the manifest before any network call.
+Also times numbering the files of a playlist whose videos all share one
+title in "append number" mode.
+
+Usage: python benchmarks/bench_manifest_skip.py [--videos N] [--latency SECONDS] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+
+
+class NoManifest:
+    """Stands in for OutputManifest with the old per-file os.path.exists checks."""
+
+    def __init__(self, save_directory):
+        pass
+
+    def lookup(self, video_id, selected_format):
+        return None
+
+    def reserve(self, filename, extension, policy):
+        return None  # Never called: handle_file_policy gets manifest=None below
+
+    def record(self, video_id, selected_format, file_path):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def run_job(save_directory, file_policy, workers, legacy):
+    output_manifest = transcript_fetcher.OutputManifest
+    handle_file_policy = transcript_fetcher.handle_file_policy
+    if legacy:
+        transcript_fetcher.OutputManifest = NoManifest
+        transcript_fetcher.handle_file_policy = (
+            lambda file_path, policy, filename, extension, manifest=None:
+            handle_file_policy(file_path, policy, filename, extension)
+        )
+    start = time.perf_counter()
+    try:
+        asyncio.run(transcript_fetcher.process_videos(
+            PLAYLIST_URL,
+            ["txt"],
+            "en",
+            save_directory,
+            lambda message, msg_type="info": None,
+            lambda title, url, file_path: None,
+            threading.Event(),
+            file_policy,
+            lambda current, total: None,
+            max_workers=workers
+        ))
+    finally:
+        transcript_fetcher.OutputManifest = output_manifest
+        transcript_fetcher.handle_file_policy = handle_file_policy
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--workers", type=int, default=transcript_fetcher.DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    print(f"{args.videos} videos, {args.workers} workers, {args.latency * 1000:.0f} ms per fake network call")
+    with tempfile.TemporaryDirectory() as save_directory:
+        backend = FakeBackend(latency=args.latency, playlist_size=args.videos)
+        backend.install(transcript_fetcher)
+        run_job(save_directory, "skip", args.workers, legacy=False)
+        for name, legacy in (("before: skip after fetching", True), ("after: skip from manifest", False)):
+            calls = backend.calls
+            seconds = run_job(save_directory, "skip", args.workers, legacy)
+            print(f"{name:<30} {seconds:>8.2f} s  {backend.calls - calls:>6} network calls")
+
+    # Every video saved under the same title, so each file needs the next free "_N"
+    print(f"append number, {args.videos} videos with the same title (no network latency)")
+    for name, legacy in (("before: os.path.exists probes", True), ("after: manifest counters", False)):
+        backend = FakeBackend(latency=0, playlist_size=args.videos, playlist_titles=False)
+        backend.install(transcript_fetcher)
+        transcript_fetcher.fetch_video_title = lambda video_id, scheduler=None, session=None, backend=None: "Same title"
+        with tempfile.TemporaryDirectory() as save_directory:
+            seconds = run_job(save_directory, "append number", args.workers, legacy)
+        print(f"{name:<30} {seconds:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_metrics.py
+
+"""Overhead of the per-stage instrumentation, and a sample run report.
+
+Runs the same job with zero fake network latency (so the fetcher's own
+work is all that is timed) without metrics, with metrics switched off
+(NullMetrics) and with a RunMetrics recording everything.
+
+Usage: python benchmarks/bench_metrics.py [--videos N] [--repeat N] [--report PATH] [--prometheus PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, PLAYLIST_URL
+from run_metrics import RunMetrics, NULL_METRICS
+
+
+def run_job(videos, metrics):
+    FakeBackend(latency=0, playlist_size=videos).install(transcript_fetcher)
+    with tempfile.TemporaryDirectory() as save_directory:
+        start = time.perf_counter()
+        asyncio.run(transcript_fetcher.process_videos(
+            PLAYLIST_URL,
+            ["txt", "json", "srt"],
+            "en",
+            save_directory,
+            lambda message, msg_type="info": None,
+            lambda title, url, file_path: None,
+            threading.Event(),
+            "overwrite",
+            lambda current, total: None,
+            context=transcript_fetcher.JobContext(metrics=metrics)
+        ))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--report", help="also save the last run report as JSON here")
+    parser.add_argument("--prometheus", help="also save the last run's metrics in the Prometheus format here")
+    args = parser.parse_args()
+
+    variants = [("no metrics", lambda: None), ("metrics off", lambda: NULL_METRICS), ("metrics on", RunMetrics)]
+    times = {name: [] for name, _ in variants}
+    metrics = None
+    # Interleaved, so drift in machine load hits every variant alike
+    for _ in range(args.repeat):
+        for name, make_metrics in variants:
+            metrics = make_metrics()
+            times[name].append(run_job(args.videos, metrics))
+    baseline = statistics.median(times["no metrics"])
+    print(f"{args.videos} videos, 3 formats, median of {args.repeat} runs")
+    for name, _ in variants:
+        median = statistics.median(times[name])
+        print(f"{name:<12} {median:>7.3f} s  {(median / baseline - 1) * 100:+6.1f} %")
+
+    metrics = RunMetrics()
+    run_job(args.videos, metrics)
+    print(metrics.summary())
+    report = metrics.report()
+    for stage, stats in report["stages"].items():
+        print(f"  {stage:<18} {stats['count']:>6}  mean {stats['mean_seconds'] * 1000:8.3f} ms"
+              f"  p99 <= {stats['p99_seconds'] * 1000:8.3f} ms")
+    if args.report:
+        metrics.write_report(args.report)
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_playlist_streaming.py
+
+"""Time to the first saved transcript for growing playlist sizes.
+
+With streaming expansion the first transcript is written after the first
+playlist page, whatever the playlist size. "list first" is the time it
+takes just to page through the whole playlist, which the old code paid
+before fetching anything.
+
+Usage: python benchmarks/bench_playlist_streaming.py [--sizes N ...] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY, PLAYLIST_URL
+
+
+def first_output_latency(save_directory):
+    stop_event = threading.Event()
+    first_output = []
+
+    def update_recent_downloads(title, url, file_path):
+        if not first_output:
+            first_output.append(time.perf_counter())
+        stop_event.set()  # One transcript is all this benchmark needs
+
+    start = time.perf_counter()
+    asyncio.run(transcript_fetcher.process_videos(
+        PLAYLIST_URL,
+        ["txt"],
+        "en",
+        save_directory,
+        lambda message, msg_type="info": None,
+        update_recent_downloads,
+        stop_event,
+        "overwrite",
+        lambda current, total: None
+    ))
+    return first_output[0] - start
+
+
+def listing_time(backend):
+    start = time.perf_counter()
+    _, playlist_urls, _ = backend.open_playlist(PLAYLIST_URL)
+    for _ in playlist_urls:
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    args = parser.parse_args()
+
+    print(f"{args.latency * 1000:.0f} ms per fake network call")
+    print(f"{'videos':>8} {'first output':>13} {'list first':>11}")
+    for size in args.sizes:
+        backend = FakeBackend(latency=args.latency, playlist_size=size)
+        backend.install(transcript_fetcher)
+        with tempfile.TemporaryDirectory() as save_directory:
+            first = first_output_latency(save_directory)
+        print(f"{size:>8} {first * 1000:>10.0f} ms {listing_time(backend) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
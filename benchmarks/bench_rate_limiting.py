@@ -0,0 +1,78 @@
+# benchmarks/bench_rate_limiting.py
+
+"""Sustained throughput against a local stub server that throttles with HTTP 429.
+
+The stub accepts --server-rate requests per second and answers 429 above
+that. Each scenario runs the same playlist with a different RequestScheduler
+setup; "no retries" is how the fetcher behaved before the scheduler existed
+(a throttled video was simply dropped).
+
+Usage: python benchmarks/bench_rate_limiting.py [--videos N] [--workers N] [--server-rate N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from rate_limiter import RequestScheduler
+from fake_backend import FakeBackend, PLAYLIST_URL
+from stub_server import StubServer
+
+
+def run_job(stub, videos, workers, scheduler):
+    stub.reset()
+    FakeBackend(playlist_size=videos, server_url=stub.url).install(transcript_fetcher)
+    saved = []
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as save_directory:
+        asyncio.run(transcript_fetcher.process_videos(
+            PLAYLIST_URL,
+            ["txt"],
+            "en",
+            save_directory,
+            lambda message, msg_type="info": None,
+            lambda title, url, file_path: saved.append(file_path),
+            threading.Event(),
+            "overwrite",
+            lambda current, total: None,
+            max_workers=workers,
+            context=transcript_fetcher.JobContext(scheduler=scheduler)
+        ))
+    return len(saved), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--server-rate", type=float, default=100.0, help="requests per second the stub accepts")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("no retries", dict(max_retries=0, adaptive=False)),
+        ("retries + backoff", dict(max_retries=8, base_delay=0.05, adaptive=False)),
+        ("retries + adaptive", dict(max_retries=8, base_delay=0.05, adaptive=True)),
+        ("retries + adaptive + bucket", dict(max_retries=8, base_delay=0.05, adaptive=True,
+                                             rate=args.server_rate * 0.95)),
+    ]
+    print(f"{args.videos} videos, {args.workers} workers, stub accepts {args.server_rate:g} req/s, "
+          f"{args.latency * 1000:.0f} ms latency")
+    print(f"{'scenario':<28} {'saved':>6} {'429s':>6} {'retries':>8} {'seconds':>8} {'videos/s':>9} {'limit':>6}")
+    with StubServer(latency=args.latency, max_rate=args.server_rate, burst=args.server_rate / 5) as stub:
+        for name, options in scenarios:
+            scheduler = RequestScheduler(max_concurrency=args.workers, **options)
+            saved, elapsed = run_job(stub, args.videos, args.workers, scheduler)
+            print(f"{name:<28} {saved:>6} {stub.responses[429]:>6} {scheduler.stats['retries']:>8} "
+                  f"{elapsed:>8.2f} {saved / elapsed:>9.1f} {scheduler.concurrency_limit:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
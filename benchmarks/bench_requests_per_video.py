@@ -0,0 +1,73 @@
+# benchmarks/bench_requests_per_video.py
+
+"""HTTP requests made per video, counted by a local stub server.
+
+Compares building a full pytubefix YouTube object for every video (the old
+behaviour) with the lightweight ID/title resolution.
+
+Usage: python benchmarks/bench_requests_per_video.py [--videos N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, PLAYLIST_URL
+from stub_server import StubServer
+
+
+def legacy_fetch_video_metadata(video_url, video_title=None, scheduler=None, session=None, backend=None):
+    return backend.video_metadata(video_url)
+
+
+def run_job(stub, videos, playlist_titles, legacy):
+    stub.reset()
+    FakeBackend(playlist_size=videos, playlist_titles=playlist_titles, server_url=stub.url).install(transcript_fetcher)
+    fetch_video_metadata = transcript_fetcher.fetch_video_metadata
+    if legacy:
+        transcript_fetcher.fetch_video_metadata = legacy_fetch_video_metadata
+    try:
+        with tempfile.TemporaryDirectory() as save_directory:
+            asyncio.run(transcript_fetcher.process_videos(
+                PLAYLIST_URL,
+                ["txt"],
+                "en",
+                save_directory,
+                lambda message, msg_type="info": None,
+                lambda title, url, file_path: None,
+                threading.Event(),
+                "overwrite",
+                lambda current, total: None
+            ))
+    finally:
+        transcript_fetcher.fetch_video_metadata = fetch_video_metadata
+    per_video = {path: count / videos for path, count in stub.requests.items() if path != "/playlist"}
+    return sum(per_video.values()), per_video
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("before: YouTube() per video", True, True),
+        ("after: title from oEmbed", False, False),
+        ("after: title from playlist listing", True, False),
+    ]
+    with StubServer() as stub:
+        print(f"{args.videos} videos")
+        for name, playlist_titles, legacy in scenarios:
+            total, per_video = run_job(stub, args.videos, playlist_titles, legacy)
+            breakdown = ", ".join(f"{path} {count:g}" for path, count in sorted(per_video.items()))
+            print(f"{name:<36} {total:>4g} requests/video  ({breakdown})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_search.py
+
+"""Indexing and query time of the full-text search index.
+
+Adds fake transcripts of random words one video at a time (the way the
+fetcher feeds the index), then times queries, and re-indexing one video
+once the index is full.
+
+Usage: python benchmarks/bench_search.py [--videos N] [--segments N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_search import SearchIndex
+
+VOCABULARY_SIZE = 20000
+WORDS_PER_SEGMENT = 10
+
+
+def make_vocabulary(rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(VOCABULARY_SIZE)]
+
+
+def make_transcript(rng, vocabulary, segments):
+    # Zipf-like word frequencies, so some words are common and most are rare
+    words = rng.choices(vocabulary, weights=[1 / (rank + 1) for rank in range(len(vocabulary))],
+                        k=segments * WORDS_PER_SEGMENT)
+    return [
+        {'text': " ".join(words[i * WORDS_PER_SEGMENT:(i + 1) * WORDS_PER_SEGMENT]), 'start': i * 2.0, 'duration': 2.0}
+        for i in range(segments)
+    ]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--segments", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    with tempfile.TemporaryDirectory() as directory:
+        search_index = SearchIndex(os.path.join(directory, "index.sqlite3"))
+        add_times = []
+        for i in range(args.videos):
+            transcript_data = make_transcript(rng, vocabulary, args.segments)
+            start = time.perf_counter()
+            search_index.add(f"vid{i:08d}", "en", f"Video {i}", f"https://www.youtube.com/watch?v=vid{i:08d}",
+                             transcript_data)
+            add_times.append(time.perf_counter() - start)
+        size = os.path.getsize(os.path.join(directory, "index.sqlite3")) / 2 ** 20
+        print(f"{args.videos} videos x {args.segments} segments, index {size:.0f} MB")
+        print(f"add one video: mean {statistics.mean(add_times) * 1000:.2f} ms, "
+              f"first 100 {statistics.mean(add_times[:100]) * 1000:.2f} ms, "
+              f"last 100 {statistics.mean(add_times[-100:]) * 1000:.2f} ms")
+
+        start = time.perf_counter()
+        search_index.add("vid00000000", "en", "Video 0", "https://www.youtube.com/watch?v=vid00000000",
+                         make_transcript(rng, vocabulary, args.segments))
+        print(f"re-index one video: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        for name, words in (("one rare word", 1), ("two words", 2), ("three words", 3)):
+            times = []
+            hits = 0
+            for _ in range(args.queries):
+                query = " ".join(rng.choices(vocabulary[100:], weights=weights[100:], k=words))
+                start = time.perf_counter()
+                hits += len(search_index.search(query))
+                times.append(time.perf_counter() - start)
+            print(f"{name:<14} p50 {percentile(times, 0.5) * 1000:6.2f} ms  p99 {percentile(times, 0.99) * 1000:6.2f} ms"
+                  f"  ({hits / args.queries:.1f} hits/query)")
+        search_index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# benchmarks/bench_suite.py
+
+"""End-to-end jobs against the fake backend: throughput, p50/p99 per-video latency and peak RSS per scenario.
+
+Each scenario runs process_videos on a FakeBackend (no network access) in
+a fresh interpreter, so peak RSS is that scenario's alone. The fake is
+deterministic for its seed, so two runs do the same work and their
+numbers can be compared: --save writes the results as JSON, and
+--compare checks a run against saved results, failing (exit 1) when
+throughput drops or p99 latency or peak RSS grows by more than
+--tolerance.
+
+Usage: python benchmarks/bench_suite.py [--scenarios NAME ...] [--scale X] [--save PATH] [--compare PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, PLAYLIST_URL
+from run_metrics import RunMetrics
+
+# name -> (FakeBackend options, process_videos options); "videos" is scaled by --scale
+SCENARIOS = {
+    "baseline": (
+        {"playlist_size": 200, "latency": 0.02},
+        {"language": "en", "output_formats": ["txt"]},
+    ),
+    "large_playlist": (
+        {"playlist_size": 2000, "latency": 0.005, "segments_per_video": 20},
+        {"language": "en", "output_formats": ["txt"]},
+    ),
+    "long_transcripts": (
+        {"playlist_size": 100, "latency": 0.02, "segments_per_video": (2000, 20000)},
+        {"language": "en", "output_formats": ["txt", "srt", "json"]},
+    ),
+    "flaky": (
+        {"playlist_size": 200, "latency": 0.02, "latency_jitter": 0.8, "error_rate": 0.1,
+         "no_transcript_rate": 0.1},
+        {"language": "en", "output_formats": ["txt"]},
+    ),
+    "languages": (
+        {"playlist_size": 100, "latency": 0.02, "languages": ("en", "de", "fr")},
+        {"language": "en,de,fr>ja", "output_formats": ["txt"]},
+    ),
+}
+
+# Results compared by --compare: name, whether higher is better
+COMPARED = (("videos_per_second", True), ("p99_seconds", False), ("peak_rss_mb", False))
+
+
+class SampledMetrics(RunMetrics):
+    """RunMetrics that also keeps every per-video latency, for exact percentiles."""
+
+    def __init__(self):
+        super().__init__()
+        self.video_seconds = []
+
+    def observe(self, stage, seconds):
+        super().observe(stage, seconds)
+        if stage == "video":
+            with self._lock:
+                self.video_seconds.append(seconds)
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def run_scenario(name, scale, workers):
+    """Run one scenario in this process and return its results."""
+    backend_options, job_options = SCENARIOS[name]
+    backend_options = dict(backend_options, playlist_size=max(1, int(backend_options["playlist_size"] * scale)))
+    backend = FakeBackend(**backend_options)
+    metrics = SampledMetrics()
+    with tempfile.TemporaryDirectory() as save_directory:
+        asyncio.run(transcript_fetcher.process_videos(
+            PLAYLIST_URL,
+            job_options["output_formats"],
+            job_options["language"],
+            save_directory,
+            lambda message, msg_type="info": None,
+            lambda title, url, file_path: None,
+            threading.Event(),
+            "overwrite",
+            lambda current, total: None,
+            max_workers=workers,
+            context=transcript_fetcher.JobContext(metrics=metrics, backend=backend)
+        ))
+    samples = metrics.video_seconds
+    peak_rss = peak_rss_mb()
+    return {
+        "videos": metrics.counters.get("videos_completed", 0),
+        "seconds": round(metrics.elapsed(), 3),
+        "videos_per_second": round(metrics.videos_per_second(), 2),
+        "p50_seconds": round(percentile(samples, 0.5), 4),
+        "p99_seconds": round(percentile(samples, 0.99), 4),
+        "mean_seconds": round(statistics.fmean(samples), 4) if samples else 0.0,
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+        "calls": backend.calls,
+        "injected_errors": sum(backend.errors.values()),
+        "saved": metrics.counters.get("videos_saved", 0),
+        "no_transcript": metrics.counters.get("videos_no_transcript", 0),
+        "failed": metrics.counters.get("videos_failed", 0),
+    }
+
+
+def run_isolated(name, scale, workers):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run", name, "--scale", str(scale), "--workers", str(workers)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key, higher_is_better in COMPARED:
+            before, after = baseline[name].get(key), result.get(key)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if (-change if higher_is_better else change) > tolerance:
+                found.append(f"{name}: {key} {before} -> {after} ({change:+.0%})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario's video count")
+    parser.add_argument("--workers", type=int, default=transcript_fetcher.DEFAULT_MAX_WORKERS)
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="fail on regressions against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change (default: 0.2)")
+    parser.add_argument("--run", help=argparse.SUPPRESS)  # One scenario in this process, JSON on stdout
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_scenario(args.run, args.scale, args.workers)))
+        return
+
+    print(f"{args.workers} workers, scale {args.scale}")
+    print(f"{'scenario':<17} {'videos':>6} {'seconds':>8} {'videos/s':>9} {'p50':>8} {'p99':>8} {'peak RSS':>9}"
+          f" {'calls':>6} {'errors':>6} {'no caps':>7} {'failed':>6}")
+    results = {}
+    for name in args.scenarios:
+        result = results[name] = run_isolated(name, args.scale, args.workers)
+        rss = f"{result['peak_rss_mb']:.1f} MB" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{name:<17} {result['videos']:>6} {result['seconds']:>8.2f} {result['videos_per_second']:>9.1f}"
+              f" {result['p50_seconds'] * 1000:>5.0f} ms {result['p99_seconds'] * 1000:>5.0f} ms {rss:>9}"
+              f" {result['calls']:>6} {result['injected_errors']:>6} {result['no_transcript']:>7} {result['failed']:>6}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if not found:
+            print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
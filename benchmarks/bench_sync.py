@@ -0,0 +1,99 @@
+# benchmarks/bench_sync.py
+
+"""Cost of a daily re-run of a channel against its number of new uploads.
+
+Syncs a fake channel (newest video first) once, then again after a few
+new uploads, with and without sync mode. The plain "skip" re-run still
+lists the whole channel; a sync stops at the previous sync's newest video.
+The last row replaces some auto-generated captions with manual ones and
+forces a recheck of every video that had auto-generated captions.
+
+Usage: python benchmarks/bench_sync.py [--videos N ...] [--new N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcript_fetcher
+from fake_backend import FakeBackend, DEFAULT_LATENCY
+from sync_state import SyncState
+
+# An uploads playlist, so sync treats it as newest-first
+CHANNEL_URL = "https://www.youtube.com/playlist?list=UUfakebenchmark"
+
+# Every GENERATED_EVERY-th video starts with auto-generated captions
+GENERATED_EVERY = 10
+
+
+def run_job(save_directory, workers, sync):
+    messages = collections.Counter()
+
+    def console_output(message, msg_type="info"):
+        messages[message.split(":")[0]] += 1
+
+    start = time.perf_counter()
+    asyncio.run(transcript_fetcher.process_videos(
+        CHANNEL_URL,
+        ["txt"],
+        "en",
+        save_directory,
+        console_output,
+        lambda title, url, file_path: None,
+        threading.Event(),
+        "skip",
+        lambda current, total: None,
+        max_workers=workers,
+        context=transcript_fetcher.JobContext(sync=sync)
+    ))
+    return time.perf_counter() - start, messages
+
+
+def measure(name, backend, save_directory, workers, sync):
+    calls = backend.calls
+    seconds, messages = run_job(save_directory, workers, sync)
+    fetched = messages["Successfully processed"]
+    print(f"{name:<34} {seconds:>7.2f} s {backend.calls - calls:>7} calls {fetched:>6} saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--new", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--workers", type=int, default=transcript_fetcher.DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    print(f"{args.latency * 1000:.0f} ms per fake network call, {args.new} new uploads per day")
+    for size in args.videos:
+        print(f"channel of {size} videos")
+        generated = {f"vid{i:08d}" for i in range(0, size, GENERATED_EVERY)}
+        backend = FakeBackend(latency=args.latency, playlist_size=size, newest_first=True, generated_ids=generated)
+        backend.install(transcript_fetcher)
+        for sync_mode in (False, True):
+            with tempfile.TemporaryDirectory() as save_directory:
+                backend.playlist_size = size
+                run_job(save_directory, args.workers, SyncState(save_directory) if sync_mode else None)
+                backend.playlist_size = size + args.new
+                name = "next day, sync" if sync_mode else "next day, skip (no sync)"
+                measure(name, backend, save_directory, args.workers,
+                        SyncState(save_directory) if sync_mode else None)
+                if sync_mode:
+                    measure("next day again, nothing new", backend, save_directory, args.workers,
+                            SyncState(save_directory))
+                    # Half of the auto-generated captions got replaced by manual ones
+                    backend.generated_ids = set(sorted(generated)[::2])
+                    measure("recheck auto-generated captions", backend, save_directory, args.workers,
+                            SyncState(save_directory, recheck_interval=0))
+                    backend.generated_ids = generated
+
+
+if __name__ == "__main__":
+    main()
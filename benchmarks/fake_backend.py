@@ -0,0 +1,246 @@
+# benchmarks/fake_backend.py
+
+"""In-process stand-in for YouTube: a backend with the methods of youtube_backend.YouTubeBackend.
+
+Every fake network call sleeps for the configured latency (or, when a stub
+server URL is given, makes a real HTTP request to it), so benchmarks
+measure how transcript_fetcher schedules the work, not YouTube. Pass it
+as JobContext(backend=...), or install() it as the default backend.
+
+Everything is deterministic for a given seed: which videos have no
+captions, how long each transcript is, which calls fail and how long each
+one takes are derived from the seed and the call, never from timing or
+thread order, so two runs do the same work.
+"""
+
+import collections
+import random
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+
+from youtube_backend import WATCH_URL
+
+# Simulated round trip (in seconds) for every fake network call
+DEFAULT_LATENCY = 0.05
+
+# Videos per playlist page, like YouTube's playlist listing
+PAGE_SIZE = 100
+
+# Any playlist URL works, the fake playlist ignores it
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLfakebenchmark"
+
+
+class FakeBackend:
+    """Fake YouTube whose playlists have playlist_size videos (vid00000000, ...), each with captions in languages.
+
+    A playlist whose ID ends in a number N lists the N-th block of
+    playlist_size videos instead (PLAYLIST_URL + "3" starts at video
+    3 * playlist_size), so several playlists can have distinct videos;
+    every other playlist lists the first block.
+
+    latency is the time (in seconds) of every network call, varied by up to
+    latency_jitter of itself either way. error_rate is the share of calls
+    whose first attempt fails with a ConnectionError (the scheduler retries
+    it); no_transcript_rate the share of videos with captions disabled.
+    segments_per_video is a count, or a (low, high) range each video's
+    length is drawn from.
+    """
+
+    def __init__(self, latency=DEFAULT_LATENCY, playlist_size=100, segments_per_video=50,
+                 playlist_titles=True, server_url=None, ssl_context=None, newest_first=False, generated_ids=(),
+                 languages=("en",), translation_languages=("de", "fr", "es", "ja"),
+                 latency_jitter=0.0, error_rate=0.0, no_transcript_rate=0.0, seed=0):
+        self.latency = latency
+        self.playlist_size = playlist_size
+        self.segments_per_video = segments_per_video
+        self.playlist_titles = playlist_titles
+        self.server_url = server_url
+        self.ssl_context = ssl_context  # For HTTPS stub servers with a self-signed certificate
+        self.newest_first = newest_first  # List the playlist like a channel's uploads, highest video number first
+        self.generated_ids = set(generated_ids)  # Videos whose captions are auto-generated
+        self.languages = tuple(languages)  # Caption languages of every video
+        self.translation_languages = tuple(translation_languages)  # Languages YouTube can translate them into
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.no_transcript_rate = no_transcript_rate
+        self.seed = seed
+        self.requests = collections.Counter()  # Fake network calls, by path
+        self.errors = collections.Counter()  # Injected failures, by path
+        self._attempts = collections.Counter()  # Calls so far, by (path, key)
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return sum(self.requests.values())
+
+    def chance(self, *parts):
+        """A number in [0, 1) that depends only on the seed and parts."""
+        return random.Random(":".join(map(str, (self.seed,) + parts))).random()
+
+    def network_call(self, path, session=None, key=None, query=""):
+        """One fake request for path; key names what it is for (a video ID, a page), so failures are repeatable."""
+        with self._lock:
+            self.requests[path] += 1
+            attempt = self._attempts[path, key]
+            self._attempts[path, key] += 1
+        if self.server_url and session is not None:
+            response = session.get(self.server_url + path + query)
+            response.raise_for_status()
+        elif self.server_url:
+            with urllib.request.urlopen(self.server_url + path + query, context=self.ssl_context) as response:
+                response.read()
+        else:
+            latency = self.latency
+            if self.latency_jitter:
+                latency *= 1 + self.latency_jitter * (2 * self.chance("latency", path, key, attempt) - 1)
+            time.sleep(latency)
+        # Only first attempts fail, so every call goes through once the scheduler retries it
+        if attempt == 0 and self.error_rate and self.chance("error", path, key) < self.error_rate:
+            with self._lock:
+                self.errors[path] += 1
+            raise ConnectionError(f"Fake network error: {path} {key}")
+
+    def has_transcripts(self, video_id):
+        return not self.no_transcript_rate or self.chance("captions", video_id) >= self.no_transcript_rate
+
+    def segment_count(self, video_id):
+        if isinstance(self.segments_per_video, int):
+            return self.segments_per_video
+        low, high = self.segments_per_video
+        return low + int(self.chance("segments", video_id) * (high - low + 1))
+
+    def transcript_data(self, video_id, language="en"):
+        kind = "auto" if video_id in self.generated_ids else "segment"
+        if language != "en":
+            kind = f"{language} {kind}"
+        return [
+            {'text': f"{video_id} {kind} {i}", 'start': i * 2.0, 'duration': 2.0}
+            for i in range(self.segment_count(video_id))
+        ]
+
+    # The backend interface (see youtube_backend.YouTubeBackend)
+
+    def first_video(self, playlist_url):
+        playlist_id = urllib.parse.parse_qs(urllib.parse.urlparse(playlist_url).query)["list"][0]
+        block = re.search(r"\d+$", playlist_id)
+        return int(block.group()) * self.playlist_size if block else 0
+
+    def open_playlist(self, url):
+        playlist = FakePlaylist(self, self.first_video(url))
+        return playlist, iter(playlist.url_generator()), self.playlist_size
+
+    def reopen_playlist(self, url, skip):
+        playlist = FakePlaylist(self, self.first_video(url))
+        playlist_urls = iter(playlist.url_generator())
+        for _ in range(skip):
+            next(playlist_urls, None)
+        return playlist, playlist_urls
+
+    def video_title(self, video_id, session=None):
+        # The stub server answers oEmbed like YouTube, from the video URL in the query
+        query = "?" + urllib.parse.urlencode({"url": WATCH_URL.format(video_id), "format": "json"})
+        self.network_call("/oembed", session, video_id, query)
+        return f"Video {video_id}"
+
+    def video_metadata(self, video_url):
+        # pytubefix loads the watch page, the player JS and the player API for the title
+        video_id = video_url.split("v=")[-1].split("&")[0]
+        self.network_call("/watch", key=video_id)
+        self.network_call("/player.js", key=video_id)
+        self.network_call("/youtubei/v1/player", key=video_id)
+        return video_id, f"Video {video_id}"
+
+    def list_transcripts(self, video_id, session=None):
+        # youtube-transcript-api reads the caption tracks from the watch page
+        self.network_call("/watch", session, video_id)
+        if not self.has_transcripts(video_id):
+            raise TranscriptsDisabled(video_id)
+        return FakeTranscriptList(self, video_id, session)
+
+    def fetch_transcript(self, transcript):
+        self.network_call("/api/timedtext", transcript.session, (transcript.video_id, transcript.language_code))
+        return self.transcript_data(transcript.video_id, transcript.language_code)
+
+    def install(self, module):
+        """Make this the backend of module (transcript_fetcher) for every job that doesn't pass one."""
+        module.default_backend = self
+
+
+class FakePlaylist:
+    def __init__(self, backend, first_video=0):
+        self.backend = backend
+        self.first_video = first_video
+        self.length = backend.playlist_size
+        self.video_titles = {}
+
+    def url_generator(self):
+        # Pages of PAGE_SIZE videos, each loaded only when the previous one is used up
+        all_urls = video_urls(self.backend.playlist_size, self.first_video)
+        if self.backend.newest_first:
+            all_urls.reverse()
+        for start in range(0, len(all_urls), PAGE_SIZE):
+            self.backend.network_call("/playlist", key=self.first_video + start)
+            page = all_urls[start:start + PAGE_SIZE]
+            if self.backend.playlist_titles:
+                for video_url in page:
+                    video_id = video_url.split("v=")[-1]
+                    self.video_titles[video_id] = f"Video {video_id}"
+            yield from page
+
+
+class FakeTranscript:
+    def __init__(self, backend, video_id, session=None, language_code="en", translated=False):
+        self.video_id = video_id
+        self.session = session
+        self.language_code = language_code
+        self.is_generated = translated or video_id in backend.generated_ids
+        self.translation_languages = [] if translated else [
+            {'language': code, 'language_code': code} for code in backend.translation_languages
+        ]
+        self._backend = backend
+
+    @property
+    def is_translatable(self):
+        return bool(self.translation_languages)
+
+    def translate(self, language_code):
+        return FakeTranscript(self._backend, self.video_id, self.session, language_code, translated=True)
+
+    def fetch(self):
+        return self._backend.fetch_transcript(self)
+
+
+class FakeTranscriptList:
+    def __init__(self, backend, video_id, session=None):
+        self.backend = backend
+        self.video_id = video_id
+        self.session = session
+        self.generated = video_id in backend.generated_ids
+
+    def __iter__(self):
+        return (FakeTranscript(self.backend, self.video_id, self.session, code) for code in self.backend.languages)
+
+    def find_transcript(self, languages):
+        for code in languages:
+            if code in self.backend.languages:
+                return FakeTranscript(self.backend, self.video_id, self.session, code)
+        raise NoTranscriptFound(self.video_id, languages, None)
+
+    def find_manually_created_transcript(self, languages):
+        if self.generated:
+            raise NoTranscriptFound(self.video_id, languages, None)
+        return self.find_transcript(languages)
+
+    def find_generated_transcript(self, languages):
+        if not self.generated:
+            raise NoTranscriptFound(self.video_id, languages, None)
+        return self.find_transcript(languages)
+
+
+def video_urls(count, first=0):
+    return [f"https://www.youtube.com/watch?v=vid{i:08d}" for i in range(first, first + count)]
@@ -0,0 +1,116 @@
+# benchmarks/stub_server.py
+
+"""Local HTTP server that answers every request and counts them by path.
+
+It can add latency, throttle with HTTP 429 once more than max_rate requests
+per second come in, and fail a share of requests with HTTP 503. Given a
+certificate and key it serves HTTPS, and it counts the connections (TLS
+handshakes) clients open, keeping connections alive between requests.
+"""
+
+import collections
+import http.server
+import json
+import random
+import ssl
+import threading
+import time
+import urllib.parse
+
+
+class StubServer:
+    def __init__(self, latency=0.0, max_rate=None, burst=None, error_rate=0.0, seed=0, certfile=None, keyfile=None):
+        self.latency = latency
+        self.max_rate = max_rate
+        self.burst = burst or (max_rate or 0)
+        self.error_rate = error_rate
+        self.requests = collections.Counter()
+        self.responses = collections.Counter()  # By status code
+        self.connections = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            # Handshake in the handler thread, not in the accepting one
+            self._server.socket = context.wrap_socket(
+                self._server.socket, server_side=True, do_handshake_on_connect=False
+            )
+        self.scheme = "https" if certfile else "http"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"{self.scheme}://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.responses.clear()
+            self.connections = 0
+            self._tokens = self.burst
+            self._updated = time.monotonic()
+
+    def _status_for_request(self):
+        with self._lock:
+            if self.max_rate:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.max_rate)
+                self._updated = now
+                if self._tokens < 1:
+                    return 429
+                self._tokens -= 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503
+            return 200
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+            disable_nagle_algorithm = True  # Headers and body are separate writes
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                parsed_url = urllib.parse.urlparse(self.path)
+                with stub._lock:
+                    stub.requests[parsed_url.path] += 1
+                time.sleep(stub.latency)
+                status = stub._status_for_request()
+                with stub._lock:
+                    stub.responses[status] += 1
+                if status != 200:
+                    self.send_error(status)
+                    return
+                if parsed_url.path == "/oembed":
+                    video_url = urllib.parse.parse_qs(parsed_url.query)["url"][0]
+                    body = json.dumps({"title": f"Video {video_url.split('v=')[-1]}"})
+                else:
+                    body = "ok"
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
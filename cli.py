@@ -0,0 +1,223 @@
+# cli.py
+
+"""Headless batch entry point: fetch transcripts for a list of URLs without the GUI.
+
+Reads video/playlist URLs (one per line, '#' starts a comment) from the given
+files or from stdin and writes progress to stdout as JSON lines. Never imports
+tkinter, so it runs on machines without a display.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+from transcript_fetcher import process_videos, JobContext, DEFAULT_MAX_WORKERS, TRANSCRIPT_SAVERS, SHARD_FORMAT
+from transcript_cache import TranscriptCache, DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL_DAYS, DEFAULT_CACHE_MAX_MB
+from job_journal import JobJournal, DEFAULT_JOURNAL_DIR
+from rate_limiter import RequestScheduler
+from http_session import create_session
+from transcript_search import SearchIndex, DEFAULT_INDEX_PATH
+from sync_state import SyncState, DEFAULT_RECHECK_INTERVAL
+from run_metrics import RunMetrics
+from language_plan import LanguagePlan
+from transcript_cleanup import CleanupOptions, create_process_pool, CHARS, TOKENS
+
+FILE_POLICIES = ('skip', 'overwrite', 'append number')
+
+
+def read_urls(paths):
+    """Yield the URLs listed in the given files ('-' reads stdin)."""
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        try:
+            for line in stream:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    yield line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def emit(event, **fields):
+    """Write one JSON line to stdout."""
+    fields = {'event': event, 'time': round(time.time(), 3), **fields}
+    sys.stdout.write(json.dumps(fields, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch YouTube transcripts for a list of video/playlist URLs.")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="files with one URL per line ('-' or nothing reads stdin)")
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=sorted(TRANSCRIPT_SAVERS) + [SHARD_FORMAT],
+                        help="output format, repeat for several (default: txt); 'shard' writes every "
+                             "transcript of the job to one transcripts_<job id>.jsonl.gz")
+    parser.add_argument('-l', '--language', default='en',
+                        help="transcript language code, or several separated by commas; '|' separates fallbacks "
+                             "(e.g. en|en-GB,de) (default: en)")
+    parser.add_argument('--translate', metavar='LANGS', default='',
+                        help="comma-separated languages to machine-translate into when a video has no "
+                             "transcript of its own in them")
+    parser.add_argument('--language-order', action='store_true',
+                        help="take the first fallback language with any captions, even auto-generated ones, "
+                             "instead of preferring manual captions")
+    parser.add_argument('--clean', action='store_true',
+                        help="strip noise tags like [Music], drop the words rolling captions repeat, and regroup "
+                             "the captions into sentences before saving")
+    parser.add_argument('--chunk-size', type=int, default=None, metavar='N',
+                        help="pack the saved captions into chunks of at most N characters or tokens (for indexing)")
+    parser.add_argument('--chunk-unit', default=CHARS, choices=(CHARS, TOKENS), help="unit of --chunk-size")
+    parser.add_argument('-o', '--output-dir', default=os.path.join(os.getcwd(), 'downloads'),
+                        help="directory to save transcripts in (default: ./downloads)")
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"videos fetched at the same time (default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument('-p', '--file-policy', default='skip', choices=FILE_POLICIES,
+                        help="what to do when the output file exists (default: skip)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="maximum YouTube requests per second (default: no limit)")
+    parser.add_argument('--retries', type=int, default=4,
+                        help="retries for throttled or failed requests (default: 4)")
+    parser.add_argument('--no-adaptive', action='store_true',
+                        help="don't lower the number of parallel requests when YouTube throttles")
+    parser.add_argument('--cookies', default=None, help="cookies.txt (Netscape format) to send with every request")
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help="transcript cache database")
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_CACHE_TTL_DAYS,
+                        help=f"drop cached transcripts older than this (default: {DEFAULT_CACHE_TTL_DAYS})")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB,
+                        help="drop the least recently used cached transcripts past this size "
+                             f"(default: {DEFAULT_CACHE_MAX_MB})")
+    parser.add_argument('--no-cache', action='store_true', help="always fetch transcripts from YouTube")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip videos an earlier run of the same job finished or found without transcript")
+    parser.add_argument('--journal-dir', default=DEFAULT_JOURNAL_DIR, help="folder for job journals (default: jobs)")
+    parser.add_argument('--sync', action='store_true',
+                        help="only fetch videos that are new or whose captions changed since the last --sync "
+                             "into the same output directory")
+    parser.add_argument('--recheck-days', type=float, default=DEFAULT_RECHECK_INTERVAL / 86400,
+                        help="with --sync, how often auto-generated captions are checked for a manual "
+                             "replacement (default: 7)")
+    parser.add_argument('--report', metavar='PATH', help="write a JSON run report with per-stage timings to PATH")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="write the run's metrics in the Prometheus text format to PATH")
+    parser.add_argument('--index-path', default=DEFAULT_INDEX_PATH, help="full-text search index database")
+    parser.add_argument('--no-index', action='store_true', help="don't add saved transcripts to the search index")
+    parser.add_argument('--search', metavar='QUERY',
+                        help="print the indexed segments matching QUERY as 'hit' events instead of fetching")
+    parser.add_argument('--limit', type=int, default=50, help="most hits printed by --search (default: 50)")
+    args = parser.parse_args(argv)
+    try:
+        args.plan = LanguagePlan.parse(args.language, args.translate, prefer_manual=not args.language_order)
+    except ValueError as e:
+        parser.error(str(e))
+    args.cleanup = None
+    if args.clean or args.chunk_size is not None:
+        try:
+            args.cleanup = CleanupOptions(strip_noise=args.clean, dedupe=args.clean, resegment=args.clean,
+                                          chunk_size=args.chunk_size, chunk_unit=args.chunk_unit)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def search(args):
+    search_index = SearchIndex(args.index_path)
+    try:
+        hits = search_index.search(args.search, limit=args.limit)
+    finally:
+        search_index.close()
+    for hit in hits:
+        emit('hit', **hit)
+    return 0 if hits else 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.search is not None:
+        return search(args)
+    urls = list(read_urls(args.inputs))
+    formats = args.formats or ['txt']
+    counts = {'saved': 0, 'errors': 0}
+
+    def console_output(message, msg_type="info"):
+        if msg_type == "error":
+            counts['errors'] += 1
+        emit('log', type=msg_type, message=message)
+
+    def update_recent_downloads(title, url, file_path):
+        counts['saved'] += 1
+        emit('saved', title=title, url=url, file_path=file_path)
+
+    def progress(current, total):
+        emit('progress', current=current, total=total)
+
+    cache = None if args.no_cache else TranscriptCache(
+        args.cache_path, ttl=args.cache_ttl_days * 86400, max_size=int(args.cache_max_mb * 1024 * 1024)
+    )
+    search_index = None if args.no_index else SearchIndex(args.index_path)
+    sync = SyncState(args.output_dir, recheck_interval=args.recheck_days * 86400) if args.sync else None
+    metrics = RunMetrics() if args.report or args.prometheus else None
+    journal = JobJournal.for_job(urls, formats, str(args.plan), args.output_dir,
+                                 journal_dir=args.journal_dir, resume=args.resume)
+    stop_event = threading.Event()
+    scheduler = RequestScheduler(rate=args.rate, max_retries=args.retries, max_concurrency=args.workers,
+                                 adaptive=not args.no_adaptive, stop_event=stop_event)
+    session = create_session(pool_size=args.workers, cookies_path=args.cookies)
+    # cli.py is guarded by __main__, so the clean-up workers may be spawned where they can't be forked
+    process_pool = create_process_pool(allow_spawn=True) if args.cleanup is not None else None
+    emit('start', urls=len(urls), formats=formats, language=str(args.plan), workers=args.workers,
+         journal=journal.path)
+    start = time.perf_counter()
+    try:
+        asyncio.run(process_videos(
+            urls,
+            formats,
+            args.plan,
+            args.output_dir,
+            console_output,
+            update_recent_downloads,
+            stop_event,
+            args.file_policy,
+            progress,
+            max_workers=args.workers,
+            context=JobContext(
+                cache=cache,
+                journal=journal,
+                scheduler=scheduler,
+                session=session,
+                search_index=search_index,
+                sync=sync,
+                metrics=metrics,
+                cleanup=args.cleanup,
+                process_pool=process_pool
+            )
+        ))
+    except KeyboardInterrupt:
+        stop_event.set()
+        emit('cancelled')
+        return 130
+    finally:
+        session.close()
+        if process_pool is not None:
+            process_pool.shutdown(cancel_futures=True)
+        journal.close()
+        if cache is not None:
+            cache.close()
+        if search_index is not None:
+            search_index.close()
+        if metrics is not None:
+            if args.report:
+                metrics.write_report(args.report)
+            if args.prometheus:
+                metrics.write_prometheus(args.prometheus)
+    emit('done', saved=counts['saved'], errors=counts['errors'], seconds=round(time.perf_counter() - start, 3),
+         statuses=journal.counts(), requests=scheduler.stats)
+    return 1 if counts['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# http_session.py
+
+import http.cookiejar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeout in seconds for every request that doesn't set its own
+DEFAULT_TIMEOUT = (10, 30)
+
+
+class PooledSession(requests.Session):
+    """requests.Session with a default timeout for every request."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size, timeout=DEFAULT_TIMEOUT, cookies_path=None):
+    """Create the HTTP session shared by all videos of a job.
+
+    Keeps up to pool_size keep-alive connections per host, so each worker
+    can reuse its connection instead of a new TCP/TLS handshake per request.
+    Cookies, including YouTube's consent cookie, are shared by every request.
+    cookies_path can point to a Netscape-format cookies.txt to send along.
+    """
+    session = PooledSession(timeout)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Language'] = 'en-US'
+    if cookies_path:
+        cookie_jar = http.cookiejar.MozillaCookieJar(cookies_path)
+        cookie_jar.load(ignore_discard=True, ignore_expires=True)
+        session.cookies.update(cookie_jar)
+    return session
@@ -0,0 +1,104 @@
+# job_journal.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Default folder for job journals, next to settings.json
+DEFAULT_JOURNAL_DIR = 'jobs'
+
+# Video statuses recorded in a journal
+PENDING = "pending"
+DONE = "done"
+NO_TRANSCRIPT = "no-transcript"
+FAILED = "failed"
+
+# Videos with these statuses are not fetched again when a job is resumed
+FINISHED_STATUSES = (DONE, NO_TRANSCRIPT)
+
+# Buffered records are written out once there are this many, or after FLUSH_INTERVAL seconds
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 1.0
+
+
+def job_id_for(urls, output_formats, language, save_directory):
+    """Stable ID for a job, so running the same job again finds its journal."""
+    key = json.dumps([list(urls), sorted(output_formats), language, os.path.abspath(save_directory)])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class JobJournal:
+    """Append-only JSON-lines log of each video's status in a job.
+
+    Every record is one line; when the journal is loaded the last record of
+    a video wins. Records are buffered and written in batches, so recording
+    a status is cheap even with many workers.
+    """
+
+    def __init__(self, path, resume=True):
+        self.path = path
+        self.statuses = {}  # video key -> latest record
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @classmethod
+    def for_job(cls, urls, output_formats, language, save_directory, journal_dir=DEFAULT_JOURNAL_DIR, resume=True):
+        job_id = job_id_for(urls, output_formats, language, save_directory)
+        return cls(os.path.join(journal_dir, f"{job_id}.jsonl"), resume=resume)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Half-written last line after a crash
+                self.statuses[record['video']] = record
+
+    def is_finished(self, video_key):
+        record = self.statuses.get(video_key)
+        return record is not None and record['status'] in FINISHED_STATUSES
+
+    def record(self, video_key, status, file_paths=None, error=None):
+        record = {'video': video_key, 'status': status, 'time': round(time.time(), 3)}
+        if file_paths:
+            record['file_paths'] = file_paths
+        if error:
+            record['error'] = error
+        with self._lock:
+            self.statuses[video_key] = record
+            self._buffer.append(json.dumps(record, ensure_ascii=False) + '\n')
+            if len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush()
+
+    def counts(self):
+        counts = {}
+        with self._lock:
+            for record in self.statuses.values():
+                counts[record['status']] = counts.get(record['status'], 0) + 1
+        return counts
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._file.flush()
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
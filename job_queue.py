@@ -0,0 +1,304 @@
+# job_queue.py
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from transcript_fetcher import process_videos, JobContext, DEFAULT_MAX_WORKERS
+from output_manifest import OutputManifest
+from rate_limiter import RequestScheduler
+from http_session import create_session
+from single_flight import SingleFlight
+from transcript_cleanup import create_process_pool
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+FINISHED_STATUSES = (DONE, CANCELLED, FAILED)
+
+# Jobs running at the same time; the rest wait in priority order
+DEFAULT_MAX_RUNNING_JOBS = 4
+
+# Threads in the shared pool per slot of the concurrency budget, so playlist
+# paging and cache lookups don't wait behind transcript downloads
+THREADS_PER_SLOT = 2
+
+
+class PrioritySlots:
+    """Asyncio counting semaphore whose waiters get freed slots highest priority first (FIFO within a priority)."""
+
+    def __init__(self, size):
+        self.size = max(1, size)
+        self.in_use = 0
+        self._waiters = []  # heap of (-priority, sequence number, future)
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority=0):
+        if self.in_use < self.size and not self._waiters:
+            self.in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Handed a slot just as the waiter was cancelled
+            raise
+
+    def release(self):
+        if self.in_use <= self.size:
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)  # The slot passes straight to the waiter
+                    return
+        self.in_use -= 1
+
+    def resize(self, size):
+        self.size = max(1, size)
+        while self.in_use < self.size and self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+
+class Job:
+    """One URL (video or playlist) queued for download, with its own status, progress and cancel switch."""
+
+    def __init__(self, job_id, url, output_formats, language, save_directory, file_policy, priority=0, options=None):
+        self.id = job_id
+        self.url = url
+        self.output_formats = output_formats
+        self.language = language
+        self.save_directory = save_directory
+        self.file_policy = file_policy
+        self.priority = priority
+        self.options = options or {}  # Extra JobContext dependencies (cache, journal, metrics, ...)
+        self.finalizers = []  # Called with the job once it has finished, e.g. to close its journal
+        self.status = QUEUED
+        self.current = 0
+        self.total = 0
+        self.error = None
+        self.stop_event = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+
+class JobQueue:
+    """Runs download jobs on one long-lived event loop under a global concurrency budget.
+
+    All jobs share one thread pool, HTTP session and RequestScheduler, so a
+    job starts without any setup of its own, and one SingleFlight, so a
+    video two jobs reach at the same time is fetched once. Up to max_running_jobs jobs run
+    at once, started highest priority first; their videos then share
+    max_concurrency slots, again handed out highest priority first.
+    console_output(job, message, msg_type), update_recent_downloads(title,
+    url, file_path) and on_job_update(job) are called from the queue's
+    thread.
+    """
+
+    def __init__(
+        self,
+        console_output,
+        update_recent_downloads,
+        on_job_update,
+        max_concurrency=DEFAULT_MAX_WORKERS,
+        max_running_jobs=DEFAULT_MAX_RUNNING_JOBS,
+        max_threads=None,
+        scheduler=None,
+        session=None
+    ):
+        self.console_output = console_output
+        self.update_recent_downloads = update_recent_downloads
+        self.on_job_update = on_job_update
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_running_jobs = max(1, max_running_jobs)
+        self.scheduler = scheduler or RequestScheduler(max_concurrency=self.max_concurrency)
+        self.session = session or create_session(pool_size=self.max_concurrency)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads or self.max_concurrency * THREADS_PER_SLOT, thread_name_prefix="transcript-worker"
+        )
+        self.jobs = []  # Every submitted job not cleared yet, in submission order
+        self._unfinished = {}  # job ID -> job, for the jobs still queued or running
+        self._jobs_lock = threading.Lock()
+        self._pending = []  # heap of (-priority, sequence number, job)
+        self._sequence = itertools.count(1)
+        self._running = 0
+        self._manifests = {}  # save directory -> future of the OutputManifest shared by its running jobs
+        self._manifest_users = {}  # save directory -> running jobs using its manifest
+        self._loop = asyncio.new_event_loop()
+        self._slots = PrioritySlots(self.max_concurrency)
+        self._single_flight = SingleFlight()
+        self._process_pool = None  # Created for the first job that cleans its transcripts
+        self._thread = threading.Thread(target=self._run_loop, name="job-queue", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, url, output_formats, language, save_directory, file_policy, priority=0, **options):
+        """Queue a job and return it. Thread-safe."""
+        job = Job(next(self._sequence), url, output_formats, language, save_directory, file_policy, priority, options)
+        with self._jobs_lock:
+            self.jobs.append(job)
+            self._unfinished[job.id] = job
+        self._loop.call_soon_threadsafe(self._add, job)
+        return job
+
+    def cancel(self, job):
+        """Stop a running job, or drop a queued one. Thread-safe."""
+        job.stop_event.set()
+        self._loop.call_soon_threadsafe(self._drop_if_queued, job)
+
+    def set_concurrency(self, max_concurrency):
+        """Change the global concurrency budget for the videos that start from now on. Thread-safe."""
+        self.max_concurrency = max(1, max_concurrency)
+        self.scheduler.set_max_concurrency(self.max_concurrency)
+        self._loop.call_soon_threadsafe(self._slots.resize, self.max_concurrency)
+
+    def active_jobs(self):
+        with self._jobs_lock:
+            return list(self._unfinished.values())
+
+    def clear_finished(self):
+        """Forget the finished jobs and return them. Thread-safe."""
+        with self._jobs_lock:
+            finished = [job for job in self.jobs if job.finished]
+            self.jobs = [job for job in self.jobs if not job.finished]
+        return finished
+
+    def _add(self, job):
+        heapq.heappush(self._pending, (-job.priority, job.id, job))
+        self._notify(job)
+        self._dispatch()
+
+    def _drop_if_queued(self, job):
+        if job.status == QUEUED:
+            self._pending = [entry for entry in self._pending if entry[2] is not job]
+            heapq.heapify(self._pending)
+            self._finish(job, CANCELLED)
+
+    def _dispatch(self):
+        while self._pending and self._running < self.max_running_jobs:
+            _, _, job = heapq.heappop(self._pending)
+            self._running += 1
+            job.status = RUNNING
+            self._notify(job)
+            self._loop.create_task(self._run_job(job))
+
+    async def _run_job(self, job):
+        def console_output(message, msg_type="info"):
+            self.console_output(job, message, msg_type)
+
+        def progress(current, total):
+            job.current, job.total = current, total
+            self._notify(job)
+
+        manifest_key = os.path.normcase(os.path.abspath(job.save_directory))
+        try:
+            manifest = await self._manifest_for(manifest_key, job.save_directory)
+            await process_videos(
+                job.url,
+                job.output_formats,
+                job.language,
+                job.save_directory,
+                console_output,
+                self.update_recent_downloads,
+                job.stop_event,
+                job.file_policy,
+                progress,
+                max_workers=self.max_concurrency,
+                context=JobContext(
+                    scheduler=self.scheduler,
+                    session=self.session,
+                    manifest=manifest,
+                    executor=self.executor,
+                    slots=self._slots,
+                    single_flight=self._single_flight,
+                    process_pool=self._cleanup_pool() if job.options.get("cleanup") else None,
+                    **job.options
+                ),
+                priority=job.priority
+            )
+            status = CANCELLED if job.stop_event.is_set() else DONE
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+        finally:
+            self._manifest_users[manifest_key] -= 1
+        self._running -= 1
+        await self._loop.run_in_executor(self.executor, self._finish, job, status)
+        self._dispatch()
+
+    def _cleanup_pool(self):
+        # One process pool for the transcript clean-up of every job
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(max_workers=os.cpu_count())
+        return self._process_pool
+
+    async def _manifest_for(self, key, save_directory):
+        # Jobs running side by side in the same folder share its manifest, so they can't pick the same "_N"
+        # name. A job starting when no other uses the folder scans it again, so files deleted since then
+        # don't count as saved
+        users = self._manifest_users.get(key, 0)
+        self._manifest_users[key] = users + 1
+        if users == 0:
+            self._close_manifest(key)
+            self._manifests[key] = self._loop.run_in_executor(self.executor, OutputManifest, save_directory)
+        return await self._manifests[key]
+
+    def _close_manifest(self, key):
+        future = self._manifests.pop(key, None)
+        if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _finish(self, job, status):
+        for finalizer in job.finalizers:
+            try:
+                finalizer(job)
+            except Exception as e:
+                self.console_output(job, f"Could not finish job {job.id}: {e}", "error")
+        job.status = status
+        with self._jobs_lock:
+            self._unfinished.pop(job.id, None)
+        self._notify(job)
+
+    def _notify(self, job):
+        self.on_job_update(job)
+
+    def shutdown(self, timeout=5.0):
+        """Cancel every job, wait up to timeout seconds for running ones to stop, then release everything."""
+        for job in self.active_jobs():
+            self.cancel(job)
+        if self._thread.is_alive():
+            finished = threading.Event()
+
+            async def wait_for_jobs():
+                while self._running:
+                    await asyncio.sleep(0.05)
+                finished.set()
+
+            self._loop.call_soon_threadsafe(self._loop.create_task, wait_for_jobs())
+            finished.wait(timeout)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        for key in list(self._manifests):
+            self._close_manifest(key)
+        self.session.close()
@@ -0,0 +1,138 @@
+# language_plan.py
+
+from youtube_transcript_api import NoTranscriptFound, NotTranslatable
+
+# Caption kind of a transcript YouTube machine-translated from another language
+TRANSLATED = "translated"
+
+
+class Track:
+    """One transcript saved per video: its language, the languages to fall back to, and whether it is a translation target."""
+
+    __slots__ = ('language', 'codes', 'translation')
+
+    def __init__(self, codes, translation=False):
+        self.codes = tuple(codes)
+        self.language = self.codes[0]  # Names the track in file names, the cache, sync state and the search index
+        self.translation = translation
+
+    def __repr__(self):
+        return f"Track({'|'.join(self.codes)}{', translation' if self.translation else ''})"
+
+
+class LanguagePlan:
+    """The transcripts a job saves per video, all picked from one transcript listing.
+
+    languages are the wanted languages, each a code or a list of codes in
+    fallback order ("en" or ["en", "en-GB"]). translate_to are languages a
+    video's transcript is machine-translated into when the video has no
+    transcript of its own in them. With prefer_manual, a manual transcript
+    in any fallback language is taken over a generated one in an earlier
+    language; without it, the first fallback language with any captions
+    wins (find_transcript's order).
+    """
+
+    def __init__(self, languages, translate_to=(), prefer_manual=True):
+        self.tracks = []
+        for codes in languages:
+            codes = [codes] if isinstance(codes, str) else list(codes)
+            self._add(Track(codes))
+        for language in translate_to:
+            self._add(Track([language], translation=True))
+        if not self.tracks:
+            raise ValueError("A language plan needs at least one language")
+        self.prefer_manual = prefer_manual
+
+    def _add(self, track):
+        if track.language not in {other.language for other in self.tracks}:
+            self.tracks.append(track)
+
+    @classmethod
+    def parse(cls, spec, translate_to="", prefer_manual=True):
+        """Plan from a spec like "en|en-GB,de>fr,ja": wanted languages (| between fallbacks), then > and translation targets.
+
+        translate_to adds more translation targets, comma-separated.
+        """
+        spec, _, targets = spec.partition(">")
+        languages = [
+            [code.strip() for code in want.split("|") if code.strip()]
+            for want in spec.split(",")
+        ]
+        targets = [code.strip() for code in f"{targets},{translate_to}".split(",") if code.strip()]
+        return cls([codes for codes in languages if codes], targets, prefer_manual)
+
+    def __str__(self):
+        spec = ",".join("|".join(track.codes) for track in self.tracks if not track.translation)
+        targets = [track.language for track in self.tracks if track.translation]
+        return f"{spec}>{','.join(targets)}" if targets else spec
+
+    @property
+    def single(self):
+        """Whether the plan saves one transcript per video, named as before language plans existed."""
+        return len(self.tracks) == 1
+
+    def output_key(self, video_id, track):
+        """Key of a track's saved files in the output manifest and shard."""
+        return video_id if self.single else f"{video_id}.{track.language}"
+
+    def file_suffix(self, track):
+        """Appended to the file name of a track's transcript, so the languages of a video don't overwrite each other."""
+        return "" if self.single else f".{track.language}"
+
+    def find(self, transcript_list, codes):
+        if self.prefer_manual:
+            try:
+                return transcript_list.find_manually_created_transcript(codes)
+            except NoTranscriptFound:
+                return transcript_list.find_generated_transcript(codes)
+        return transcript_list.find_transcript(codes)
+
+    def resolve(self, transcript_list, track):
+        """Pick the transcript of a track from a video's TranscriptList. Returns (transcript, kind).
+
+        A translation target is served by a transcript of its own when the
+        video has one, else translated from the first wanted language that
+        is translatable (or any translatable transcript). Raises
+        NoTranscriptFound, NotTranslatable or TranslationLanguageNotAvailable
+        when the track can't be served.
+        """
+        try:
+            transcript = self.find(transcript_list, track.codes)
+            return transcript, "generated" if transcript.is_generated else "manual"
+        except NoTranscriptFound:
+            if not track.translation:
+                raise
+        return self.translation_source(transcript_list).translate(track.language), TRANSLATED
+
+    def cache_lookups(self, track):
+        """(language code, kind) pairs a track's cached transcript is looked up under, in the order resolve picks them.
+
+        Machine translations only serve translation targets.
+        """
+        if self.prefer_manual:
+            lookups = [(code, "manual") for code in track.codes] + [(code, "generated") for code in track.codes]
+        else:
+            lookups = [(code, kind) for code in track.codes for kind in ("manual", "generated")]
+        if track.translation:
+            lookups.append((track.language, TRANSLATED))
+        return lookups
+
+    def translation_source(self, transcript_list):
+        for track in self.tracks:
+            if track.translation:
+                continue
+            try:
+                transcript = self.find(transcript_list, track.codes)
+            except NoTranscriptFound:
+                continue
+            if transcript.is_translatable:
+                return transcript
+        for transcript in transcript_list:
+            if transcript.is_translatable:
+                return transcript
+        raise NotTranslatable(transcript_list.video_id)
+
+
+def as_language_plan(language):
+    """A LanguagePlan as is, or the plan a spec string describes (a plain "en" is a one-language plan)."""
+    return language if isinstance(language, LanguagePlan) else LanguagePlan.parse(language)
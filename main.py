@@ -2,44 +2,173 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
-import asyncio
+import importlib
 import os
 import subprocess
 import sys
+import threading
+import webbrowser
 
 from utils import (
-    load_recent_downloads,
-    save_recent_downloads,
+    DownloadHistory,
     load_settings,
     save_settings,
 )
-from transcript_fetcher import process_videos
+from transcript_cache import TranscriptCache, DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL_DAYS, DEFAULT_CACHE_MAX_MB
+from job_journal import JobJournal, DEFAULT_JOURNAL_DIR
+from ui_updates import UIUpdateQueue, BoundedConsole
+from transcript_search import SearchIndex, DEFAULT_INDEX_PATH, format_timestamp, timestamp_url
+from sync_state import SyncState
+from run_metrics import RunMetrics
+
+# Modules that pull in pytubefix, youtube-transcript-api and requests. They are
+# imported where they are first used, and loaded ahead of that on a background
+# thread once the window is up (see load_in_background), so the first frame
+# never waits for them
+BACKGROUND_IMPORTS = ("transcript_fetcher", "job_queue", "rate_limiter", "http_session", "language_plan",
+                      "transcript_cleanup")
 
 # Initialize the main window
 root = tk.Tk()
 root.title("YouTube Transcript Downloader")
 root.geometry("900x600")
 
-# Load settings
-settings = load_settings()
+# Settings, filled in from settings.json by load_in_background (see apply_settings)
+settings = {}
 
-# Variables to store settings with defaults
-save_directory_var = tk.StringVar(
-    value=settings.get("save_directory", os.path.join(os.getcwd(), "downloads"))
-)
-recent_downloads = load_recent_downloads()
+# Variables to store settings, with the defaults shown until settings.json is loaded
+save_directory_var = tk.StringVar(value=os.path.join(os.getcwd(), "downloads"))
+download_history = DownloadHistory()
+recent_downloads = download_history.recent  # Newest first, same order as the listbox; loaded in the background
 
 # Output Formats
-output_formats = ["TXT", "JSON", "SRT", "VTT"]
-output_format_default = settings.get("output_format", "TXT")
-output_format_var = tk.StringVar(value=output_format_default)
+output_formats = ["TXT", "JSON", "SRT", "VTT", "SHARD"]
+output_format_vars = {
+    output_format: tk.BooleanVar(value=output_format == "TXT")
+    for output_format in output_formats
+}
 
-# Language Selection
-language_var = tk.StringVar(value=settings.get("language", "en"))
+# Language Selection: one code, or several separated by commas ("|" between fallbacks, e.g. "en|en-GB,de")
+language_var = tk.StringVar(value="en")
+
+# Languages to machine-translate into when a video has no transcript of its own in them, comma-separated
+translate_var = tk.StringVar(value="")
 
 # File Handling Policy
-file_policy_var = tk.StringVar(value=settings.get("file_policy", "skip"))
+file_policy_var = tk.StringVar(value="skip")
+
+# Number of videos fetched at the same time (blank until settings or the fetcher's default are loaded)
+max_workers_var = tk.IntVar(value="")
+
+# Transcript Cache
+use_cache_var = tk.BooleanVar(value=True)
+
+# Resume: skip videos an earlier run of the same job already finished
+resume_var = tk.BooleanVar(value=False)
+
+# Sync: only fetch videos that are new or whose captions changed since the last sync
+sync_var = tk.BooleanVar(value=False)
+
+# Clean Captions: strip noise tags and repeated words, regroup into sentences before saving
+cleanup_var = tk.BooleanVar(value=False)
+
+# Full-text index of every saved transcript, searched from the Search panel; opened on first use
+search_index = None
+search_results = []  # Hits shown in the results listbox, same order
+
+# Shared job queue, started once the fetching modules are loaded (see on_backend_loaded)
+job_queue = None
+
+# How often (in milliseconds) the status bar summary is refreshed while jobs run
+METRICS_REFRESH_MS = 1000
+
+# Job priority: higher priority jobs start first and get free download slots first
+priority_var = tk.IntVar(value=0)
+
+# Transcript cache shared by all jobs, opened the first time a job uses it
+cache = None
+
+# Jobs shown in the jobs list, by job ID
+jobs_by_id = {}
+
+# Function to load settings, download history and the fetching modules off the main thread, so the window paints first
+def load_in_background():
+    # Each step fails on its own, so a corrupt settings or history file still leaves downloads usable
+    try:
+        ui_updates.put("settings", load_settings())
+    except Exception as e:
+        ui_updates.put("console", f"Could not load settings, using defaults: {e}", "error")
+    try:
+        download_history.load()
+    except Exception as e:
+        ui_updates.put("console", f"Could not load the download history: {e}", "error")
+    ui_updates.put("history")  # Shows whatever was read and enables Clear History either way
+    try:
+        for module in BACKGROUND_IMPORTS:
+            importlib.import_module(module)
+    except Exception as e:
+        ui_updates.put("console", f"Could not start: {e}", "error")
+        return
+    ui_updates.put("backend")
+
+# Function to show the settings loaded from settings.json
+def apply_settings(loaded):
+    settings.update(loaded)
+    save_directory_var.set(settings.get("save_directory", save_directory_var.get()))
+    # Older settings files only stored a single "output_format"
+    output_formats_default = settings.get("output_formats", [settings.get("output_format", "TXT")])
+    for output_format, var in output_format_vars.items():
+        var.set(output_format in output_formats_default)
+    language_var.set(settings.get("language", "en"))
+    translate_var.set(settings.get("translate_to", ""))
+    file_policy_var.set(settings.get("file_policy", "skip"))
+    if "max_workers" in settings:
+        max_workers_var.set(settings["max_workers"])
+    use_cache_var.set(settings.get("use_cache", True))
+    resume_var.set(settings.get("resume", False))
+    sync_var.set(settings.get("sync", False))
+    cleanup_var.set(settings.get("cleanup", False))
+
+# Function to show the download history once it is loaded
+def apply_history():
+    recent_listbox.insert(tk.END, *(recent_display_title(item) for item in recent_downloads))
+    clear_button.config(state='normal')
+
+# Function to start the job queue once the fetching modules are loaded, and enable downloads
+def on_backend_loaded():
+    global job_queue
+    from transcript_fetcher import DEFAULT_MAX_WORKERS
+    from job_queue import JobQueue
+    from rate_limiter import RequestScheduler
+    from http_session import create_session
+
+    if "max_workers" not in settings:
+        max_workers_var.set(DEFAULT_MAX_WORKERS)
+    # One long-lived job queue: rate limits and retries (settings.json) and the
+    # pooled HTTP session (cookies.txt path in settings.json) are shared by all jobs
+    job_queue = JobQueue(
+        console_output_wrapper,
+        update_recent_downloads_wrapper,
+        job_update_wrapper,
+        max_concurrency=get_max_workers(),
+        scheduler=RequestScheduler(
+            rate=settings.get("requests_per_second"),
+            max_retries=settings.get("max_retries", 4),
+            max_concurrency=get_max_workers()
+        ),
+        session=create_session(pool_size=get_max_workers(), cookies_path=settings.get("cookies_path"))
+    )
+    job_queue.start()
+    download_button.config(state='normal')
+    save_dir_button.config(state='normal')
+    status_var.set("Ready")
+
+# Function to get the full-text search index, opened the first time it is used
+def get_search_index():
+    global search_index
+    if search_index is None:
+        search_index = SearchIndex(settings.get("search_index_path", DEFAULT_INDEX_PATH))
+    return search_index
 
 # Function to select the save directory
 def select_save_directory():
@@ -50,36 +179,33 @@ def select_save_directory():
         save_settings(settings)
         console_output(f"Save directory set to: {directory}", "info")
 
-# Function to update recent downloads list
-def update_recent_downloads(title, url, file_path):
-    global recent_downloads
-    # Add new entry
-    recent_downloads.insert(0, {'title': title, 'url': url, 'file_path': file_path})
-    # Keep only the last 10 entries
-    recent_downloads = recent_downloads[:10]
-    # Save the updated list
-    save_recent_downloads(recent_downloads)
-    # Update the listbox
-    recent_listbox.delete(0, tk.END)
-    for item in recent_downloads:
-        display_title = item['title']
-        if len(display_title) > 50:
-            display_title = display_title[:47] + '...'
-        recent_listbox.insert(tk.END, display_title)
+# Function to shorten a title for the recent downloads list
+def recent_display_title(item):
+    display_title = item['title']
+    if len(display_title) > 50:
+        display_title = display_title[:47] + '...'
+    return display_title
+
+# Function to update recent downloads list with a batch of (title, url, file_path) entries
+def update_recent_downloads(entries):
+    items = [{'title': title, 'url': url, 'file_path': file_path} for title, url, file_path in entries]
+    # Append the batch to the history file in one write
+    download_history.add(items)
+    # Update the listbox incrementally: new rows on top, rows that fell out of the view at the bottom
+    for item in items:
+        recent_listbox.insert(0, recent_display_title(item))
+    if recent_listbox.size() > len(recent_downloads):
+        recent_listbox.delete(len(recent_downloads), tk.END)
 
 # Function to clear recent downloads
 def clear_recent_downloads():
-    global recent_downloads
-    recent_downloads = []
-    save_recent_downloads(recent_downloads)
+    download_history.clear()
     recent_listbox.delete(0, tk.END)
     console_output("Recent downloads cleared.", "info")
 
 # Function to clear the console output
 def clear_console():
-    console_text.configure(state='normal')
-    console_text.delete('1.0', tk.END)
-    console_text.configure(state='disabled')
+    console.clear()
     update_clear_console_button()
 
 # Function to handle recent item double-click
@@ -102,25 +228,47 @@ def on_recent_item_double_click(event):
         else:
             console_output("File does not exist.", "error")
 
+# Function to search the indexed transcripts and list the matching segments
+def on_search(event=None):
+    query = search_entry.get().strip()
+    search_listbox.delete(0, tk.END)
+    search_results.clear()
+    if not query:
+        return
+    try:
+        search_results.extend(get_search_index().search(query, limit=200))
+    except Exception as e:
+        console_output(f"Search failed: {e}", "error")
+        return
+    search_listbox.insert(tk.END, *(
+        f"{format_timestamp(hit['start'])}  {hit['title'][:40]}  {hit['text']}" for hit in search_results
+    ))
+    status_var.set(f"{len(search_results)} matches for \"{query}\"")
+
+# Function to open a search hit in the browser at the time it was said
+def on_search_result_double_click(event):
+    selection = search_listbox.curselection()
+    if selection:
+        hit = search_results[selection[0]]
+        webbrowser.open(timestamp_url(hit['url'], hit['start']))
+
 # Function to output messages to the console and update status bar with color
 def console_output(message, msg_type="info"):
-    console_text.configure(state='normal')
-    if msg_type == "error":
-        console_text.insert(tk.END, message + '\n', 'error')
-    elif msg_type == "success":
-        console_text.insert(tk.END, message + '\n', 'success')
-    else:
-        console_text.insert(tk.END, message + '\n', 'info')
-    console_text.configure(state='disabled')
-    console_text.see(tk.END)
+    show_console_lines([(message, msg_type)])
+
+# Function to add a batch of (message, msg_type) lines to the console
+def show_console_lines(lines):
+    console.append([
+        (message, msg_type if msg_type in ("error", "success") else "info")
+        for message, msg_type in lines
+    ])
     # Update the status bar with the latest message
-    status_var.set(message)
+    status_var.set(lines[-1][0])
     update_clear_console_button()
 
 # Function to update the state of the "Clear Console" button
 def update_clear_console_button():
-    content = console_text.get('1.0', tk.END).strip()
-    if content:
+    if console.line_count:
         clear_console_button.config(state='normal')
     else:
         clear_console_button.config(state='disabled')
@@ -131,79 +279,265 @@ def configure_console_tags():
     console_text.tag_config('success', foreground='green')
     console_text.tag_config('info', foreground='black')
 
-# Add a global stop event
-stop_event = threading.Event()
+# Function to read the "Parallel Downloads" spinbox
+def get_max_workers():
+    from transcript_fetcher import DEFAULT_MAX_WORKERS
 
-# Function to handle download button click
+    try:
+        return max(1, max_workers_var.get())
+    except tk.TclError:
+        return DEFAULT_MAX_WORKERS  # Spinbox holds something that isn't a number
+
+# Function to read the "Priority" spinbox
+def get_priority():
+    try:
+        return priority_var.get()
+    except tk.TclError:
+        return 0
+
+# Function to handle download button click: queue one job per URL entered
 def on_download_button_click():
-    url = url_entry.get().strip()
-    if not url:
+    urls = url_entry.get().split()
+    if not urls:
         console_output("Please enter a YouTube video or playlist URL.", "error")
         return
 
-    selected_format = output_format_var.get()
-    if not selected_format:
-        console_output("Please select an output format.", "error")
+    if not get_selected_formats():
+        console_output("Please select at least one output format.", "error")
+        return
+
+    try:
+        get_language_plan()
+    except ValueError as e:
+        console_output(f"Invalid language selection: {e}", "error")
         return
 
-    download_button.config(state='disabled')
+    try:
+        get_cleanup_options()
+    except ValueError as e:
+        console_output(f"Invalid clean-up settings: {e}", "error")
+        return
+
+    for url in urls:
+        job = submit_job(url)
+        console_output(f"Queued job {job.id}: {url}", "info")
+    url_entry.delete(0, tk.END)
     cancel_button.config(state='normal')
-    progress_bar['value'] = 0
     progress_bar.pack(pady=(10, 0))
-    stop_event.clear()
-    threading.Thread(target=start_processing, args=(url,)).start()
 
-# Function to handle cancel button click
+# Function to handle cancel button click: cancel the selected jobs, or every unfinished one
 def on_cancel_button_click():
-    stop_event.set()
-    console_output("Cancelling download...", "info")
-    cancel_button.config(state='disabled')
-
-# Function to start processing videos
-def start_processing(url):
-    selected_format = output_format_var.get()
-    output_formats_selected = [selected_format.lower()]
-    language = language_var.get()
+    selected = [jobs_by_id[int(item)] for item in jobs_tree.selection()]
+    for job in selected or job_queue.active_jobs():
+        if not job.finished:
+            job_queue.cancel(job)
+            console_output(f"Cancelling job {job.id}...", "info")
+
+# Function to get the languages to fetch per video from the language and "Translate to" fields
+def get_language_plan():
+    from language_plan import LanguagePlan
+
+    return LanguagePlan.parse(language_var.get(), translate_var.get())
+
+# Function to get the clean-up steps for new jobs (chunking is set in settings.json), or None
+def get_cleanup_options():
+    from transcript_cleanup import CleanupOptions, CHARS
+
+    if not cleanup_var.get():
+        return None
+    return CleanupOptions(
+        chunk_size=settings.get("cleanup_chunk_size"),
+        chunk_unit=settings.get("cleanup_chunk_unit", CHARS)
+    )
+
+# Function to get the ticked output formats, in display order
+def get_selected_formats():
+    return [output_format for output_format, var in output_format_vars.items() if var.get()]
+
+# Function to get the shared transcript cache, opened the first time a job uses it
+def get_cache():
+    global cache
+    if cache is None:
+        cache = TranscriptCache(
+            settings.get("cache_path", DEFAULT_CACHE_PATH),
+            ttl=settings.get("cache_ttl_days", DEFAULT_CACHE_TTL_DAYS) * 24 * 60 * 60,
+            max_size=settings.get("cache_max_mb", DEFAULT_CACHE_MAX_MB) * 1024 * 1024
+        )
+    return cache
+
+# Function to queue a job for one URL with the current options
+def submit_job(url):
+    selected_formats = get_selected_formats()
+    output_formats_selected = [selected_format.lower() for selected_format in selected_formats]
+    language_plan = get_language_plan()
     save_directory = save_directory_var.get()
     file_policy = file_policy_var.get()
+    max_workers = get_max_workers()
 
     # Save current settings
-    settings["output_format"] = selected_format
-    settings["language"] = language
+    settings["output_formats"] = selected_formats
+    settings["language"] = language_var.get()
+    settings["translate_to"] = translate_var.get()
     settings["file_policy"] = file_policy
+    settings["max_workers"] = max_workers
+    settings["use_cache"] = use_cache_var.get()
+    settings["resume"] = resume_var.get()
+    settings["sync"] = sync_var.get()
+    settings["cleanup"] = cleanup_var.get()
     save_settings(settings)
 
-    # Run the async process_videos function
-    asyncio.run(process_videos(
+    # "Parallel Downloads" is the budget shared by all running jobs
+    if max_workers != job_queue.max_concurrency:
+        job_queue.set_concurrency(max_workers)
+
+    # Record every video's status so a cancelled or crashed job can be resumed
+    journal = JobJournal.for_job(
+        [url],
+        output_formats_selected,
+        str(language_plan),
+        save_directory,
+        journal_dir=settings.get("journal_dir", DEFAULT_JOURNAL_DIR),
+        resume=settings["resume"]
+    )
+
+    # What earlier syncs into this save directory already fetched
+    sync = None
+    if settings["sync"]:
+        sync = SyncState(save_directory, recheck_interval=settings.get("sync_recheck_days", 7) * 24 * 60 * 60)
+
+    # Per-stage timings, saved as a JSON report next to the job journal
+    metrics = RunMetrics() if settings.get("metrics", True) else None
+
+    job = job_queue.submit(
         url,
         output_formats_selected,
-        language,
+        language_plan,
         save_directory,
-        console_output_wrapper,
-        update_recent_downloads_wrapper,
-        stop_event,
         file_policy,
-        progress_bar_wrapper
-    ))
+        priority=get_priority(),
+        # Reuse transcripts fetched by earlier runs instead of downloading them again
+        cache=get_cache() if settings["use_cache"] else None,
+        journal=journal,
+        search_index=get_search_index() if settings.get("search_index", True) else None,
+        sync=sync,
+        metrics=metrics,
+        cleanup=get_cleanup_options()
+    )
+    job.finalizers.append(finish_job)
+    jobs_by_id[job.id] = job
+    return job
+
+# Function to close a finished job's journal and save its run report (runs on the queue's thread)
+def finish_job(job):
+    journal = job.options["journal"]
+    journal.close()
+    metrics = job.options["metrics"]
+    if metrics is not None:
+        metrics.write_report(os.path.splitext(journal.path)[0] + ".report.json")
+        if settings.get("prometheus_path"):
+            metrics.write_prometheus(settings["prometheus_path"])
+
+# Function to show the jobs' state and the selected (or latest running) job's metrics in the status bar
+def refresh_metrics_summary():
+    from job_queue import RUNNING
+
+    active = job_queue.active_jobs()
+    selected = [jobs_by_id[int(item)] for item in jobs_tree.selection()]
+    running = [job for job in active if job.status == RUNNING]
+    shown = selected[-1] if selected else (running[-1] if running else None)
+    summary = f"{len(running)} running, {len(active) - len(running)} queued"
+    if shown is not None and shown.options.get("metrics") is not None:
+        summary += f" | job {shown.id}: {shown.options['metrics'].summary()}"
+    metrics_var.set(summary)
+
+# Function to refresh the status bar summary once a second
+def metrics_refresh_tick():
+    if job_queue is not None:
+        refresh_metrics_summary()
+    root.after(METRICS_REFRESH_MS, metrics_refresh_tick)
+
+# Function to show a job's row in the jobs list
+def show_job(job):
+    progress = f"{job.current}/{job.total}" if job.total else ""
+    status = job.status if job.error is None else f"{job.status}: {job.error}"
+    values = (job.id, job.url, status, progress, job.priority)
+    item = str(job.id)
+    if jobs_tree.exists(item):
+        jobs_tree.item(item, values=values)
+    else:
+        jobs_tree.insert('', tk.END, iid=item, values=values)
+
+# Function to update the overall progress bar from the unfinished jobs
+def update_overall_progress():
+    active = job_queue.active_jobs()
+    if not active:
+        progress_bar.pack_forget()
+        cancel_button.config(state='disabled')
+        return
+    current = sum(job.current for job in active)
+    total = sum(job.total for job in active)
+    progress_bar['value'] = (current / total) * 100 if total > 0 else 0
 
-    download_button.config(state='normal')
-    cancel_button.config(state='disabled')
-    progress_bar.pack_forget()
+# Function to clear finished jobs from the jobs list
+def clear_finished_jobs():
+    for job in job_queue.clear_finished():
+        if job.id in jobs_by_id:
+            jobs_tree.delete(str(job.id))
+            del jobs_by_id[job.id]
+
+# The queue's thread never touches widgets itself: the wrappers below queue
+# updates, and apply_ui_updates applies them in batches on the main thread
 
 # Wrapper for console_output to ensure thread-safe GUI updates
-def console_output_wrapper(message, msg_type="info"):
-    root.after(0, lambda: console_output(message, msg_type))
+def console_output_wrapper(job, message, msg_type="info"):
+    ui_updates.put("console", f"[job {job.id}] {message}", msg_type)
 
 # Wrapper for update_recent_downloads to include file_path
 def update_recent_downloads_wrapper(title, url, file_path):
-    root.after(0, lambda: update_recent_downloads(title, url, file_path))
-
-# Wrapper for progress_bar to update its value
-def progress_bar_wrapper(current, total):
-    if total > 0:
-        progress = (current / total) * 100
-        progress_bar['value'] = progress
-        progress_bar.update_idletasks()
+    ui_updates.put("recent", title, url, file_path)
+
+# Wrapper for job status and progress changes
+def job_update_wrapper(job):
+    ui_updates.put("job", job)
+
+# Function to apply one batch of queued updates
+def apply_ui_updates(batch):
+    lines = []
+    downloads = []
+    jobs = {}
+    for kind, args in batch:
+        if kind == "console":
+            lines.append(args)
+        elif kind == "recent":
+            downloads.append(args)
+        elif kind == "job":
+            job = args[0]
+            jobs[job.id] = job  # Only the latest state of each job matters
+        elif kind == "settings":
+            apply_settings(*args)
+        elif kind == "history":
+            apply_history()
+        elif kind == "backend":
+            on_backend_loaded()
+    if lines:
+        show_console_lines(lines)
+    if downloads:
+        update_recent_downloads(downloads)
+    if jobs:
+        for job in jobs.values():
+            if job.id in jobs_by_id:
+                show_job(job)
+        update_overall_progress()
+
+# Function to stop every job and release shared resources when the window is closed
+def on_close():
+    if job_queue is not None:
+        job_queue.shutdown()
+    if cache is not None:
+        cache.close()
+    if search_index is not None:
+        search_index.close()
+    root.destroy()
 
 # =======================
 # Layout Configuration
@@ -233,7 +567,7 @@ listbox_frame.grid_rowconfigure(0, weight=1)
 listbox_frame.grid_columnconfigure(0, weight=1)
 
 # Clear Button in recent frame
-clear_button = tk.Button(recent_frame, text="Clear", command=clear_recent_downloads)
+clear_button = tk.Button(recent_frame, text="Clear", command=clear_recent_downloads, state='disabled')
 clear_button.pack(pady=5)
 
 # Center Pane: Input and Controls
@@ -247,35 +581,61 @@ url_entry = tk.Entry(input_frame, width=50)
 url_entry.grid(row=0, column=1, padx=5)
 
 # Download Button
-download_button = tk.Button(input_frame, text="Download Transcript", command=on_download_button_click)
+# Enabled once settings and the fetching modules are loaded
+download_button = tk.Button(
+    input_frame, text="Download Transcript", command=on_download_button_click, state='disabled'
+)
 download_button.grid(row=0, column=2, padx=5)
 
 # Cancel Button
 cancel_button = tk.Button(input_frame, text="Cancel", command=on_cancel_button_click, state='disabled')
 cancel_button.grid(row=0, column=3, padx=5)
 
+# Priority of the jobs queued next
+priority_label = tk.Label(input_frame, text="Priority:")
+priority_label.grid(row=0, column=4, padx=(10, 0))
+priority_spinbox = ttk.Spinbox(input_frame, from_=-9, to=9, textvariable=priority_var, width=3)
+priority_spinbox.grid(row=0, column=5)
+
 # Format Selection
 format_frame = tk.Frame(root)
 format_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 10))
 
-# Output Formats Dropdown
-format_label = tk.Label(format_frame, text="Select Output Format:")
+# Output Formats (any combination can be selected)
+format_label = tk.Label(format_frame, text="Output Formats:")
 format_label.grid(row=0, column=0, sticky='w')
 
-output_format_dropdown = ttk.Combobox(format_frame, textvariable=output_format_var, width=10, state='readonly')
-output_format_dropdown['values'] = output_formats
-output_format_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+output_format_frame = tk.Frame(format_frame)
+output_format_frame.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+
+for output_format in output_formats:
+    output_format_checkbutton = tk.Checkbutton(
+        output_format_frame, text=output_format, variable=output_format_vars[output_format]
+    )
+    output_format_checkbutton.pack(side=tk.LEFT)
 
 # Language Selection
 language_label = tk.Label(format_frame, text="Select Language:")
 language_label.grid(row=0, column=2, padx=(20, 0))
 
-language_dropdown = ttk.Combobox(format_frame, textvariable=language_var, width=5, state='readonly')
+language_frame = tk.Frame(format_frame)
+language_frame.grid(row=0, column=3, sticky='w')
+
+# Editable, so several languages can be typed in, e.g. "en,de" or "en|en-GB"
+language_dropdown = ttk.Combobox(language_frame, textvariable=language_var, width=10)
 language_dropdown['values'] = ('en', 'de', 'fr', 'es', 'it', 'pt', 'nl', 'ru', 'zh', 'ja')  # Add more as needed
-language_dropdown.grid(row=0, column=3)
+language_dropdown.pack(side=tk.LEFT)
+
+translate_label = tk.Label(language_frame, text="Translate to:")
+translate_label.pack(side=tk.LEFT, padx=(10, 0))
+
+translate_entry = tk.Entry(language_frame, textvariable=translate_var, width=8)
+translate_entry.pack(side=tk.LEFT)
 
 # Save Directory Selection
-save_dir_button = tk.Button(format_frame, text="Select Save Directory", command=select_save_directory)
+save_dir_button = tk.Button(
+    format_frame, text="Select Save Directory", command=select_save_directory, state='disabled'
+)
 save_dir_button.grid(row=0, column=4, padx=(20, 0))
 
 # Clear Console Button
@@ -290,7 +650,76 @@ file_handling_dropdown = ttk.Combobox(format_frame, textvariable=file_policy_var
 file_handling_dropdown['values'] = ('Skip', 'Overwrite', 'Append Number')
 file_handling_dropdown.grid(row=1, column=1, columnspan=2, sticky='w', pady=(10, 0))
 
-# Progress Bar
+# Concurrent Downloads
+max_workers_label = tk.Label(format_frame, text="Parallel Downloads:")
+max_workers_label.grid(row=1, column=3, padx=(20, 0), pady=(10, 0), sticky='e')
+
+max_workers_spinbox = ttk.Spinbox(format_frame, from_=1, to=32, textvariable=max_workers_var, width=5)
+max_workers_spinbox.grid(row=1, column=4, sticky='w', pady=(10, 0))
+
+# Cache Toggle
+use_cache_checkbutton = tk.Checkbutton(format_frame, text="Use Cache", variable=use_cache_var)
+use_cache_checkbutton.grid(row=1, column=5, sticky='w', padx=(10, 0), pady=(10, 0))
+
+# Resume Toggle
+resume_checkbutton = tk.Checkbutton(format_frame, text="Resume", variable=resume_var)
+resume_checkbutton.grid(row=1, column=6, sticky='w', pady=(10, 0))
+
+# Sync Toggle
+sync_checkbutton = tk.Checkbutton(format_frame, text="Sync", variable=sync_var)
+sync_checkbutton.grid(row=1, column=7, sticky='w', pady=(10, 0))
+
+# Clean Captions Toggle
+cleanup_checkbutton = tk.Checkbutton(format_frame, text="Clean Captions", variable=cleanup_var)
+cleanup_checkbutton.grid(row=1, column=8, sticky='w', pady=(10, 0))
+
+# Search Panel
+search_frame = tk.Frame(root)
+search_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 5))
+
+search_label = tk.Label(search_frame, text="Search Transcripts:")
+search_label.grid(row=0, column=0, sticky='w')
+search_entry = tk.Entry(search_frame, width=50)
+search_entry.grid(row=0, column=1, padx=5, sticky='we')
+search_entry.bind('<Return>', on_search)
+
+search_button = tk.Button(search_frame, text="Search", command=on_search)
+search_button.grid(row=0, column=2, padx=5)
+
+search_listbox = tk.Listbox(search_frame, height=6)
+search_listbox.grid(row=1, column=0, columnspan=3, sticky='we', pady=(5, 0))
+search_listbox.bind('<Double-Button-1>', on_search_result_double_click)
+
+search_scrollbar = tk.Scrollbar(search_frame, command=search_listbox.yview)
+search_scrollbar.grid(row=1, column=3, sticky='ns', pady=(5, 0))
+search_listbox.config(yscrollcommand=search_scrollbar.set)
+search_frame.grid_columnconfigure(1, weight=1)
+
+# Jobs List
+jobs_frame = tk.Frame(root)
+jobs_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 5))
+
+jobs_tree = ttk.Treeview(
+    jobs_frame, columns=('job', 'url', 'status', 'progress', 'priority'), show='headings', height=4
+)
+for column, heading, width in (
+    ('job', "Job", 40), ('url', "URL", 320), ('status', "Status", 120), ('progress', "Progress", 80),
+    ('priority', "Priority", 60)
+):
+    jobs_tree.heading(column, text=heading)
+    jobs_tree.column(column, width=width, stretch=(column == 'url'))
+jobs_tree.grid(row=0, column=0, sticky='we')
+jobs_tree.bind('<<TreeviewSelect>>', lambda event: refresh_metrics_summary())
+
+jobs_scrollbar = tk.Scrollbar(jobs_frame, command=jobs_tree.yview)
+jobs_scrollbar.grid(row=0, column=1, sticky='ns')
+jobs_tree.config(yscrollcommand=jobs_scrollbar.set)
+
+clear_jobs_button = tk.Button(jobs_frame, text="Clear Finished", command=clear_finished_jobs)
+clear_jobs_button.grid(row=0, column=2, padx=5, sticky='n')
+jobs_frame.grid_columnconfigure(0, weight=1)
+
+# Progress Bar (all unfinished jobs together)
 progress_bar = ttk.Progressbar(root, orient='horizontal', mode='determinate', length=400)
 # Initially hidden; packed when download starts
 
@@ -304,22 +733,34 @@ console_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 # Configure colored tags
 configure_console_tags()
 
+# Keep the console to a bounded number of lines
+console = BoundedConsole(console_text)
+
 # Scrollbar for the console
 console_scrollbar = tk.Scrollbar(console_frame, command=console_text.yview)
 console_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 console_text.config(yscrollcommand=console_scrollbar.set)
 
 # Status Bar at the bottom
-status_var = tk.StringVar()
-status_bar = tk.Label(root, textvariable=status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W)
-status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-# Populate the recent downloads list initially
-for item in recent_downloads:
-    display_title = item['title']
-    if len(display_title) > 50:
-        display_title = display_title[:47] + '...'
-    recent_listbox.insert(tk.END, display_title)
+status_var = tk.StringVar(value="Loading...")
+status_frame = tk.Frame(root)
+status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+status_bar = tk.Label(status_frame, textvariable=status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W)
+status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+# Metrics summary of the current (or last) job, at the right of the status bar
+metrics_var = tk.StringVar()
+metrics_bar = tk.Label(status_frame, textvariable=metrics_var, bd=1, relief=tk.SUNKEN, anchor=tk.E)
+metrics_bar.pack(side=tk.RIGHT)
+
+# Apply updates from the job queue's (and the startup) thread in batches
+ui_updates = UIUpdateQueue(root, apply_ui_updates)
+ui_updates.start()
+
+# Load settings, history and the fetching modules once the event loop runs, after the window is laid out
+root.after_idle(lambda: threading.Thread(target=load_in_background, name="startup", daemon=True).start())
+root.protocol("WM_DELETE_WINDOW", on_close)
+metrics_refresh_tick()
 
 # Start the Tkinter event loop
 root.mainloop()
@@ -0,0 +1,109 @@
+# output_manifest.py
+
+import json
+import os
+import threading
+
+# Kept in the save directory, next to the transcripts it describes
+MANIFEST_FILENAME = '.transcript_manifest.jsonl'
+
+
+class OutputManifest:
+    """Which transcript files a save directory already holds, by video ID and format.
+
+    Built from one os.scandir pass plus the manifest file in the directory,
+    then kept up to date in memory as files are written, so checking for an
+    existing transcript or picking a free "_N" filename needs no disk access.
+    Every saved file is also appended to the manifest file as one JSON line;
+    when it is loaded the last line of a video/format wins, and lines whose
+    file was deleted are ignored.
+    """
+
+    def __init__(self, save_directory):
+        self.save_directory = save_directory
+        self.path = os.path.join(save_directory, MANIFEST_FILENAME)
+        self.entries = {}  # (video ID, format) -> file name
+        self._names = set()  # normcase'd names of the files in the directory
+        self._next_number = {}  # (file name, extension) -> first "_N" suffix worth trying
+        self._file = None
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        try:
+            with os.scandir(self.save_directory) as entries:
+                for entry in entries:
+                    self._names.add(os.path.normcase(entry.name))
+        except FileNotFoundError:
+            return
+        if os.path.normcase(MANIFEST_FILENAME) not in self._names:
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Half-written last line after a crash
+                self.entries[(record['video'], record['format'])] = record['file']
+        for key, name in list(self.entries.items()):
+            if not self._has_name(name):
+                del self.entries[key]
+
+    def _has_name(self, name):
+        return os.path.normcase(name) in self._names
+
+    def lookup(self, video_id, selected_format):
+        """Path of the saved transcript of the video in that format, or None."""
+        with self._lock:
+            name = self.entries.get((video_id, selected_format))
+        return os.path.join(self.save_directory, name) if name else None
+
+    def exists(self, file_path):
+        with self._lock:
+            return self._has_name(os.path.basename(file_path))
+
+    def reserve(self, filename, extension, policy):
+        """Path to save filename.extension at under the file policy, or None to skip it.
+
+        The chosen name counts as taken from now on, so two videos with the
+        same title never get the same "_N" name.
+        """
+        name = f"{filename}.{extension}"
+        policy = policy.lower()
+        with self._lock:
+            if self._has_name(name):
+                if policy == 'skip':
+                    return None
+                if policy == 'append number':
+                    counter = self._next_number.get((filename, extension), 1)
+                    while self._has_name(f"{filename}_{counter}.{extension}"):
+                        counter += 1
+                    self._next_number[(filename, extension)] = counter + 1
+                    name = f"{filename}_{counter}.{extension}"
+            self._names.add(os.path.normcase(name))
+        return os.path.join(self.save_directory, name)
+
+    def record(self, video_id, selected_format, file_path):
+        """Remember that file_path holds the transcript of the video in that format."""
+        name = os.path.basename(file_path)
+        line = json.dumps({'video': video_id, 'format': selected_format, 'file': name}, ensure_ascii=False)
+        with self._lock:
+            self._names.add(os.path.normcase(name))
+            if self.entries.get((video_id, selected_format)) == name:
+                return
+            self.entries[(video_id, selected_format)] = name
+            if self._file is None:
+                os.makedirs(self.save_directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line + '\n')
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,248 @@
+# rate_limiter.py
+
+import random
+import socket
+import threading
+import time
+import urllib.error
+
+import requests
+from pytubefix.exceptions import BotDetection, VideoUnavailable as PytubeVideoUnavailable
+from youtube_transcript_api import (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    NoTranscriptAvailable,
+)
+from youtube_transcript_api._errors import (
+    TooManyRequests,
+    YouTubeRequestFailed,
+    VideoUnavailable,
+    InvalidVideoId,
+)
+
+# How a failed call is treated by RequestScheduler
+PERMANENT = "permanent"  # Never retried
+THROTTLED = "throttled"  # Retried after a backoff, and lowers the concurrency limit
+TRANSIENT = "transient"  # Retried after a backoff
+
+# Errors that won't go away by asking again
+PERMANENT_ERRORS = (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    NoTranscriptAvailable,
+    VideoUnavailable,
+    InvalidVideoId,
+)
+
+# HTTP status codes that mean "slow down" and "try again later"
+THROTTLE_STATUS_CODES = (429,)
+TRANSIENT_STATUS_CODES = (500, 502, 503, 504)
+
+# How often (in seconds) a call waiting for a concurrency slot checks whether it was cancelled
+SLOT_POLL_INTERVAL = 0.1
+
+
+class CallCancelled(Exception):
+    """Raised by RequestScheduler.call when its stop_event is set before the call gets to run."""
+
+
+def classify_error(error):
+    """Return PERMANENT, THROTTLED or TRANSIENT for an exception raised by a YouTube call."""
+    if isinstance(error, TooManyRequests) or isinstance(error, BotDetection):
+        return THROTTLED
+    if isinstance(error, PERMANENT_ERRORS) or isinstance(error, PytubeVideoUnavailable):
+        return PERMANENT
+    status = None
+    if isinstance(error, urllib.error.HTTPError):
+        status = error.code
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    elif isinstance(error, YouTubeRequestFailed):
+        # youtube-transcript-api only keeps the text of the HTTP error
+        reason = error.reason.split()
+        status = int(reason[0]) if reason and reason[0].isdigit() else None
+    if status is not None:
+        if status in THROTTLE_STATUS_CODES:
+            return THROTTLED
+        if status in TRANSIENT_STATUS_CODES:
+            return TRANSIENT
+        return PERMANENT
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, urllib.error.URLError,
+                          socket.timeout, ConnectionError, TimeoutError)):
+        return TRANSIENT
+    return PERMANENT
+
+
+class TokenBucket:
+    """Allows rate calls per second on average, with bursts of up to burst calls."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long (in seconds) the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RequestScheduler:
+    """Runs blocking YouTube calls under a rate limit, with retries and adaptive concurrency.
+
+    call() is meant to be used from the fetcher's worker threads. Each call
+    waits for a concurrency slot and a token, then runs. Throttled (HTTP 429)
+    and transient failures are retried with exponential backoff and jitter;
+    permanent ones (no transcript, video unavailable, ...) are raised at once.
+    In adaptive mode the concurrency limit is halved when YouTube throttles
+    (at most once per base_delay, so one burst of 429s counts once) and grows
+    back by one slot per limit-many successful calls.
+
+    Once stop_event is set, calls stop retrying and calls still waiting for a
+    slot or a token give up. Jobs sharing one scheduler each call it through
+    for_job(stop_event), so cancelling one job stops only its calls.
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        max_retries=4,
+        base_delay=1.0,
+        max_delay=60.0,
+        max_concurrency=8,
+        adaptive=True,
+        stop_event=None
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max(1, max_concurrency)
+        self.adaptive = adaptive
+        self.stop_event = stop_event
+        self.concurrency_limit = float(self.max_concurrency)
+        self.stats = {"calls": 0, "succeeded": 0, "retries": 0, "throttled": 0, "transient": 0, "failed": 0}
+        self._active = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def call(self, func, *args, stop_event=None):
+        if stop_event is None:
+            stop_event = self.stop_event
+        attempt = 0
+        while True:
+            self._acquire_slot(stop_event)
+            try:
+                self._wait(self.bucket.reserve() if self.bucket else 0.0, stop_event)
+                if self._stopped(stop_event):
+                    raise CallCancelled(f"Cancelled before calling {getattr(func, '__name__', func)}")
+                self._count("calls")
+                result = func(*args)
+            except CallCancelled:
+                raise
+            except Exception as e:
+                last_error = e
+                kind = classify_error(e)
+                self._on_failure(kind)
+                if kind == PERMANENT or attempt >= self.max_retries or self._stopped(stop_event):
+                    self._count("failed")
+                    raise
+            else:
+                self._on_success()
+                return result
+            finally:
+                self._release_slot()
+            attempt += 1
+            self._count("retries")
+            self._wait(self.backoff_delay(attempt), stop_event)
+            if self._stopped(stop_event):
+                raise last_error  # Cancelled while backing off
+
+    def for_job(self, stop_event):
+        """This scheduler as used by one job: same limits, rate and stats, but stopped by the job's stop_event."""
+        return JobScheduler(self, stop_event)
+
+    def set_max_concurrency(self, max_concurrency):
+        with self._condition:
+            self.max_concurrency = max(1, max_concurrency)
+            self.concurrency_limit = min(self.concurrency_limit, float(self.max_concurrency))
+            if not self.adaptive:
+                self.concurrency_limit = float(self.max_concurrency)
+            self._condition.notify_all()
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter for the given retry number (1, 2, ...)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _acquire_slot(self, stop_event=None):
+        with self._condition:
+            while self._active >= int(self.concurrency_limit):
+                if self._stopped(stop_event):
+                    raise CallCancelled("Cancelled while waiting for a concurrency slot")
+                self._condition.wait(SLOT_POLL_INTERVAL if stop_event is not None else None)
+            self._active += 1
+
+    def _release_slot(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def _on_success(self):
+        with self._condition:
+            self.stats["succeeded"] += 1
+            if self.adaptive and self.concurrency_limit < self.max_concurrency:
+                self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit)
+                self._condition.notify_all()
+
+    def _on_failure(self, kind):
+        with self._condition:
+            if kind == THROTTLED:
+                self.stats["throttled"] += 1
+                now = time.monotonic()
+                if self.adaptive and now - self._last_decrease >= self.base_delay:
+                    self.concurrency_limit = max(1.0, self.concurrency_limit / 2)
+                    self._last_decrease = now
+            elif kind == TRANSIENT:
+                self.stats["transient"] += 1
+
+    def _count(self, name):
+        with self._condition:
+            self.stats[name] += 1
+
+    def _stopped(self, stop_event=None):
+        return stop_event is not None and stop_event.is_set()
+
+    def _wait(self, delay, stop_event=None):
+        if delay <= 0:
+            return
+        if stop_event is not None:
+            stop_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+
+class JobScheduler:
+    """One job's view of a shared RequestScheduler (see RequestScheduler.for_job)."""
+
+    def __init__(self, scheduler, stop_event):
+        self.scheduler = scheduler
+        self.stop_event = stop_event
+
+    def call(self, func, *args):
+        return self.scheduler.call(func, *args, stop_event=self.stop_event)
+
+    def for_job(self, stop_event):
+        return self.scheduler.for_job(stop_event)
+
+    def __getattr__(self, name):
+        # Limits, stats and backoff are the shared scheduler's
+        return getattr(self.scheduler, name)
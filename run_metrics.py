@@ -0,0 +1,244 @@
+# run_metrics.py
+
+import bisect
+import contextlib
+import os
+import threading
+import time
+
+from utils import write_json_atomic
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Percentiles in the run report, estimated from the histogram buckets
+REPORT_PERCENTILES = (0.5, 0.9, 0.99)
+
+# Counters of videos that needed no fetch of their own: listed twice in a job, or fetched by another job
+FETCHES_SAVED_COUNTERS = ("duplicates_skipped", "fetches_shared")
+
+
+class StageStats:
+    """Count, total, maximum and latency histogram of one stage."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of the observations, capped at the maximum."""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.metrics.error(self.stage, exc)
+        return False
+
+
+class RunMetrics:
+    """Timings, counters, error classes and bytes written of one run, shared by all workers.
+
+    Wrap each stage in `with metrics.time("stage"):` to record its latency
+    (and the class of any exception it raises). The run report is a dict
+    (write_report saves it as JSON), write_prometheus saves the same data
+    in the Prometheus text format, and summary() is a one-line overview.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end = None
+        self.stages = {}  # stage name -> StageStats
+        self.counters = {}  # e.g. "videos_saved" -> count
+        self.errors = {}  # (stage, exception class name) -> count
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def time(self, stage):
+        return _StageTimer(self, stage)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.observe(seconds)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def error(self, stage, error):
+        """Count an error under the first stage it is reported for; later reports of the same exception are ignored."""
+        key = (stage, type(error).__name__)
+        with self._lock:
+            recorded_by = getattr(error, '_recorded_by', ())
+            if any(metrics is self for metrics in recorded_by):
+                return  # Already counted where it was raised, e.g. by a stage timer
+            error._recorded_by = recorded_by + (self,)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def add_bytes(self, amount):
+        with self._lock:
+            self.bytes_written += amount
+
+    def finish(self):
+        """Stop the run clock, so the rates in the report don't keep falling after the run."""
+        self._end = time.perf_counter()
+
+    def elapsed(self):
+        return (self._end or time.perf_counter()) - self._start
+
+    def videos_per_second(self):
+        elapsed = self.elapsed()
+        return self.counters.get("videos_completed", 0) / elapsed if elapsed > 0 else 0.0
+
+    def fetches_saved(self):
+        return sum(self.counters.get(name, 0) for name in FETCHES_SAVED_COUNTERS)
+
+    def summary(self):
+        """One line for a status bar: progress, rate, errors, bytes, fetches saved and the slowest stage on average."""
+        with self._lock:
+            completed = self.counters.get("videos_completed", 0)
+            fetches_saved = self.fetches_saved()
+            errors = sum(self.errors.values())
+            bytes_written = self.bytes_written
+            slowest = max(
+                ((stats.total / stats.count, stage) for stage, stats in self.stages.items()
+                 if stats.count and stage != "video"),
+                default=None
+            )
+        line = (f"{completed} videos, {self.videos_per_second():.1f}/s, {errors} errors, "
+                f"{bytes_written / 2 ** 20:.1f} MB written")
+        if fetches_saved:
+            line += f", {fetches_saved} fetches saved"
+        if slowest is not None:
+            line += f", slowest stage: {slowest[1]} ({slowest[0] * 1000:.0f} ms avg)"
+        return line
+
+    def report(self):
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": stats.count,
+                    "total_seconds": round(stats.total, 6),
+                    "mean_seconds": round(stats.total / stats.count, 6) if stats.count else 0.0,
+                    "max_seconds": round(stats.max, 6),
+                    **{f"p{round(fraction * 100)}_seconds": round(stats.percentile(fraction), 6)
+                       for fraction in REPORT_PERCENTILES},
+                    "histogram": {
+                        **{str(bound): count for bound, count in zip(LATENCY_BUCKETS, stats.buckets)},
+                        "+Inf": stats.buckets[-1],
+                    },
+                }
+                for stage, stats in sorted(self.stages.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+            errors = [
+                {"stage": stage, "error": error, "count": count}
+                for (stage, error), count in sorted(self.errors.items())
+            ]
+            bytes_written = self.bytes_written
+        return {
+            "started_at": round(self.started_at, 3),
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "videos_per_second": round(self.videos_per_second(), 3),
+            "bytes_written": bytes_written,
+            "fetches_saved": sum(counters.get(name, 0) for name in FETCHES_SAVED_COUNTERS),
+            "counters": counters,
+            "errors": errors,
+            "stages": stages,
+        }
+
+    def write_report(self, path):
+        write_json_atomic(path, self.report())
+
+    def write_prometheus(self, path, prefix="transcript_fetcher"):
+        """Save the metrics in the Prometheus text format, e.g. for node_exporter's textfile collector."""
+        report = self.report()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, stats in report["stages"].items():
+            cumulative = 0
+            for bound, count in stats["histogram"].items():
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats["total_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, count in report["counters"].items():
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {count}')
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        for error in report["errors"]:
+            lines.append(
+                f'{prefix}_errors_total{{stage="{error["stage"]}",error="{error["error"]}"}} {error["count"]}'
+            )
+        lines.append(f"# TYPE {prefix}_bytes_written_total counter")
+        lines.append(f"{prefix}_bytes_written_total {report['bytes_written']}")
+        lines.append(f"# TYPE {prefix}_videos_per_second gauge")
+        lines.append(f"{prefix}_videos_per_second {report['videos_per_second']}")
+        lines.append(f"# TYPE {prefix}_elapsed_seconds gauge")
+        lines.append(f"{prefix}_elapsed_seconds {report['elapsed_seconds']}")
+        # Written whole and renamed, so a scraper never reads half a file
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, path)
+
+
+class NullMetrics:
+    """Stands in for RunMetrics when metrics are off; every call does nothing."""
+
+    enabled = False
+    _timer = contextlib.nullcontext()
+
+    def time(self, stage):
+        return self._timer
+
+    def observe(self, stage, seconds):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def error(self, stage, error):
+        pass
+
+    def add_bytes(self, amount):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,54 @@
+# single_flight.py
+
+import asyncio
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; callers asking for a key already in flight get that call's result.
+
+    Meant to be shared by every job running on one event loop, so two jobs
+    that reach the same video at the same time fetch it once. Results are
+    not kept after the call finishes (the transcript cache does that).
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> [task, number of callers waiting for it, stop_event of the caller that started it]
+
+    async def run(self, key, make_call, stop_event=None):
+        """Await make_call() or the call already in flight for key. Returns (result, shared).
+
+        shared is True when the result came from another caller's call. If
+        every caller waiting for a call is cancelled, the call is cancelled
+        too; one caller being cancelled does not cancel it for the others.
+        make_call runs on what its caller's job provides (scheduler, thread
+        pool, session), which stops once that job's stop_event is set: a
+        call that fails after that is run again for the callers still
+        waiting, whose own stop_event isn't set.
+        """
+        while True:
+            call = self._calls.get(key)
+            shared = call is not None
+            if call is None:
+                call = self._calls[key] = [asyncio.ensure_future(make_call()), 0, stop_event]
+                call[0].add_done_callback(lambda task, call=call: self._forget(key, call))
+            call[1] += 1
+            try:
+                return await asyncio.shield(call[0]), shared
+            except Exception:
+                starter_stopped = call[2] is not None and call[2].is_set()
+                if not shared or not starter_stopped or (stop_event is not None and stop_event.is_set()):
+                    raise
+                self._forget(key, call)  # The next caller starts a call of its own
+            finally:
+                call[1] -= 1
+                if call[1] == 0 and not call[0].done():
+                    # Nobody is waiting for it any more; a later caller starts a new call
+                    self._forget(key, call)
+                    call[0].cancel()
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
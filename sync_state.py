@@ -0,0 +1,154 @@
+# sync_state.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils import write_json_atomic
+
+# Kept in the save directory, next to the transcripts and their manifest
+SYNC_STATE_FILENAME = '.transcript_sync.json'
+
+# Auto-generated captions are checked for a manual replacement this often (seconds)
+DEFAULT_RECHECK_INTERVAL = 7 * 24 * 60 * 60
+
+# A newest-first source (a channel's uploads) stops being listed after this
+# many videos in a row that were synced before
+KNOWN_RUN_TO_STOP = 100
+
+# Write the state out after this many changes, not only at the end of a run
+SAVE_EVERY = 200
+
+# Caption kind recorded for a video language that had no transcript
+NO_CAPTIONS = 'none'
+
+# One lock per state file, so SyncStates of the same folder (jobs queued into it) merge their saves one at a time
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+
+def _file_lock(path):
+    with _file_locks_lock:
+        return _file_locks.setdefault(os.path.normcase(os.path.abspath(path)), threading.Lock())
+
+
+def transcript_hash(transcript_data):
+    """Content hash of a transcript's segments, to tell whether refetched captions changed."""
+    content = json.dumps(transcript_data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def is_newest_first(playlist_id):
+    """Whether a playlist lists its newest videos first, as a channel's uploads ("UU...") do."""
+    return playlist_id.startswith('UU')
+
+
+class SyncState:
+    """What earlier syncs of a save directory fetched, so a sync only fetches what is new.
+
+    For each video and language it keeps the caption kind ("manual",
+    "generated", "translated", or NO_CAPTIONS when it had no transcript), a
+    hash of the transcript and when it was last checked.
+    For each source (playlist URL) it keeps the IDs of its videos and a
+    watermark: the video at the top of the source last time, where the next
+    sync of a newest-first source can stop listing. Videos with manual
+    captions are never fetched again; ones with auto-generated captions are
+    checked for a manual replacement, and ones without captions for new
+    captions, once every recheck_interval seconds.
+
+    Several SyncStates of one folder (jobs queued into it) can be used at
+    once: each save merges this state's changes into the file as it is
+    then, and picks up what the others saved.
+    """
+
+    def __init__(self, save_directory, recheck_interval=DEFAULT_RECHECK_INTERVAL):
+        self.path = os.path.join(save_directory, SYNC_STATE_FILENAME)
+        self.recheck_interval = recheck_interval
+        self.videos = {}  # "video_id:language" -> {'kind', 'hash', 'checked'}
+        self.sources = {}  # source URL -> {'watermark', 'synced', 'new', 'videos'}
+        self._changes = 0
+        self._changed_videos = set()  # Keys of the records changed since the last save
+        self._changed_sources = set()
+        self._lock = threading.Lock()
+        self.videos, self.sources = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state.get('videos', {}), state.get('sources', {})
+        except FileNotFoundError:
+            return {}, {}
+        except ValueError:
+            return {}, {}  # Unreadable state only means the next sync checks everything again
+
+    def get(self, video_id, language):
+        with self._lock:
+            return self.videos.get(f"{video_id}:{language}")
+
+    def needs_recheck(self, video_id, language):
+        """Whether a known video's captions are due to be checked again."""
+        record = self.get(video_id, language)
+        if record is None:
+            return True
+        return record['kind'] != 'manual' and time.time() - record['checked'] >= self.recheck_interval
+
+    def record(self, video_id, language, kind, content_hash):
+        self._update(f"{video_id}:{language}", {'kind': kind, 'hash': content_hash, 'checked': round(time.time())})
+
+    def mark_checked(self, video_id, language):
+        with self._lock:
+            record = dict(self.videos[f"{video_id}:{language}"])
+        record['checked'] = round(time.time())
+        self._update(f"{video_id}:{language}", record)
+
+    def _update(self, key, record):
+        with self._lock:
+            self.videos[key] = record
+            self._changed_videos.add(key)
+            self._changes += 1
+            if self._changes >= SAVE_EVERY:
+                self._save()
+
+    def watermark(self, source):
+        with self._lock:
+            return self.sources.get(source, {}).get('watermark')
+
+    def source_videos(self, source):
+        with self._lock:
+            return list(self.sources.get(source, {}).get('videos', []))
+
+    def finish_source(self, source, listed_videos, new_videos):
+        """Remember the videos listed from a source this time, in order, and how many of them were new."""
+        with self._lock:
+            known = self.sources.get(source, {}).get('videos', [])
+            listed = set(listed_videos)
+            videos = list(listed_videos) + [video_id for video_id in known if video_id not in listed]
+            self.sources[source] = {
+                'watermark': videos[0] if videos else None,
+                'synced': round(time.time()),
+                'new': new_videos,
+                'videos': videos,
+            }
+            self._changed_sources.add(source)
+            self._changes += 1
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with _file_lock(self.path):
+            # Another SyncState of the folder may have saved meanwhile: keep its records next to ours
+            videos, sources = self._load()
+            videos.update((key, self.videos[key]) for key in self._changed_videos)
+            sources.update((source, self.sources[source]) for source in self._changed_sources)
+            write_json_atomic(self.path, {'sources': sources, 'videos': videos})
+        self.videos, self.sources = videos, sources
+        self._changed_videos.clear()
+        self._changed_sources.clear()
+        self._changes = 0
+
+    def save(self):
+        with self._lock:
+            if self._changes:
+                self._save()
@@ -0,0 +1,123 @@
+# transcript_cache.py
+
+import json
+import sqlite3
+import threading
+import time
+
+# Default location of the cache database, next to settings.json
+DEFAULT_CACHE_PATH = 'transcript_cache.sqlite3'
+
+# Default expiry (in days) and size limit (in megabytes) of the cache
+DEFAULT_CACHE_TTL_DAYS = 30
+DEFAULT_CACHE_MAX_MB = 500
+
+# Caption kinds, in the order find_transcript prefers them (then machine translations)
+TRANSCRIPT_KINDS = ("manual", "generated", "translated")
+
+
+class TranscriptCache:
+    """SQLite store of fetched transcript segments, keyed by video ID, language and caption kind.
+
+    Entries older than ttl seconds are ignored and dropped. When the stored
+    segments grow past max_size bytes, the least recently used entries are
+    evicted. Safe to share between the fetcher's worker threads.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=None, max_size=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    segments TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (video_id, language, kind)
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts (last_used)")
+            # Running total of stored segment bytes, so eviction checks don't scan the table
+            self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+
+    def get(self, video_id, language, kind=None):
+        """Return (title, transcript_data, kind) for the cached transcript, or None.
+
+        Without a kind, a manual transcript is preferred over a generated one,
+        the same way find_transcript picks them.
+        """
+        kinds = (kind,) if kind else TRANSCRIPT_KINDS
+        now = time.time()
+        with self._lock, self._conn:
+            for candidate in kinds:
+                row = self._conn.execute(
+                    "SELECT title, segments, fetched_at FROM transcripts WHERE video_id = ? AND language = ? AND kind = ?",
+                    (video_id, language, candidate)
+                ).fetchone()
+                if row is None:
+                    continue
+                title, segments, fetched_at = row
+                if self.ttl is not None and now - fetched_at > self.ttl:
+                    self._delete([(video_id, language, candidate)])
+                    continue
+                self._conn.execute(
+                    "UPDATE transcripts SET last_used = ? WHERE video_id = ? AND language = ? AND kind = ?",
+                    (now, video_id, language, candidate)
+                )
+                return title, json.loads(segments), candidate
+        return None
+
+    def put(self, video_id, language, kind, title, transcript_data):
+        segments = json.dumps(transcript_data, ensure_ascii=False)
+        size = len(segments.encode('utf-8'))
+        now = time.time()
+        with self._lock, self._conn:
+            self._delete([(video_id, language, kind)])
+            self._conn.execute(
+                "INSERT INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_id, language, kind, title, segments, size, now, now)
+            )
+            self._total_size += size
+            if self.max_size is not None and self._total_size > self.max_size:
+                self._evict(self.max_size)
+
+    def _evict(self, max_size):
+        # Drop least recently used entries until the total size fits
+        total = self._total_size
+        expired = []
+        # Read from the oldest end only as far as needed, not the whole table
+        rows = self._conn.execute("SELECT video_id, language, kind, size FROM transcripts ORDER BY last_used")
+        for video_id, language, kind, size in rows:
+            if total <= max_size:
+                break
+            expired.append((video_id, language, kind))
+            total -= size
+        rows.close()
+        self._delete(expired)
+
+    def _delete(self, keys):
+        for key in keys:
+            row = self._conn.execute(
+                "SELECT size FROM transcripts WHERE video_id = ? AND language = ? AND kind = ?", key
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ? AND kind = ?", key)
+                self._total_size -= row[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM transcripts")
+            self._total_size = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
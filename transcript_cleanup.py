@@ -0,0 +1,216 @@
+# transcript_cleanup.py
+
+"""Optional clean-up of fetched captions before they are saved.
+
+Auto-generated captions repeat the end of each line at the start of the
+next (rolling captions), carry noise tags like [Music] and break lines
+mid-sentence. clean_transcript removes the noise tags and the repeated
+words, regroups the words into sentences with timings interpolated per
+word, and can pack the result into fixed-size chunks for indexing. It
+takes and returns the usual list of {'text', 'start', 'duration'}
+segments, so every saver and the search index work on the result as is.
+
+clean_transcript is CPU-bound and pure, so the fetcher runs it on a
+process pool (see create_process_pool) for large transcripts.
+"""
+
+import multiprocessing
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Chunk size units: characters, or whitespace-separated tokens (words)
+CHARS = "chars"
+TOKENS = "tokens"
+
+# Noise tags of auto-generated captions: [Music], [Applause], ♪, >> (speaker change)
+NOISE_TAG_RE = re.compile(r"\[[^\[\]]{1,40}\]|[♪♫]+|>>")
+
+# Rolling captions repeat at most this many words of the previous line
+MAX_OVERLAP_WORDS = 20
+
+# A shorter repeat than this is only dropped when it is the whole line, so "no, no" survives
+MIN_OVERLAP_WORDS = 2
+
+# Sentences without punctuation (common in auto-generated captions) are cut at this length
+MAX_SENTENCE_CHARS = 300
+
+# Closing characters that may follow a sentence's final punctuation
+SENTENCE_CLOSERS = "\"')]”’"
+SENTENCE_ENDINGS = (".", "?", "!", "…")
+
+
+class CleanupOptions:
+    """Which clean-up steps run. chunk_size (in chunk_unit) turns on chunking; None leaves sentences as they are."""
+
+    def __init__(self, strip_noise=True, dedupe=True, resegment=True, chunk_size=None, chunk_unit=CHARS,
+                 max_sentence_chars=MAX_SENTENCE_CHARS):
+        if chunk_unit not in (CHARS, TOKENS):
+            raise ValueError(f"Unknown chunk unit: {chunk_unit}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self.strip_noise = strip_noise
+        self.dedupe = dedupe
+        self.resegment = resegment
+        self.chunk_size = chunk_size
+        self.chunk_unit = chunk_unit
+        self.max_sentence_chars = max_sentence_chars
+
+    @property
+    def enabled(self):
+        return self.strip_noise or self.dedupe or self.resegment or bool(self.chunk_size)
+
+
+def clean_transcript(transcript_data, options):
+    """Run the clean-up steps options turns on, returning new segments."""
+    segments = [(entry['text'], entry['start'], entry['duration']) for entry in transcript_data]
+    if options.strip_noise:
+        segments = strip_noise_tags(segments)
+    if options.dedupe:
+        segments = dedupe_overlaps(segments)
+    if options.resegment:
+        segments = resegment(segments, options.max_sentence_chars)
+    if options.chunk_size:
+        segments = chunk_segments(segments, options.chunk_size, options.chunk_unit)
+    return [{'text': text, 'start': start, 'duration': duration} for text, start, duration in segments]
+
+
+def strip_noise_tags(segments):
+    """Drop noise tags and extra whitespace; segments left empty are dropped."""
+    cleaned = []
+    for text, start, duration in segments:
+        text = " ".join(NOISE_TAG_RE.sub(" ", text).split())
+        if text:
+            cleaned.append((text, start, duration))
+    return cleaned
+
+
+def dedupe_overlaps(segments):
+    """Drop the words a segment repeats from the end of the text before it; segments left empty are dropped."""
+    cleaned = []
+    tail = deque(maxlen=MAX_OVERLAP_WORDS)  # Last words kept so far, lowercased
+    for text, start, duration in segments:
+        words = text.split()
+        folded = [word.lower() for word in words]
+        recent = list(tail)
+        overlap = 0
+        for size in range(min(len(recent), len(folded)), 0, -1):
+            if size < MIN_OVERLAP_WORDS and size < len(folded):
+                break
+            if recent[-size] == folded[0] and recent[-size:] == folded[:size]:
+                overlap = size
+                break
+        if overlap == len(words):
+            continue
+        tail.extend(folded[overlap:])
+        cleaned.append((" ".join(words[overlap:]) if overlap else " ".join(words), start, duration))
+    return cleaned
+
+
+def is_sentence_end(word):
+    return word.rstrip(SENTENCE_CLOSERS).endswith(SENTENCE_ENDINGS)
+
+
+def resegment(segments, max_chars=MAX_SENTENCE_CHARS):
+    """Regroup the words into sentences, timing each word by spreading its segment's duration over its words."""
+    sentences = []
+    words = []
+    length = 0
+    sentence_start = sentence_end = 0.0
+    for text, start, duration in segments:
+        parts = text.split()
+        step = duration / len(parts) if parts else 0.0
+        for index, word in enumerate(parts):
+            word_start = start + step * index
+            if not words:
+                sentence_start = sentence_end = word_start
+            words.append(word)
+            length += len(word) + 1
+            sentence_end = max(sentence_end, word_start + step)
+            if length > max_chars or is_sentence_end(word):
+                sentences.append((" ".join(words), round(sentence_start, 3), round(sentence_end - sentence_start, 3)))
+                words = []
+                length = 0
+    if words:
+        sentences.append((" ".join(words), round(sentence_start, 3), round(sentence_end - sentence_start, 3)))
+    return sentences
+
+
+def chunk_segments(segments, size, unit=CHARS):
+    """Pack consecutive segments into chunks of at most size characters or tokens.
+
+    A segment longer than size on its own is split between words, its
+    duration spread over the pieces by their share of the words.
+    """
+    measure = len if unit == CHARS else _token_count
+    chunks = []
+    texts = []
+    chunk_length = 0
+    chunk_start = chunk_end = 0.0
+    for text, start, duration in _split_long(segments, size, unit):
+        length = measure(text)
+        separator = 1 if unit == CHARS and texts else 0
+        if texts and chunk_length + separator + length > size:
+            chunks.append((" ".join(texts), round(chunk_start, 3), round(chunk_end - chunk_start, 3)))
+            texts = []
+            chunk_length = 0
+            separator = 0
+        if not texts:
+            chunk_start = chunk_end = start
+        texts.append(text)
+        chunk_length += separator + length
+        chunk_end = max(chunk_end, start + duration)
+    if texts:
+        chunks.append((" ".join(texts), round(chunk_start, 3), round(chunk_end - chunk_start, 3)))
+    return chunks
+
+
+def _token_count(text):
+    return len(text.split())
+
+
+def _split_long(segments, size, unit):
+    measure = len if unit == CHARS else _token_count
+    for text, start, duration in segments:
+        if measure(text) <= size:
+            yield text, start, duration
+            continue
+        words = text.split()
+        step = duration / len(words)
+        piece = []
+        piece_length = 0
+        first = 0
+        for index, word in enumerate(words):
+            length = len(word) if unit == CHARS else 1
+            separator = 1 if unit == CHARS and piece else 0
+            if piece and piece_length + separator + length > size:
+                yield " ".join(piece), round(start + step * first, 3), round(step * len(piece), 3)
+                piece = []
+                piece_length = 0
+                separator = 0
+                first = index
+            # A single word longer than size becomes a chunk of its own
+            piece.append(word)
+            piece_length += separator + length
+        if piece:
+            yield " ".join(piece), round(start + step * first, 3), round(step * len(piece), 3)
+
+
+def create_process_pool(max_workers=None, allow_spawn=False):
+    """ProcessPoolExecutor to run clean_transcript on, or None where processes can't be started safely (use threads then).
+
+    Workers are forked on Linux, so they start without re-running the
+    script that created the pool (main.py would open another window).
+    macOS offers fork too, but forking a process that has loaded Tk or
+    other system frameworks can crash the child, so there and on Windows
+    workers are spawned only with allow_spawn, for scripts guarded by
+    if __name__ == '__main__' (cli.py).
+    """
+    if sys.platform.startswith("linux"):
+        context = multiprocessing.get_context("fork")
+    elif allow_spawn:
+        context = multiprocessing.get_context("spawn")
+    else:
+        return None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
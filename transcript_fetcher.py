@@ -5,29 +5,82 @@ import urllib.parse
 import re
 import textwrap
 import json
-from pytubefix import YouTube, Playlist
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from youtube_transcript_api import (
-    YouTubeTranscriptApi,
     TranscriptsDisabled,
     NoTranscriptFound,
     NoTranscriptAvailable,
-)
-from youtube_transcript_api.formatters import (
-    JSONFormatter,
-    TextFormatter,
-    SRTFormatter,
-    WebVTTFormatter
+    NotTranslatable,
+    TranslationLanguageNotAvailable,
 )
 from utils import clean_filename
+from job_journal import PENDING, DONE, NO_TRANSCRIPT, FAILED, job_id_for
+from rate_limiter import RequestScheduler, classify_error, PERMANENT
+from http_session import create_session
+from output_manifest import OutputManifest
+from transcript_shard import ShardWriter
+from sync_state import transcript_hash, is_newest_first, KNOWN_RUN_TO_STOP, NO_CAPTIONS
+from run_metrics import NULL_METRICS
+from language_plan import as_language_plan
+from transcript_formats import write_txt, write_json, write_srt, write_vtt
+from transcript_cleanup import clean_transcript, create_process_pool
+from youtube_backend import YouTubeBackend, WATCH_URL
+
+# Number of videos fetched at the same time when no limit is given
+DEFAULT_MAX_WORKERS = 4
+
+# Videos queued ahead of each worker while a playlist is still being listed
+QUEUE_SIZE_PER_WORKER = 2
+
+# How often (in seconds) running jobs check whether the user cancelled
+STOP_POLL_INTERVAL = 0.1
+
+# Path prefixes of video URLs that carry the video ID in the path instead of ?v=
+VIDEO_ID_PATH_PREFIXES = ("/shorts/", "/embed/", "/live/", "/v/")
+
+# Output format that appends every transcript of a job to one compressed shard
+SHARD_FORMAT = "shard"
+
+# Buffer (in bytes) of transcript files, which are written a chunk of segments at a time
+FILE_BUFFER_SIZE = 64 * 1024
+
+# Transcripts with fewer segments than this are cleaned on the thread pool: shipping them to a process costs more
+PROCESS_POOL_MIN_SEGMENTS = 500
+
+# Errors meaning a video (or one language of it) has no transcript to fetch
+NO_TRANSCRIPT_ERRORS = (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    NoTranscriptAvailable,
+    NotTranslatable,
+    TranslationLanguageNotAvailable,
+)
+
+# How a video ended, counted in the metrics as videos_<outcome>
+OUTCOME_SAVED = "saved"
+OUTCOME_SKIPPED = "skipped"
+OUTCOME_UP_TO_DATE = "up_to_date"
+OUTCOME_NO_TRANSCRIPT = "no_transcript"
+OUTCOME_FAILED = "failed"
+
+# A video with several languages ends as the first of its languages' outcomes in this order
+VIDEO_OUTCOMES = (OUTCOME_FAILED, OUTCOME_SAVED, OUTCOME_SKIPPED, OUTCOME_UP_TO_DATE, OUTCOME_NO_TRANSCRIPT)
+
+# Backend of the jobs that don't pass one: YouTube itself
+default_backend = YouTubeBackend()
 
 def convert_short_url_to_full(url):
     if "youtu.be" in url:
-        video_id = url.split("/")[-1]
         # Preserve the query parameters (like playlist) when converting the URL
         parsed_url = urllib.parse.urlparse(url)
+        video_id = parsed_url.path.rstrip("/").split("/")[-1]
         query_params = urllib.parse.parse_qs(parsed_url.query)
         list_param = f"&list={query_params['list'][0]}" if 'list' in query_params else ""
-        return f"https://www.youtube.com/watch?v={video_id}{list_param}"
+        return WATCH_URL.format(video_id) + list_param
     return url
 
 def is_playlist(url):
@@ -39,7 +92,53 @@ def is_video(url):
     url = convert_short_url_to_full(url)  # Convert to full URL if necessary
     parsed_url = urllib.parse.urlparse(url)
     query_params = urllib.parse.parse_qs(parsed_url.query)
-    return "v" in query_params and "list" not in query_params
+    return extract_video_id(url) is not None and "list" not in query_params
+
+def extract_video_id(url):
+    """Return the video ID of a watch, youtu.be, shorts or embed URL without any network call, or None."""
+    url = convert_short_url_to_full(url)  # Convert to full URL if necessary
+    parsed_url = urllib.parse.urlparse(url)
+    query_params = urllib.parse.parse_qs(parsed_url.query)
+    if "v" in query_params:
+        return query_params["v"][0]
+    for prefix in VIDEO_ID_PATH_PREFIXES:
+        if parsed_url.path.startswith(prefix):
+            return parsed_url.path[len(prefix):].split("/")[0] or None
+    return None
+
+class JobContext:
+    """The dependencies the videos of a job share, bundled for process_videos.
+
+    Every one is optional: process_videos creates the scheduler, session,
+    executor, manifest, shard and process pool a job leaves out and closes
+    them at the end, metrics default to NULL_METRICS and the backend to
+    default_backend. Jobs run side by side share the scheduler, session,
+    executor, slots (a job_queue.PrioritySlots), single_flight and process
+    pool, so they stay within one concurrency budget and fetch a video once.
+    """
+
+    def __init__(self, cache=None, journal=None, scheduler=None, session=None, manifest=None, shard=None,
+                 search_index=None, sync=None, metrics=None, executor=None, slots=None, single_flight=None,
+                 cleanup=None, process_pool=None, backend=None):
+        self.cache = cache
+        self.journal = journal
+        self.scheduler = scheduler
+        self.session = session
+        self.manifest = manifest
+        self.shard = shard
+        self.search_index = search_index
+        self.sync = sync
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.executor = executor
+        self.slots = slots
+        self.single_flight = single_flight
+        self.cleanup = cleanup
+        self.process_pool = process_pool
+        self.backend = backend
+
+    def replace(self, **changes):
+        """A copy of the context with the given dependencies changed."""
+        return JobContext(**dict(vars(self), **changes))
 
 async def process_videos(
     url,
@@ -50,39 +149,253 @@ async def process_videos(
     update_recent_downloads,
     stop_event,
     file_policy,
-    progress_bar_callback
+    progress_bar_callback,
+    max_workers=DEFAULT_MAX_WORKERS,
+    context=None,
+    priority=0
 ):
-    try:
-        video_urls = []
-        if is_playlist(url):
-            console_output("Processing playlist...", "info")
-            playlist = Playlist(url)
-            video_urls = playlist.video_urls  # List of video URLs
-        elif is_video(url):
-            video_urls = [convert_short_url_to_full(url)]  # Convert if necessary
-        else:
-            console_output("Invalid URL. Please enter a valid YouTube video or playlist URL.", "error")
-            return
+    """Fetch and save the transcripts of one URL, or of every URL in a list.
+
+    Each URL can be a single video or a playlist. Playlists are expanded page
+    by page while the workers are already fetching the first videos, and a
+    video listed more than once is fetched once. language is a LanguagePlan,
+    or a spec string for one.
+
+    context (a JobContext) holds the dependencies the videos share; with
+    its slots, each video waits for a slot handed out by priority.
+    """
+    urls = [url] if isinstance(url, str) else list(url)
+    plan = as_language_plan(language)
+    max_workers = max(1, int(max_workers))
+    # A copy, so what is created for this job stays out of contexts shared with other jobs
+    context = context.replace() if context is not None else JobContext()
+    if context.backend is None:
+        context.backend = default_backend
+    if context.scheduler is None:
+        context.scheduler = RequestScheduler(max_concurrency=max_workers, stop_event=stop_event)
+    else:
+        # A scheduler shared with other jobs: cancelling this job stops only this job's retries
+        context.scheduler = context.scheduler.for_job(stop_event)
+    own_session = context.session is None
+    if own_session:
+        context.session = create_session(pool_size=max_workers)
+    loop = asyncio.get_running_loop()
+    # Blocking network and disk calls run on this pool so several videos can be in flight at once
+    own_executor = context.executor is None
+    if own_executor:
+        context.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcript-worker")
+    own_manifest = context.manifest is None
+    if own_manifest:
+        context.manifest = await loop.run_in_executor(context.executor, OutputManifest, save_directory)
+    own_shard = context.shard is None and SHARD_FORMAT in output_formats
+    if own_shard:
+        job_id = job_id_for(urls, output_formats, str(plan), save_directory)
+        context.shard = ShardWriter(os.path.join(save_directory, f"transcripts_{job_id}.jsonl.gz"))
+    if context.cleanup is not None and not context.cleanup.enabled:
+        context.cleanup = None
+    own_process_pool = context.cleanup is not None and context.process_pool is None
+    if own_process_pool:
+        context.process_pool = create_process_pool(max_workers=max_workers)
+    # Bounded, so playlist paging waits for the workers instead of holding every URL in memory
+    queue = asyncio.Queue(maxsize=max_workers * QUEUE_SIZE_PER_WORKER)
+    # "pending" estimates the videos not queued yet: the rest of the playlist being
+    # listed (from its declared size) plus one per URL that hasn't been expanded
+    progress = {"queued": 0, "pending": len(urls), "completed": 0, "duplicates": 0}
+    # IDs of the videos queued so far, so a video listed again is not fetched twice
+    queued_ids = set()
+
+    def total_estimate():
+        return progress["queued"] + progress["pending"]
+
+    def is_synced(video_id):
+        # Every language fetched (or found without captions) by an earlier sync, not due for a recheck,
+        # and still saved in every format
+        for track in plan.tracks:
+            record = context.sync.get(video_id, track.language)
+            if record is None or context.sync.needs_recheck(video_id, track.language):
+                return False
+            if record['kind'] != NO_CAPTIONS and not is_already_saved(
+                    plan.output_key(video_id, track), output_formats, context.manifest, context.shard):
+                return False
+        return True
+
+    def needs_recheck(video_id):
+        return any(context.sync.needs_recheck(video_id, track.language) for track in plan.tracks)
 
-        total_videos = len(video_urls)
-        for idx, video_url in enumerate(video_urls, 1):
-            if stop_event.is_set():
-                console_output("Download cancelled by user.", "info")
-                break
-            console_output(f"Processing video {idx}/{total_videos}: {video_url}", "info")
+    async def enqueue(video_url, video_title=None):
+        video_id = extract_video_id(video_url)
+        if video_id is not None:
+            if video_id in queued_ids:
+                progress["duplicates"] += 1
+                context.metrics.count("duplicates_skipped")
+                return
+            queued_ids.add(video_id)
+            video_url = WATCH_URL.format(video_id)
+        progress["queued"] += 1
+        if context.journal is not None:
+            video_key = video_journal_key(video_url)
+            if not context.journal.is_finished(video_key):
+                context.journal.record(video_key, PENDING)
+        await queue.put((progress["queued"], video_url, video_title))
+
+    async def produce():
+        try:
+            for position, url in enumerate(urls):
+                later_urls = len(urls) - position - 1
+                if is_playlist(url):
+                    console_output("Processing playlist...", "info")
+                    try:
+                        with context.metrics.time("open_playlist"):
+                            playlist, playlist_urls, declared = await loop.run_in_executor(
+                                context.executor, context.scheduler.call, context.backend.open_playlist, url
+                            )
+                        found = 0
+                        page_retries = 0
+                        newest_first = context.sync is not None and is_newest_first(urllib.parse.parse_qs(
+                            urllib.parse.urlparse(url).query)["list"][0])
+                        watermark = context.sync.watermark(url) if context.sync is not None else None
+                        source_videos = []
+                        new_videos = 0
+                        known_run = 0
+                        while True:
+                            # Each step may load the next page of the playlist
+                            try:
+                                with context.metrics.time("playlist_next"):
+                                    video_url = await loop.run_in_executor(context.executor, next, playlist_urls, None)
+                            except Exception as e:
+                                # A failed page ends pytubefix's generator, so list the playlist
+                                # again after a backoff and skip the videos already queued
+                                if classify_error(e) == PERMANENT or page_retries >= context.scheduler.max_retries:
+                                    raise
+                                page_retries += 1
+                                await asyncio.sleep(context.scheduler.backoff_delay(page_retries))
+                                playlist, playlist_urls = await loop.run_in_executor(
+                                    context.executor, context.scheduler.call, context.backend.reopen_playlist, url,
+                                    found
+                                )
+                                continue
+                            if video_url is None:
+                                break
+                            found += 1
+                            progress["pending"] = later_urls + max(0, declared - found)
+                            video_id = extract_video_id(video_url)
+                            if context.sync is None:
+                                await enqueue(video_url, playlist.video_titles.get(video_id))
+                                continue
+                            source_videos.append(video_id)
+                            # Checked before queueing: a worker may sync the video meanwhile
+                            known = any(
+                                context.sync.get(video_id, track.language) is not None for track in plan.tracks
+                            )
+                            if not is_synced(video_id):
+                                await enqueue(video_url, playlist.video_titles.get(video_id))
+                            if newest_first and video_id == watermark:
+                                break  # Everything below the previous sync's newest video was seen then
+                            if not known:
+                                new_videos += 1
+                                known_run = 0
+                            elif newest_first:
+                                known_run += 1
+                                if known_run >= KNOWN_RUN_TO_STOP:
+                                    break
+                        if context.sync is not None:
+                            await finish_sync_source(url, source_videos, new_videos)
+                    except Exception as e:
+                        console_output(f"Could not read playlist {url}: {e}", "error")
+                elif is_video(url):
+                    await enqueue(convert_short_url_to_full(url))  # Convert if necessary
+                else:
+                    console_output(f"Invalid URL: {url}. Please enter a valid YouTube video or playlist URL.", "error")
+                progress["pending"] = later_urls
+        except Exception as e:
+            console_output(f"An error occurred: {e}", "error")
+        # One end marker per worker
+        for _ in range(max_workers):
+            await queue.put(None)
+
+    async def finish_sync_source(url, source_videos, new_videos):
+        # Videos below where listing stopped still get their captions rechecked when due
+        seen = set(source_videos)
+        for video_id in context.sync.source_videos(url):
+            if video_id not in seen and needs_recheck(video_id):
+                await enqueue(WATCH_URL.format(video_id))
+        context.sync.finish_source(url, source_videos, new_videos)
+        console_output(f"Sync: {new_videos} new videos in {url}", "info")
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            idx, video_url, video_title = item
+            if context.slots is not None:
+                await context.slots.acquire(priority)
+            try:
+                await process_queued_video(idx, video_url, video_title)
+            finally:
+                if context.slots is not None:
+                    context.slots.release()
+
+    async def process_queued_video(idx, video_url, video_title):
+        console_output(f"Processing video {idx}/{total_estimate()}: {video_url}", "info")
+        with context.metrics.time("video"):
             await process_single_video(
                 video_url,
                 output_formats,
-                language,
+                plan,
                 save_directory,
                 console_output,
                 update_recent_downloads,
                 stop_event,
-                file_policy
+                file_policy,
+                video_title=video_title,
+                context=context
             )
-            progress_bar_callback(idx, total_videos)
+        # Videos finish out of order, so progress counts completed videos
+        progress["completed"] += 1
+        context.metrics.count("videos_completed")
+        progress_bar_callback(progress["completed"], total_estimate())
+
+    try:
+        tasks = [asyncio.ensure_future(produce())]
+        tasks += [asyncio.ensure_future(worker()) for _ in range(max_workers)]
+        await run_until_stopped(tasks, stop_event)
+        if progress["duplicates"]:
+            console_output(f"Skipped {progress['duplicates']} duplicate videos (listed more than once)", "info")
+        if stop_event.is_set():
+            console_output("Download cancelled by user.", "info")
     except Exception as e:
         console_output(f"An error occurred: {e}", "error")
+    finally:
+        if own_executor:
+            # Don't wait for calls that are still blocked on the network after a cancel
+            context.executor.shutdown(wait=False, cancel_futures=True)
+        if own_process_pool and context.process_pool is not None:
+            context.process_pool.shutdown(wait=False, cancel_futures=True)
+        if context.journal is not None:
+            context.journal.flush()
+        if own_manifest:
+            context.manifest.close()
+        else:
+            context.manifest.flush()
+        if own_shard:
+            context.shard.close()
+        if context.sync is not None:
+            context.sync.save()
+        context.metrics.finish()
+        if own_session:
+            context.session.close()
+
+async def run_until_stopped(tasks, stop_event):
+    """Wait for the tasks to finish, cancelling the ones still running once stop_event is set."""
+    pending = set(tasks)
+    while pending:
+        _, pending = await asyncio.wait(pending, timeout=STOP_POLL_INTERVAL)
+        if pending and stop_event.is_set():
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            return
 
 async def process_single_video(
     video_url,
@@ -92,120 +405,476 @@ async def process_single_video(
     console_output,
     update_recent_downloads,
     stop_event,
-    file_policy
+    file_policy,
+    video_title=None,
+    context=None
 ):
+    """Fetch and save every track of the language plan (a LanguagePlan, or a spec like "en") for one video.
+
+    The video's transcripts are listed at most once, and only when some
+    track isn't served by the sync state, the saved files or the cache;
+    the tracks' transcripts are then fetched concurrently. With cleanup, the
+    saved files and the search index get the cleaned transcript; the cache
+    and the sync state keep the captions as fetched.
+    """
     if stop_event.is_set():
         return
-    try:
-        yt = YouTube(video_url)
-        video_id = yt.video_id
-        video_title = yt.title
-        console_output(f"Fetching transcript for: {video_title}", "info")
-
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        transcript = transcript_list.find_transcript([language])
-        transcript_data = transcript.fetch()
-
-        filename = clean_filename(video_title)
-        processed = False  # Flag to track if the video was actually processed
-
-        # Save in the selected format
-        selected_format = output_formats[0]  # Only one format selected
-        if selected_format == "txt":
-            file_saved, file_path = save_transcript_as_txt(transcript_data, filename, save_directory, file_policy)
-        elif selected_format == "json":
-            file_saved, file_path = save_transcript_as_json(transcript_data, filename, save_directory, file_policy)
-        elif selected_format == "srt":
-            file_saved, file_path = save_transcript_as_srt(transcript_data, filename, save_directory, file_policy)
-        elif selected_format == "vtt":
-            file_saved, file_path = save_transcript_as_vtt(transcript_data, filename, save_directory, file_policy)
-        else:
-            console_output(f"Unsupported format selected: {selected_format}", "error")
-            file_saved = False
-            file_path = ""
+    if context is None:
+        context = JobContext()
+    video_key = video_journal_key(video_url)
+    if context.journal is not None and context.journal.is_finished(video_key):
+        console_output(f"Skipped: {video_url} (finished in an earlier run)", "info")
+        context.metrics.count("videos_skipped")
+        return
+    plan = as_language_plan(language)
+    loop = asyncio.get_running_loop()
+    video_id = extract_video_id(video_url)
 
-        if file_saved:
-            update_recent_downloads(video_title, video_url, file_path)
-            console_output(f"Successfully processed: {video_title}", "success")
-        else:
-            console_output(f"Skipped: {video_title} (file already exists)", "info")
-    except (TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable) as e:
-        console_output(f"Transcript not available for {video_url}: {e}", "error")
+    async def load_metadata():
+        with context.metrics.time("metadata"):
+            return await loop.run_in_executor(
+                context.executor, fetch_video_metadata, video_url, video_title, context.scheduler, context.session,
+                context.backend
+            )
+
+    async def load_transcript_list():
+        with context.metrics.time("list_transcripts"):
+            return await loop.run_in_executor(
+                context.executor, fetch_transcript_list, video_id, context.scheduler, context.session, context.backend
+            )
+
+    async def load_transcript(transcript):
+        with context.metrics.time("fetch_transcript"):
+            return await loop.run_in_executor(
+                context.executor, fetch_transcript, transcript, context.scheduler, context.backend
+            )
+
+    async def clean(transcript_data):
+        pool = context.executor
+        if context.process_pool is not None and len(transcript_data) >= PROCESS_POOL_MIN_SEGMENTS:
+            pool = context.process_pool
+        with context.metrics.time("cleanup"):
+            return await loop.run_in_executor(pool, clean_transcript, transcript_data, context.cleanup)
+
+    # Shared by the tracks, so the title, the transcript listing and each transcript are looked up once per video
+    metadata = run_once(load_metadata)
+    transcript_list = run_once(load_transcript_list)
+    transcripts = {}  # (language code, kind) -> run_once fetch, for tracks that fall back to the same transcript
+
+    async def process_track(track):
+        """Save one track of the video. Returns (outcome, saved file paths, error)."""
+        output_key = plan.output_key(video_id, track)
+        label = "" if plan.single else f" [{track.language}]"
+        policy = file_policy
+        try:
+            # In sync mode, a track synced before only has its caption kind checked, when that is due
+            synced = context.sync.get(video_id, track.language) if context.sync is not None else None
+            refresh = False
+            if synced is not None:
+                if context.sync.needs_recheck(video_id, track.language):
+                    with context.metrics.time("recheck_captions"):
+                        _, kind = plan.resolve(await transcript_list(), track)
+                    if kind == synced['kind']:
+                        context.sync.mark_checked(video_id, track.language)
+                    else:
+                        # E.g. auto-generated captions replaced by manual ones: fetch and overwrite
+                        console_output(
+                            f"Captions changed ({synced['kind']} -> {kind}): {video_title or video_url}{label}", "info"
+                        )
+                        refresh = True
+                        policy = 'overwrite'
+                if not refresh and synced['kind'] == NO_CAPTIONS:
+                    console_output(f"No transcript: {video_title or video_url}{label} (checked by an earlier sync)", "info")
+                    return OUTCOME_NO_TRANSCRIPT, [], NO_CAPTIONS
+                if not refresh and is_already_saved(output_key, output_formats, context.manifest, context.shard):
+                    console_output(f"Up to date: {video_title or video_url}{label}", "info")
+                    return OUTCOME_UP_TO_DATE, [], None
+
+            # In skip mode, a track whose every format is already saved needs no network call
+            if policy.lower() == 'skip' and is_already_saved(
+                    output_key, output_formats, context.manifest, context.shard):
+                console_output(f"Skipped: {video_title or video_url}{label} (file already exists)", "info")
+                return OUTCOME_SKIPPED, [], None
+
+            # A cached transcript needs no network call at all
+            cached = None
+            if context.cache is not None and not refresh:
+                with context.metrics.time("cache_lookup"):
+                    cached = await loop.run_in_executor(
+                        context.executor, cached_transcript, context.cache, video_id, plan, track
+                    )
+
+            if cached:
+                cached_title, transcript_data, kind = cached
+                title = video_title or cached_title
+                console_output(f"Using cached transcript for: {title}{label}", "info")
+                context.metrics.count("cache_hits")
+            else:
+                async def fetch():
+                    _, fetched_title = await metadata()
+                    transcript, fetched_kind = plan.resolve(await transcript_list(), track)
+                    console_output(f"Fetching transcript for: {fetched_title}{label}", "info")
+                    key = (transcript.language_code, fetched_kind)
+                    if key not in transcripts:
+                        transcripts[key] = run_once(lambda: load_transcript(transcript))
+                    fetched_data = await transcripts[key]()
+                    if context.cache is not None:
+                        with context.metrics.time("cache_store"):
+                            await loop.run_in_executor(
+                                context.executor, context.cache.put, video_id, transcript.language_code, fetched_kind,
+                                fetched_title, fetched_data
+                            )
+                    return fetched_title, fetched_data, fetched_kind
+
+                if context.single_flight is not None:
+                    # Another job fetching this track right now hands its result over instead
+                    (title, transcript_data, kind), shared = await context.single_flight.run(
+                        (video_id, track.codes, track.translation, plan.prefer_manual), fetch, stop_event
+                    )
+                    if shared:
+                        console_output(f"Using transcript fetched by another job for: {title}{label}", "info")
+                        context.metrics.count("fetches_shared")
+                else:
+                    title, transcript_data, kind = await fetch()
+                if refresh and transcript_hash(transcript_data) == synced['hash']:
+                    # Same captions under a new kind: the saved files are still right
+                    context.sync.record(video_id, track.language, kind, synced['hash'])
+                    console_output(f"Up to date: {title}{label}", "info")
+                    return OUTCOME_UP_TO_DATE, [], None
+
+            # The cache and the sync hash keep the captions as fetched; files and the index get them cleaned
+            raw_data = transcript_data
+            if context.cleanup is not None:
+                transcript_data = await clean(transcript_data)
+
+            filename = clean_filename(title) + plan.file_suffix(track)
+
+            # Render the one fetched transcript in every selected format
+            selected_formats = []
+            for selected_format in output_formats:
+                if selected_format in TRANSCRIPT_SAVERS or (
+                        selected_format == SHARD_FORMAT and context.shard is not None):
+                    selected_formats.append(selected_format)
+                else:
+                    console_output(f"Unsupported format selected: {selected_format}", "error")
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    context.executor,
+                    save_transcript_to_shard,
+                    transcript_data,
+                    context.shard,
+                    video_id,
+                    title,
+                    track.language,
+                    policy,
+                    context.metrics,
+                    output_key
+                )
+                if selected_format == SHARD_FORMAT else
+                loop.run_in_executor(
+                    context.executor,
+                    save_transcript,
+                    transcript_data,
+                    filename,
+                    save_directory,
+                    policy,
+                    selected_format,
+                    context.manifest,
+                    context.metrics
+                )
+                for selected_format in selected_formats
+            ))
+            saved_formats = [fmt for fmt, (file_saved, _) in zip(selected_formats, results) if file_saved]
+            saved_paths = [file_path for file_saved, file_path in results if file_saved]
+            if context.manifest is not None:
+                for selected_format, (file_saved, file_path) in zip(selected_formats, results):
+                    if selected_format == SHARD_FORMAT:
+                        continue  # The shard keeps its own index
+                    # A skipped file was saved by an earlier run, possibly before the manifest existed
+                    context.manifest.record(
+                        output_key,
+                        selected_format,
+                        file_path if file_saved else os.path.join(save_directory, f"{filename}.{selected_format}")
+                    )
+
+            if saved_paths and context.search_index is not None:
+                try:
+                    with context.metrics.time("search_index"):
+                        await loop.run_in_executor(
+                            context.executor, context.search_index.add, video_id, track.language, title, video_url,
+                            transcript_data
+                        )
+                except Exception as e:
+                    console_output(f"Could not add {title}{label} to the search index: {e}", "error")
+
+            if not selected_formats:
+                return None, [], None
+            if context.sync is not None:
+                context.sync.record(video_id, track.language, kind, transcript_hash(raw_data))
+            if saved_paths:
+                update_recent_downloads(title, video_url, saved_paths[0])
+                console_output(f"Successfully processed: {title}{label} ({', '.join(saved_formats)})", "success")
+                return OUTCOME_SAVED, saved_paths, None
+            console_output(f"Skipped: {title}{label} (file already exists)", "info")
+            return OUTCOME_SKIPPED, [], None
+        except NO_TRANSCRIPT_ERRORS as e:
+            console_output(f"Transcript not available for {video_url}{label}: {e}", "error")
+            context.metrics.error("video", e)
+            if context.sync is not None:
+                # So later syncs only look again when the recheck is due
+                context.sync.record(video_id, track.language, NO_CAPTIONS, None)
+            return OUTCOME_NO_TRANSCRIPT, [], type(e).__name__
+        except Exception as e:
+            console_output(f"Could not process {video_url}{label}: {e}", "error")
+            context.metrics.error("video", e)
+            return OUTCOME_FAILED, [], str(e)
+
+    try:
+        if video_id is None:
+            # No ID in the URL, only the watch page can tell
+            video_id, video_title = await metadata()
+        tracks = await asyncio.gather(*(process_track(track) for track in plan.tracks))
     except Exception as e:
         console_output(f"Could not process {video_url}: {e}", "error")
+        context.metrics.error("video", e)
+        tracks = [(OUTCOME_FAILED, [], str(e))]
+    outcomes = [outcome for outcome, _, _ in tracks if outcome is not None]
+    if not outcomes:
+        return
+    # The video counts as its most telling track: any failure, else any saved file, ...
+    outcome = min(outcomes, key=VIDEO_OUTCOMES.index)
+    context.metrics.count(f"videos_{outcome}")
+    if context.journal is None:
+        return
+    if outcome == OUTCOME_FAILED:
+        context.journal.record(
+            video_key, FAILED, error="; ".join(error for o, _, error in tracks if o == OUTCOME_FAILED)
+        )
+    elif outcome == OUTCOME_NO_TRANSCRIPT:
+        context.journal.record(video_key, NO_TRANSCRIPT, error=tracks[0][2])
+    else:
+        context.journal.record(video_key, DONE, file_paths=[path for _, paths, _ in tracks for path in paths])
+
+def is_already_saved(video_id, output_formats, manifest, shard):
+    """Whether every selected format of the video is saved already, judged without any network call."""
+    checked = False
+    for selected_format in output_formats:
+        if selected_format == SHARD_FORMAT and shard is not None:
+            if video_id not in shard:
+                return False
+        elif selected_format in TRANSCRIPT_SAVERS:
+            if manifest is None or manifest.lookup(video_id, selected_format) is None:
+                return False
+        else:
+            continue
+        checked = True
+    return checked
+
+def video_journal_key(video_url):
+    """Key of a video in a job journal: its ID, or the URL itself if no ID can be parsed from it."""
+    return extract_video_id(video_url) or video_url
+
+def call_directly(func, *args):
+    return func(*args)
+
+def fetch_video_metadata(video_url, video_title=None, scheduler=None, session=None, backend=None):
+    """Return (video_id, title), loading the whole watch page only when the cheap paths fail."""
+    call = scheduler.call if scheduler is not None else call_directly
+    backend = backend if backend is not None else default_backend
+    video_id = extract_video_id(video_url)
+    if video_id and video_title:
+        return video_id, video_title
+    if video_id:
+        video_title = fetch_video_title(video_id, scheduler, session, backend)
+        if video_title:
+            return video_id, video_title
+    return call(backend.video_metadata, video_url)
+
+def fetch_video_title(video_id, scheduler=None, session=None, backend=None):
+    """Look up a video title through oEmbed, returning None if it isn't available there."""
+    call = scheduler.call if scheduler is not None else call_directly
+    backend = backend if backend is not None else default_backend
+    try:
+        return call(backend.video_title, video_id, session)
+    except (requests.RequestException, ValueError):
+        return None
 
-def save_transcript_as_txt(transcript_data, filename, save_directory, file_policy):
+def fetch_transcript_list(video_id, scheduler=None, session=None, backend=None):
+    """List the transcripts of a video (one request), returning its TranscriptList."""
+    call = scheduler.call if scheduler is not None else call_directly
+    backend = backend if backend is not None else default_backend
+    return call(backend.list_transcripts, video_id, session)
+
+def fetch_transcript(transcript, scheduler=None, backend=None):
+    """Fetch the segments of one Transcript from a TranscriptList."""
+    call = scheduler.call if scheduler is not None else call_directly
+    backend = backend if backend is not None else default_backend
+    return call(backend.fetch_transcript, transcript)
+
+def cached_transcript(cache, video_id, plan, track):
+    """The cached transcript the plan would pick for a track, as (title, transcript_data, kind), or None."""
+    for code, kind in plan.cache_lookups(track):
+        cached = cache.get(video_id, code, kind)
+        if cached:
+            return cached
+    return None
+
+def run_once(make_call):
+    """Async function that starts make_call() when first awaited; every call then returns that one call's result.
+
+    Once every caller awaiting it is cancelled (the video was cancelled, and
+    no other job's fetch of it still waits), the call is cancelled too, and
+    the next caller starts it again.
+    """
+    task = None
+    waiting = 0
+
+    async def call():
+        nonlocal task, waiting
+        if task is None:
+            task = asyncio.ensure_future(make_call())
+        current = task
+        waiting += 1
+        try:
+            return await asyncio.shield(current)
+        finally:
+            waiting -= 1
+            if waiting == 0 and not current.done():
+                current.cancel()
+                if task is current:
+                    task = None
+
+    return call
+
+def save_transcript(
+    transcript_data, filename, save_directory, file_policy, selected_format, manifest=None, metrics=NULL_METRICS
+):
+    saver = TRANSCRIPT_SAVERS[selected_format]
+    if manifest is not None:
+        # manifest.reserve picks the file name atomically, so files are written in parallel
+        return saver(transcript_data, filename, save_directory, file_policy, manifest, metrics)
+    with _save_locks[selected_format]:
+        return saver(transcript_data, filename, save_directory, file_policy, manifest, metrics)
+
+def save_transcript_to_shard(
+    transcript_data, shard, video_id, video_title, language, file_policy, metrics=NULL_METRICS, key=None
+):
+    if file_policy.lower() == 'skip' and (key or video_id) in shard:
+        return False, ""
+    with metrics.time("write_shard"):
+        metrics.add_bytes(shard.add(video_id, video_title, language, transcript_data, key))
+    return True, shard.path
+
+def save_transcript_as_txt(transcript_data, filename, save_directory, file_policy, manifest=None, metrics=NULL_METRICS):
     os.makedirs(save_directory, exist_ok=True)
     file_path = os.path.join(save_directory, f"{filename}.txt")
     
     # Handle file policy
-    file_path = handle_file_policy(file_path, file_policy, filename, 'txt')
+    file_path = handle_file_policy(file_path, file_policy, filename, 'txt', manifest)
     if not file_path:
         return False, ""
 
     # Concatenate all transcript texts into a single paragraph
-    transcript_text = " ".join([entry['text'].replace('\n', ' ') for entry in transcript_data])
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(transcript_text)
+    write_transcript_file(file_path, transcript_data, write_txt, 'txt', metrics)
 
     return True, file_path
 
-def save_transcript_as_json(transcript_data, filename, save_directory, file_policy):
+def save_transcript_as_json(transcript_data, filename, save_directory, file_policy, manifest=None, metrics=NULL_METRICS):
     os.makedirs(save_directory, exist_ok=True)
     file_path = os.path.join(save_directory, f"{filename}.json")
     
     # Handle file policy
-    file_path = handle_file_policy(file_path, file_policy, filename, 'json')
+    file_path = handle_file_policy(file_path, file_policy, filename, 'json', manifest)
     if not file_path:
         return False, ""
 
-    # Save the transcript using JSONFormatter
-    formatter = JSONFormatter()
-    formatted_json = formatter.format_transcript(transcript_data)
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(formatted_json)
+    # Same output as JSONFormatter, streamed to the file
+    write_transcript_file(file_path, transcript_data, write_json, 'json', metrics)
 
     return True, file_path
 
-def save_transcript_as_srt(transcript_data, filename, save_directory, file_policy):
+def save_transcript_as_srt(transcript_data, filename, save_directory, file_policy, manifest=None, metrics=NULL_METRICS):
     os.makedirs(save_directory, exist_ok=True)
     file_path = os.path.join(save_directory, f"{filename}.srt")
     
     # Handle file policy
-    file_path = handle_file_policy(file_path, file_policy, filename, 'srt')
+    file_path = handle_file_policy(file_path, file_policy, filename, 'srt', manifest)
     if not file_path:
         return False, ""
 
-    # Save the transcript using SRTFormatter
-    formatter = SRTFormatter()
-    formatted_srt = formatter.format_transcript(transcript_data)
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(formatted_srt)
+    # Same output as SRTFormatter, streamed to the file
+    write_transcript_file(file_path, transcript_data, write_srt, 'srt', metrics)
 
     return True, file_path
 
-def save_transcript_as_vtt(transcript_data, filename, save_directory, file_policy):
+def save_transcript_as_vtt(transcript_data, filename, save_directory, file_policy, manifest=None, metrics=NULL_METRICS):
     os.makedirs(save_directory, exist_ok=True)
     file_path = os.path.join(save_directory, f"{filename}.vtt")
     
     # Handle file policy
-    file_path = handle_file_policy(file_path, file_policy, filename, 'vtt')
+    file_path = handle_file_policy(file_path, file_policy, filename, 'vtt', manifest)
     if not file_path:
         return False, ""
 
-    # Save the transcript using WebVTTFormatter
-    formatter = WebVTTFormatter()
-    formatted_vtt = formatter.format_transcript(transcript_data)
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(formatted_vtt)
+    # Same output as WebVTTFormatter, streamed to the file
+    write_transcript_file(file_path, transcript_data, write_vtt, 'vtt', metrics)
 
     return True, file_path
 
-def handle_file_policy(file_path, policy, filename, extension):
+class TimedWrites:
+    """Wraps an open file and adds up the time spent in its write calls."""
+
+    def __init__(self, f):
+        self.f = f
+        self.seconds = 0.0
+
+    def write(self, text):
+        start = time.perf_counter()
+        try:
+            return self.f.write(text)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+def write_transcript_file(file_path, transcript_data, writer, fmt, metrics=NULL_METRICS):
+    """Render the transcript with writer (from transcript_formats) straight into the file.
+
+    Rendering is timed as format_<fmt> and opening, writing and closing the file as write_file.
+    """
+    if not metrics.enabled:
+        with open(file_path, 'w', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+            writer(f, transcript_data)
+        return
+    start = time.perf_counter()
+    try:
+        with open(file_path, 'w', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+            timed = TimedWrites(f)
+            render_start = time.perf_counter()
+            writer(timed, transcript_data)
+            render_seconds = time.perf_counter() - render_start - timed.seconds
+            metrics.add_bytes(f.tell())
+    except Exception as e:
+        metrics.error("write_file", e)
+        raise
+    metrics.observe(f"format_{fmt}", render_seconds)
+    metrics.observe("write_file", time.perf_counter() - start - render_seconds)
+
+# Saver for each output format, keyed by the lowercase format name
+TRANSCRIPT_SAVERS = {
+    "txt": save_transcript_as_txt,
+    "json": save_transcript_as_json,
+    "srt": save_transcript_as_srt,
+    "vtt": save_transcript_as_vtt,
+}
+
+# Without a manifest, serializes the "file exists" checks and writes of
+# concurrent videos so two videos with the same title cannot pick the same
+# file name. Formats have their own extension, so each gets its own lock and
+# they can be written in parallel.
+_save_locks = {fmt: threading.Lock() for fmt in TRANSCRIPT_SAVERS}
+
+def handle_file_policy(file_path, policy, filename, extension, manifest=None):
+    if manifest is not None:
+        return manifest.reserve(filename, extension, policy)
     if policy.lower() == 'skip' and os.path.exists(file_path):
         return None
     elif policy.lower() == 'overwrite':
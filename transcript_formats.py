@@ -0,0 +1,121 @@
+# transcript_formats.py
+
+"""Streaming writers for the TXT, JSON, SRT and VTT transcript formats.
+
+Each writer renders a transcript a chunk of segments at a time straight
+into an open text file, so a multi-hour transcript never exists as one
+big string. The output is byte-for-byte what youtube-transcript-api's
+JSONFormatter, SRTFormatter and WebVTTFormatter (and the TXT paragraph
+the fetcher always wrote) produce.
+"""
+
+import io
+import json
+
+# Segments rendered per write to the file
+CHUNK_SIZE = 512
+
+# Cached "HH:MM:SS" prefixes, one per whole second; cleared when it grows past this
+TIMESTAMP_CACHE_SIZE = 100_000
+
+_hms_cache = {}
+
+
+def _hms(whole_seconds):
+    hms = _hms_cache.get(whole_seconds)
+    if hms is None:
+        if len(_hms_cache) >= TIMESTAMP_CACHE_SIZE:
+            _hms_cache.clear()
+        hours, remainder = divmod(whole_seconds, 3600)
+        mins, secs = divmod(remainder, 60)
+        hms = _hms_cache[whole_seconds] = f"{hours:02d}:{mins:02d}:{secs:02d}"
+    return hms
+
+
+def format_timestamp(time, separator):
+    """Cue timestamp of time (seconds), like _TextBasedFormatter._seconds_to_timestamp: "00:01:02,345" with separator ","."""
+    time = float(time)
+    whole = int(time)
+    if time < 0:
+        # Flooring and truncation differ below zero: follow the formatter's float arithmetic exactly
+        hours_float, remainder = divmod(time, 3600)
+        mins_float, secs_float = divmod(remainder, 60)
+        hms = f"{int(hours_float):02d}:{int(mins_float):02d}:{int(secs_float):02d}"
+    else:
+        hms = _hms(whole)
+    return f"{hms}{separator}{int(round((time - whole) * 1000, 2)):03d}"
+
+
+def write_txt(f, transcript_data):
+    """All segment texts as one paragraph, separated by spaces."""
+    for offset in range(0, len(transcript_data), CHUNK_SIZE):
+        chunk = " ".join([entry['text'].replace('\n', ' ') for entry in transcript_data[offset:offset + CHUNK_SIZE]])
+        f.write(f" {chunk}" if offset else chunk)
+
+
+def write_json(f, transcript_data):
+    """The segments as json.dumps writes the whole list (JSONFormatter's output)."""
+    if not transcript_data:
+        f.write("[]")
+        return
+    f.write("[")
+    for offset in range(0, len(transcript_data), CHUNK_SIZE):
+        chunk = json.dumps(transcript_data[offset:offset + CHUNK_SIZE])[1:-1]
+        f.write(f", {chunk}" if offset else chunk)
+    f.write("]")
+
+
+def _write_cues(f, transcript_data, separator, numbered):
+    # The end of a cue is the start of the next one when they overlap (as in _TextBasedFormatter)
+    count = len(transcript_data)
+    next_start = transcript_data[0]['start'] if count else None
+    next_stamp = format_timestamp(next_start, separator) if count else None
+    pieces = []
+    for i in range(count):
+        line = transcript_data[i]
+        start_stamp = next_stamp
+        end = line['start'] + line['duration']
+        if i < count - 1:
+            next_start = transcript_data[i + 1]['start']
+            next_stamp = format_timestamp(next_start, separator)
+            end_stamp = next_stamp if next_start < end else format_timestamp(end, separator)
+        else:
+            end_stamp = format_timestamp(end, separator)
+        if i:
+            pieces.append("\n\n")
+        if numbered:
+            pieces.append(f"{i + 1}\n{start_stamp} --> {end_stamp}\n{line['text']}")
+        else:
+            pieces.append(f"{start_stamp} --> {end_stamp}\n{line['text']}")
+        if len(pieces) >= CHUNK_SIZE:
+            f.write("".join(pieces))
+            pieces.clear()
+    pieces.append("\n")
+    f.write("".join(pieces))
+
+
+def write_srt(f, transcript_data):
+    """Numbered SubRip cues (SRTFormatter's output)."""
+    _write_cues(f, transcript_data, ",", numbered=True)
+
+
+def write_vtt(f, transcript_data):
+    """WebVTT header and cues (WebVTTFormatter's output)."""
+    f.write("WEBVTT\n\n")
+    _write_cues(f, transcript_data, ".", numbered=False)
+
+
+# Writer for each output format, keyed by the lowercase format name
+FORMAT_WRITERS = {
+    "txt": write_txt,
+    "json": write_json,
+    "srt": write_srt,
+    "vtt": write_vtt,
+}
+
+
+def format_transcript(transcript_data, fmt):
+    """The whole transcript in one format as a string (for callers that need it in memory)."""
+    buffer = io.StringIO()
+    FORMAT_WRITERS[fmt](buffer, transcript_data)
+    return buffer.getvalue()
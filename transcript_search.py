@@ -0,0 +1,158 @@
+# transcript_search.py
+
+import re
+import sqlite3
+import threading
+import time
+
+# Default location of the search index, next to settings.json
+DEFAULT_INDEX_PATH = 'transcript_index.sqlite3'
+
+# Segment rowids are (video rowid << SEGMENT_BITS) + segment number, so all
+# segments of a video form one rowid range that can be replaced in one go
+SEGMENT_BITS = 20
+
+# Words and numbers in a plain-text query
+QUERY_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def match_query(text):
+    """FTS5 query matching segments that contain every word of text, the last one as a prefix."""
+    terms = QUERY_TERM.findall(text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'  # So results show up while the last word is still being typed
+    return ' '.join(quoted)
+
+
+class SearchIndex:
+    """SQLite FTS5 full-text index of transcript segments, with the start time of each segment.
+
+    Videos are added one at a time as their transcripts are saved; adding a
+    video again replaces only its own segments, so the index never has to be
+    rebuilt. Safe to share between the fetcher's worker threads.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS videos (
+                    id INTEGER PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    indexed_at REAL NOT NULL,
+                    UNIQUE (video_id, language)
+                )"""
+            )
+            self._conn.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+                    text,
+                    start UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )"""
+            )
+
+    def add(self, video_id, language, title, url, transcript_data):
+        """Index (or re-index) the segments of one video's transcript."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM videos WHERE video_id = ? AND language = ?", (video_id, language)
+            ).fetchone()
+            if row is None:
+                video_rowid = self._conn.execute(
+                    "INSERT INTO videos (video_id, language, title, url, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                    (video_id, language, title, url, time.time())
+                ).lastrowid
+            else:
+                video_rowid = row[0]
+                self._conn.execute(
+                    "UPDATE videos SET title = ?, url = ?, indexed_at = ? WHERE id = ?",
+                    (title, url, time.time(), video_rowid)
+                )
+                self._delete_segments(video_rowid)
+            first = video_rowid << SEGMENT_BITS
+            self._conn.executemany(
+                "INSERT INTO segments (rowid, text, start) VALUES (?, ?, ?)",
+                (
+                    (first + number, entry['text'].replace('\n', ' '), entry['start'])
+                    for number, entry in enumerate(transcript_data[:1 << SEGMENT_BITS])
+                )
+            )
+
+    def _delete_segments(self, video_rowid):
+        first = video_rowid << SEGMENT_BITS
+        self._conn.execute(
+            "DELETE FROM segments WHERE rowid BETWEEN ? AND ?", (first, first + (1 << SEGMENT_BITS) - 1)
+        )
+
+    def remove(self, video_id, language):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM videos WHERE video_id = ? AND language = ?", (video_id, language)
+            ).fetchone()
+            if row is not None:
+                self._delete_segments(row[0])
+                self._conn.execute("DELETE FROM videos WHERE id = ?", row)
+
+    def search(self, query, limit=50, language=None, raw=False):
+        """Best matching segments for query, as dicts with video_id, language, title, url, start and text.
+
+        query is plain text: segments containing all of its words match, the
+        last word as a prefix. With raw=True it is passed to FTS5 as is, for
+        phrases ("..."), OR, NOT and NEAR(). In text, matches are wrapped in
+        [brackets].
+        """
+        if not raw:
+            query = match_query(query)
+            if query is None:
+                return []
+        sql = (
+            "SELECT v.video_id, v.language, v.title, v.url, s.start, highlight(segments, 0, '[', ']') "
+            "FROM segments s JOIN videos v ON v.id = (s.rowid >> ?) "
+            "WHERE segments MATCH ?"
+        )
+        params = [SEGMENT_BITS, query]
+        if language is not None:
+            sql += " AND v.language = ?"
+            params.append(language)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {'video_id': video_id, 'language': language, 'title': title, 'url': url, 'start': start, 'text': text}
+            for video_id, language, title, url, start, text in rows
+        ]
+
+    def video_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.execute("DELETE FROM videos")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def timestamp_url(url, start):
+    """Link to the video at the given second."""
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}t={int(start)}s"
+
+
+def format_timestamp(start):
+    """h:mm:ss or m:ss for a start time in seconds."""
+    minutes, seconds = divmod(int(start), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
@@ -0,0 +1,125 @@
+# transcript_shard.py
+
+import gzip
+import json
+import os
+import threading
+
+# Index of a shard, next to it: "<shard>.idx"
+INDEX_SUFFIX = '.idx'
+
+
+def shard_record(video_id, title, language, transcript_data):
+    """Columnar form of a transcript: the segment texts, starts and durations as three arrays."""
+    return {
+        'video': video_id,
+        'title': title,
+        'language': language,
+        'text': [entry['text'] for entry in transcript_data],
+        'start': [entry['start'] for entry in transcript_data],
+        'duration': [entry['duration'] for entry in transcript_data],
+    }
+
+
+def record_segments(record):
+    """Turn a shard record back into the usual list of {'text', 'start', 'duration'} segments."""
+    return [
+        {'text': text, 'start': start, 'duration': duration}
+        for text, start, duration in zip(record['text'], record['start'], record['duration'])
+    ]
+
+
+def load_index(path):
+    """Read a shard index: video ID -> (offset, length) of its gzip member. The last entry of a video wins."""
+    index = {}
+    try:
+        with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Half-written last line after a crash
+                index[entry['video']] = (entry['offset'], entry['length'])
+    except FileNotFoundError:
+        pass
+    return index
+
+
+class ShardWriter:
+    """Append-only gzip JSON-lines file holding every transcript of a job.
+
+    Each transcript is one shard record (see shard_record) compressed as its
+    own gzip member. Concatenated members are still a valid gzip file, so the
+    whole shard reads as plain JSON lines with gzip.open, while the index
+    file lets ShardReader decompress a single transcript. Records are written
+    before their index line, and a record with no index line (cut off by a
+    crash) is truncated away when the shard is opened again.
+    """
+
+    def __init__(self, path, compresslevel=6):
+        self.path = path
+        self.compresslevel = compresslevel
+        self.index = load_index(path)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        end = max((offset + length for offset, length in self.index.values()), default=0)
+        self._file = open(path, 'ab')
+        if self._file.tell() > end:
+            self._file.truncate(end)
+            self._file.seek(end)
+        self._index_file = open(path + INDEX_SUFFIX, 'a', encoding='utf-8')
+
+    def __contains__(self, video_id):
+        return video_id in self.index
+
+    def add(self, video_id, title, language, transcript_data, key=None):
+        """Append one transcript and return its compressed size. Adding a video again replaces it for readers.
+
+        The index finds the transcript under key, by default the video ID
+        (a job saving several languages per video gives each its own key).
+        """
+        key = key or video_id
+        line = json.dumps(shard_record(video_id, title, language, transcript_data), ensure_ascii=False) + '\n'
+        member = gzip.compress(line.encode('utf-8'), compresslevel=self.compresslevel, mtime=0)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(member)
+            self._file.flush()
+            self.index[key] = (offset, len(member))
+            self._index_file.write(json.dumps({'video': key, 'offset': offset, 'length': len(member)}) + '\n')
+            self._index_file.flush()
+        return len(member)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._index_file.close()
+
+
+class ShardReader:
+    """Reads a shard written by ShardWriter, whole or one transcript at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = load_index(path)
+
+    def __contains__(self, video_id):
+        return video_id in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, video_id):
+        """The shard record of one video, decompressing only its own gzip member."""
+        offset, length = self.index[video_id]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+
+    def __iter__(self):
+        """Every record in the shard, in the order they were written, including replaced ones."""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
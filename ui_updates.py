@@ -0,0 +1,82 @@
+# ui_updates.py
+
+import queue
+
+import tkinter as tk
+
+# How often (in milliseconds) the GUI applies queued updates
+UPDATE_INTERVAL_MS = 50
+
+# Most updates applied in one tick, so a huge burst can't freeze the window
+MAX_UPDATES_PER_TICK = 2000
+
+# Lines kept in the console; older ones are dropped
+MAX_CONSOLE_LINES = 5000
+
+
+class UIUpdateQueue:
+    """Thread-safe queue of GUI updates, applied in batches by one periodic Tk after() tick.
+
+    Worker threads call put(kind, *args). Every interval_ms the main thread
+    takes up to max_batch queued updates and hands them, in order, to
+    apply_batch as a list of (kind, args) tuples.
+    """
+
+    def __init__(self, root, apply_batch, interval_ms=UPDATE_INTERVAL_MS, max_batch=MAX_UPDATES_PER_TICK):
+        self.root = root
+        self.apply_batch = apply_batch
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+
+    def put(self, kind, *args):
+        self._queue.put((kind, args))
+
+    def start(self):
+        self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        batch = []
+        try:
+            while len(batch) < self.max_batch:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            if batch:
+                self.apply_batch(batch)
+        finally:
+            self.root.after(self.interval_ms, self._tick)
+
+
+class BoundedConsole:
+    """Keeps a read-only Text widget to the last max_lines lines, trimming the oldest ones."""
+
+    def __init__(self, text_widget, max_lines=MAX_CONSOLE_LINES):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.line_count = 0
+
+    def append(self, lines):
+        """Append (message, tag) lines with a single insert."""
+        if not lines:
+            return
+        lines = lines[-self.max_lines:]
+        chunks = []
+        for message, tag in lines:
+            chunks.extend((message + '\n', tag))
+        self.text.configure(state='normal')
+        self.text.insert(tk.END, *chunks)
+        self.line_count += sum(message.count('\n') + 1 for message, _ in lines)
+        if self.line_count > self.max_lines:
+            excess = self.line_count - self.max_lines
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self.line_count = self.max_lines
+        self.text.configure(state='disabled')
+        self.text.see(tk.END)
+
+    def clear(self):
+        self.text.configure(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.configure(state='disabled')
+        self.line_count = 0
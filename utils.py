@@ -3,6 +3,18 @@
 import re
 import json
 import os
+import tempfile
+import threading
+from collections import deque
+
+# Download history: every saved transcript, one JSON line each (newest last)
+DOWNLOAD_HISTORY_PATH = 'download_history.jsonl'
+
+# How many of the newest history entries are kept in memory and shown in the GUI
+RECENT_VIEW_SIZE = 100
+
+# Last content written by write_json_atomic, per path, so unchanged files aren't rewritten
+_last_written = {}
 
 # Function to clean filenames
 def clean_filename(title):
@@ -10,18 +22,31 @@ def clean_filename(title):
     title = re.sub(r'[^\w\s-]', '', title)
     return re.sub(r'[-\s]+', '_', title).strip().lower()
 
-# Function to load recent downloads
+# Function to write JSON atomically: readers see either the old or the new file, never half of one
+def write_json_atomic(path, data):
+    content = json.dumps(data, ensure_ascii=False, indent=4)
+    if _last_written.get(path) == content:
+        return  # Nothing changed since the last save
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    _last_written[path] = content
+
+# Function to load recent downloads (the list older versions kept in recent_downloads.json)
 def load_recent_downloads():
     if os.path.exists('recent_downloads.json'):
         with open('recent_downloads.json', 'r', encoding='utf-8') as f:
             return json.load(f)
     return []
 
-# Function to save recent downloads
-def save_recent_downloads(recent_downloads):
-    with open('recent_downloads.json', 'w', encoding='utf-8') as f:
-        json.dump(recent_downloads, f, ensure_ascii=False, indent=4)
-
 # Function to load settings
 def load_settings():
     if os.path.exists('settings.json'):
@@ -31,5 +56,62 @@ def load_settings():
 
 # Function to save settings
 def save_settings(settings):
-    with open('settings.json', 'w', encoding='utf-8') as f:
-        json.dump(settings, f, ensure_ascii=False, indent=4)
\ No newline at end of file
+    write_json_atomic('settings.json', settings)
+
+# Function to read the last count lines of a text file without reading all of it
+def read_last_lines(path, count, block_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0 and data.count(b'\n') <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    return lines[-count:] if count else []
+
+
+class DownloadHistory:
+    """Append-only log of downloaded transcripts with a bounded in-memory view.
+
+    Adding entries appends lines to the history file, so it costs the same
+    whatever the history size. recent holds the newest view_size entries,
+    newest first, in the same order as the GUI list.
+    """
+
+    def __init__(self, path=DOWNLOAD_HISTORY_PATH, view_size=RECENT_VIEW_SIZE):
+        self.path = path
+        self.view_size = view_size
+        self.recent = deque(maxlen=view_size)
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            # Carry over the list older versions kept in recent_downloads.json (newest first)
+            legacy = load_recent_downloads()
+            if legacy:
+                self.add(list(reversed(legacy)))
+            return self.recent
+        for line in read_last_lines(self.path, self.view_size):
+            try:
+                self.recent.appendleft(json.loads(line))
+            except ValueError:
+                continue  # Half-written line after a crash
+        return self.recent
+
+    def add(self, entries):
+        """Append entries (dicts, oldest first) in one write."""
+        if not entries:
+            return
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+            for entry in entries:
+                self.recent.appendleft(entry)
+
+    def clear(self):
+        with self._lock:
+            open(self.path, 'w', encoding='utf-8').close()
+            self.recent.clear()
@@ -0,0 +1,108 @@
+# youtube_backend.py
+
+"""Where the fetcher gets videos, playlists and transcripts from.
+
+process_videos makes every YouTube call through a backend object with the
+methods of YouTubeBackend, so another backend (the in-process fake in
+benchmarks/fake_backend.py) can stand in for YouTube. Every method blocks
+on the network; the fetcher calls them on its thread pool, through its
+RequestScheduler, so they are rate-limited and retried like before.
+
+list_transcripts returns a youtube-transcript-api TranscriptList, or
+anything used like one: iterable over its transcripts, with video_id,
+find_transcript, find_manually_created_transcript and
+find_generated_transcript. Its transcripts have language_code,
+is_generated, is_translatable and translate(language_code), and are
+fetched through fetch_transcript.
+"""
+
+import requests
+from pytubefix import YouTube, Playlist
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._transcripts import TranscriptListFetcher
+
+# oEmbed endpoint used to look up a video title without loading the watch page
+OEMBED_URL = "https://www.youtube.com/oembed"
+
+# Timeout (in seconds) for the oEmbed title lookup
+OEMBED_TIMEOUT = 10
+
+# Canonical URL of a video, whatever form of URL it was found under
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+
+
+class TitledPlaylist(Playlist):
+    """Playlist that also keeps the video titles found in the playlist pages it parses."""
+
+    def __init__(self, url, *args, **kwargs):
+        super().__init__(url, *args, **kwargs)
+        self.video_titles = {}
+
+    def _extract_video_id(self, x):
+        watch_path = super()._extract_video_id(x)
+        try:
+            if 'playlistVideoRenderer' in x:
+                renderer = x['playlistVideoRenderer']
+                self.video_titles[renderer['videoId']] = renderer['title']['runs'][0]['text']
+            elif 'lockupViewModel' in x:
+                lockup = x['lockupViewModel']
+                self.video_titles[lockup['contentId']] = lockup['metadata'][
+                    'lockupMetadataViewModel']['title']['content']
+        except (KeyError, IndexError, TypeError):
+            pass  # No title in this entry, it will be looked up per video
+        return watch_path
+
+
+class YouTubeBackend:
+    """YouTube itself: pytubefix for playlists and watch pages, oEmbed for titles, youtube-transcript-api for transcripts."""
+
+    def open_playlist(self, url):
+        """Start listing a playlist.
+
+        Returns the playlist, an iterator over its video URLs that loads the
+        next page only when it runs out, and the video count the playlist page
+        declares (0 if it doesn't say). The playlist's video_titles fill up as
+        pages are loaded.
+        """
+        playlist = TitledPlaylist(url)
+        try:
+            declared = int(playlist.length)
+        except Exception:
+            declared = 0  # Unknown size, the estimate grows as pages come in
+        return playlist, iter(playlist.url_generator()), declared
+
+    def reopen_playlist(self, url, skip):
+        """List a playlist again, skipping its first skip videos. Returns the playlist and the URL iterator."""
+        playlist = TitledPlaylist(url)
+        playlist_urls = iter(playlist.url_generator())
+        for _ in range(skip):
+            next(playlist_urls, None)
+        return playlist, playlist_urls
+
+    def video_title(self, video_id, session=None):
+        """Title of a video from oEmbed, or None. Raises requests.RequestException or ValueError when the lookup fails."""
+        response = (session or requests).get(
+            OEMBED_URL,
+            params={"url": WATCH_URL.format(video_id), "format": "json"},
+            timeout=OEMBED_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json().get("title") or None
+
+    def video_metadata(self, video_url):
+        """(video_id, title) from the watch page, for videos the cheaper lookups can't resolve."""
+        yt = YouTube(video_url)
+        return yt.video_id, yt.title
+
+    def list_transcripts(self, video_id, session=None):
+        """YouTubeTranscriptApi.list_transcripts, but on the given session instead of a new one per call.
+
+        The returned transcripts keep using that session when they are fetched.
+        """
+        if session is None:
+            return YouTubeTranscriptApi.list_transcripts(video_id)
+        return TranscriptListFetcher(session).fetch(video_id)
+
+    def fetch_transcript(self, transcript):
+        """The segments of one transcript of a list_transcripts result."""
+        return transcript.fetch()